@@ -0,0 +1,399 @@
+import json
+import os
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+#-------------------------------------------------
+# BENCHMARK DEL SISTEMA DE GESTIÓN VETERINARIA
+#----------------------------------------------------------------------------------------------
+#Genera datos sintéticos con el mismo formato que 'propietarios.json', 'mascotas.json' y
+#'atenciones.json', ejecuta el programa con entradas guionadas (como si un usuario escribiera
+#en el menú) y mide el tiempo, la memoria máxima y los bytes leídos y escritos de cada caso.
+#
+#Uso:
+#    python benchmark.py                                  (10000, 100000 y 1000000 atenciones)
+#    python benchmark.py --tamanios 10000 100000 --salida resultados.json
+#    python benchmark.py --comparar anterior.json         (compara con una corrida anterior)
+#    VETERINARIA_ALMACEN=sqlite python benchmark.py       (mide el almacén SQLite)
+#    python benchmark.py --importacion                    (solo verifica el tiempo de importación)
+#
+#Además verifica que 'import veterinaria' tarde menos de PRESUPUESTO_IMPORTACION_MS, no cargue los
+#módulos opcionales pesados ni cree archivos; si no se cumple, termina con código de salida 1.
+
+CARPETA = os.path.dirname(os.path.abspath(__file__))
+
+PRESUPUESTO_IMPORTACION_MS = 50
+MODULOS_DIFERIDOS = ("sqlite3", "numpy", "concurrent.futures", "csv", "veterinaria.menu", "veterinaria.importacion")
+
+TAMANIOS = (10000, 100000, 1000000)
+
+#Entradas del menú para cada caso. Todas terminan con '0' para salir del programa, de modo que
+#cada caso incluye la carga inicial y el guardado al salir.
+CASOS = {
+    "cargar_json": "0\n",
+    "registrar_atencion": "3\n1\n{mascota}\nControl\nSaludable\nNinguno\n1500\n500\n\n0\n0\n",
+    "listar_atenciones": "3\n2\n\n0\n0\n",
+    "resumen_anual_atenciones_cantidades": "4\n2\n{anio}\n\n0\n0\n",
+    "resumen_anual_atenciones_pesos": "4\n3\n{anio}\n\n0\n0\n",
+    "historial_mascota": "4\n4\n{mascota}\n\n0\n0\n",
+}
+
+NOMBRES = ("Juan", "María", "Carlos", "Lucía", "Martín", "Sofía", "Nicolás", "Valentina", "Julián", "Carla")
+APELLIDOS = ("Galván", "Pérez", "Ruiz", "Fernández", "López", "Ramos", "Gómez", "Herrera", "Castro", "Torres")
+ANIMALES = (("Perro", ("Labrador", "Caniche", "Mestizo")), ("Gato", ("Siamés", "Persa", "Común")))
+MOTIVOS = (("Control anual", "Saludable", "Vacuna antirrábica"),
+           ("Dolor articular", "Artritis incipiente", "Antiinflamatorio"),
+           ("Vómitos", "Gastritis", "Dieta blanda"))
+
+#-------------------------------------------------
+# FUNCIONES
+#----------------------------------------------------------------------------------------------
+
+def generar_datos(carpeta, cantidad_atenciones, semilla=0):
+    """
+    Genera propietarios, mascotas y atenciones sintéticas en el formato de los archivos JSON del sistema.
+    Las atenciones se escriben una por una para no tener el millón de registros en memoria.
+
+    Parametros:
+        carpeta: Carpeta donde se crean 'propietarios.json', 'mascotas.json' y 'atenciones.json'.
+        cantidad_atenciones: Cantidad de atenciones a generar.
+        semilla: Semilla del generador aleatorio, para que los datos sean siempre los mismos.
+
+    Retorno:
+        Un diccionario con una mascota y un año existentes, usados para armar las entradas de los casos.
+    """
+    azar = random.Random(semilla)
+    cantidad_mascotas = max(10, cantidad_atenciones // 20)
+    cantidad_propietarios = max(5, cantidad_mascotas // 2)
+
+    propietarios = {}
+    for i in range(cantidad_propietarios):
+        nombre = azar.choice(NOMBRES)
+        apellido = azar.choice(APELLIDOS)
+        propietarios[str(20000000 + i)] = {
+            "activo": True,
+            "nombre": f"{nombre} {apellido}",
+            "direccion": f"Calle {azar.randint(1, 9999)}",
+            "email": f"{nombre.lower()}.{apellido.lower()}{i}@email.com",
+            "telefonos": {
+                "principal": str(1100000000 + azar.randint(0, 99999999)),
+                "emergencia": str(1100000000 + azar.randint(0, 99999999))
+            }
+        }
+    dnis = list(propietarios)
+
+    mascotas = {}
+    for i in range(cantidad_mascotas):
+        especie, razas = azar.choice(ANIMALES)
+        mascotas[str(10000000 + i)] = {
+            "activo": True,
+            "nombre": azar.choice(("Max", "Luna", "Rocky", "Mia", "Toby", "Nala")),
+            "sexo": azar.choice(("Masculino", "Femenino")),
+            "especie": especie,
+            "raza": azar.choice(razas),
+            "edad": azar.randint(1, 15),
+            "peso": round(azar.uniform(2, 40), 1),
+            "propietario": dnis[i % len(dnis)],
+            "historial": []
+        }
+    ids_mascotas = list(mascotas)
+
+    #Las atenciones se reparten en los tres años anteriores al actual, con IDs crecientes y sin repetir
+    inicio = datetime(datetime.now().year - 3, 1, 1, 9, 0, 0)
+    paso = (3 * 365 * 24 * 3600) // cantidad_atenciones
+    with open(os.path.join(carpeta, "atenciones.json"), "w", encoding="utf-8") as f:
+        f.write("{\n")
+        for i in range(cantidad_atenciones):
+            id_atencion = (inicio + timedelta(seconds=i * paso)).strftime("%Y.%m.%d %H.%M.%S.000000-0000")
+            id_masc = azar.choice(ids_mascotas)
+            motivo, diagnostico, tratamiento = azar.choice(MOTIVOS)
+            costo_vet = float(azar.randint(10, 300) * 100)
+            costo_med = float(azar.randint(0, 200) * 50)
+            mascotas[id_masc]["historial"].append(id_atencion)
+            datos = {
+                "mascota": id_masc,
+                "propietario": mascotas[id_masc]["propietario"],
+                "motivo": motivo,
+                "diagnostico": diagnostico,
+                "tratamiento": tratamiento,
+                "costo_veterinario": costo_vet,
+                "costo_medicamentos": costo_med,
+                "costo": costo_vet + costo_med
+            }
+            separador = ",\n" if i < cantidad_atenciones - 1 else "\n"
+            f.write(f"    {json.dumps(id_atencion)}: {json.dumps(datos, ensure_ascii=False)}{separador}")
+        f.write("}\n")
+
+    with open(os.path.join(carpeta, "propietarios.json"), "w", encoding="utf-8") as f:
+        json.dump(propietarios, f, ensure_ascii=False, indent=4)
+    with open(os.path.join(carpeta, "mascotas.json"), "w", encoding="utf-8") as f:
+        json.dump(mascotas, f, ensure_ascii=False, indent=4)
+
+    return {"mascota": ids_mascotas[0], "anio": str(inicio.year + 1)}
+
+def ejecutar_programa(carpeta, entrada, archivo_medicion):
+    """
+    Ejecuta el programa en un proceso aparte, dentro de la carpeta de datos, escribiendo la entrada
+    guionada en su teclado y descartando lo que muestra en pantalla.
+
+    Parametros:
+        carpeta: Carpeta con los archivos de datos.
+        entrada: Texto que se escribe en la entrada estándar del programa.
+        archivo_medicion: Archivo donde el proceso deja sus mediciones.
+
+    Retorno:
+        Un diccionario con las mediciones del proceso.
+    """
+    proceso = subprocess.run([sys.executable, os.path.abspath(__file__), "--medir", archivo_medicion],
+                             cwd=carpeta, input=entrada, text=True, encoding="utf-8",
+                             stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if proceso.returncode != 0:
+        raise RuntimeError(f"El programa terminó con error:\n{proceso.stderr}")
+    return cargar_medicion(archivo_medicion)
+
+def cargar_medicion(archivo_medicion):
+    """
+    Lee las mediciones que dejó un proceso medido.
+
+    Parametros:
+        archivo_medicion: Archivo escrito por medir().
+
+    Retorno:
+        Un diccionario con 'segundos', 'memoria_max_kb', 'bytes_leidos' y 'bytes_escritos'.
+    """
+    with open(archivo_medicion, encoding="utf-8") as f:
+        return json.load(f)
+
+def leer_io():
+    """
+    Lee los bytes leídos y escritos por el proceso actual (solo en Linux).
+
+    Retorno:
+        Una tupla (bytes_leidos, bytes_escritos), o (None, None) si el sistema no lo informa.
+    """
+    try:
+        with open("/proc/self/io", encoding="utf-8") as f:
+            valores = dict(linea.split(": ") for linea in f.read().splitlines())
+        return int(valores["rchar"]), int(valores["wchar"])
+    except (OSError, KeyError, ValueError):
+        return None, None
+
+def medir(archivo_medicion):
+    """
+    Ejecuta el programa en este mismo proceso (la entrada estándar ya trae las opciones del menú)
+    y guarda el tiempo, la memoria máxima y los bytes de archivo leídos y escritos.
+
+    Parametros:
+        archivo_medicion: Archivo donde se guardan las mediciones en formato JSON.
+    """
+    import runpy
+
+    leidos_antes, escritos_antes = leer_io()
+    inicio = time.perf_counter()
+    runpy.run_module("veterinaria", run_name="__main__")
+    segundos = time.perf_counter() - inicio
+    leidos, escritos = leer_io()
+
+    medicion = {
+        "segundos": round(segundos, 4),
+        "memoria_max_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "bytes_leidos": None if leidos is None else leidos - leidos_antes,
+        "bytes_escritos": None if escritos is None else escritos - escritos_antes
+    }
+    with open(archivo_medicion, "w", encoding="utf-8") as f:
+        json.dump(medicion, f)
+
+def medir_importacion(repeticiones=5):
+    """
+    Importa el paquete en procesos nuevos, dentro de una carpeta vacía, y mide cuánto tarda.
+
+    Parametros:
+        repeticiones: Cantidad de procesos; se toma el menor tiempo, el menos afectado por otras tareas.
+
+    Retorno:
+        Un diccionario con 'milisegundos', 'modulos_cargados' (los de MODULOS_DIFERIDOS que se
+        cargaron al importar) y 'archivos_creados'.
+    """
+    codigo = ("import sys, time; inicio = time.perf_counter(); import veterinaria; "
+              "print((time.perf_counter() - inicio) * 1000); "
+              f"print(','.join(m for m in {MODULOS_DIFERIDOS!r} if m in sys.modules))")
+    entorno = dict(os.environ, PYTHONPATH=CARPETA)
+    tiempos = []
+    with tempfile.TemporaryDirectory(prefix="veterinaria_importacion_") as carpeta:
+        for _ in range(repeticiones):
+            proceso = subprocess.run([sys.executable, "-c", codigo], cwd=carpeta, env=entorno,
+                                     capture_output=True, text=True)
+            if proceso.returncode != 0:
+                raise RuntimeError(f"No se pudo importar el paquete:\n{proceso.stderr}")
+            milisegundos, cargados = proceso.stdout.splitlines()
+            tiempos.append(float(milisegundos))
+        archivos = sorted(os.listdir(carpeta))
+    return {
+        "milisegundos": round(min(tiempos), 1),
+        "modulos_cargados": [m for m in cargados.split(",") if m],
+        "archivos_creados": archivos
+    }
+
+def problemas_importacion(medicion):
+    """
+    Compara la medición de la importación con el presupuesto.
+
+    Parametros:
+        medicion: Diccionario devuelto por medir_importacion().
+
+    Retorno:
+        Una lista de textos con los problemas encontrados (vacía si se cumple el presupuesto).
+    """
+    problemas = []
+    if medicion["milisegundos"] > PRESUPUESTO_IMPORTACION_MS:
+        problemas.append(f"'import veterinaria' tardó {medicion['milisegundos']} ms "
+                         f"(presupuesto: {PRESUPUESTO_IMPORTACION_MS} ms).")
+    if medicion["modulos_cargados"]:
+        problemas.append(f"'import veterinaria' cargó {', '.join(medicion['modulos_cargados'])}.")
+    if medicion["archivos_creados"]:
+        problemas.append(f"'import veterinaria' creó {', '.join(medicion['archivos_creados'])}.")
+    return problemas
+
+def preparar_carpeta(carpeta_base, cantidad_atenciones):
+    """
+    Genera los datos de un tamaño y ejecuta el programa una vez (sin medir) para que convierta
+    los archivos a su formato de trabajo: particiones mensuales, agregados o base SQLite.
+
+    Parametros:
+        carpeta_base: Carpeta temporal del benchmark.
+        cantidad_atenciones: Cantidad de atenciones a generar.
+
+    Retorno:
+        Una tupla (carpeta, valores) con la carpeta preparada y los valores para las entradas.
+    """
+    carpeta = os.path.join(carpeta_base, f"datos_{cantidad_atenciones}")
+    os.makedirs(carpeta)
+    valores = generar_datos(carpeta, cantidad_atenciones)
+    ejecutar_programa(carpeta, CASOS["cargar_json"], os.path.join(carpeta_base, "medicion.json"))
+    return carpeta, valores
+
+def ejecutar_benchmark(tamanios, casos):
+    """
+    Mide cada caso con cada tamaño de datos. Cada caso trabaja sobre una copia nueva de los datos
+    preparados, para que un caso no afecte a los siguientes.
+
+    Parametros:
+        tamanios: Cantidades de atenciones a generar.
+        casos: Nombres de los casos a medir (claves de CASOS).
+
+    Retorno:
+        Una lista de diccionarios con el tamaño, el caso y sus mediciones.
+    """
+    resultados = []
+    with tempfile.TemporaryDirectory(prefix="veterinaria_benchmark_") as carpeta_base:
+        for cantidad in tamanios:
+            print(f"Generando {cantidad} atenciones...")
+            carpeta, valores = preparar_carpeta(carpeta_base, cantidad)
+            for caso in casos:
+                copia = os.path.join(carpeta_base, "caso")
+                shutil.copytree(carpeta, copia)
+                try:
+                    medicion = ejecutar_programa(copia, CASOS[caso].format(**valores),
+                                                 os.path.join(carpeta_base, "medicion.json"))
+                finally:
+                    shutil.rmtree(copia)
+                resultados.append({"atenciones": cantidad, "caso": caso, **medicion})
+                print(f"  {caso:<40}{medicion['segundos']:>10.3f} s{medicion['memoria_max_kb'] / 1024:>10.1f} MB")
+            shutil.rmtree(carpeta)
+    return resultados
+
+def version_actual():
+    """
+    Obtiene el commit actual del repositorio, para identificar la versión medida.
+
+    Retorno:
+        El hash corto del commit, o None si no se puede obtener.
+    """
+    try:
+        proceso = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=CARPETA,
+                                 capture_output=True, text=True)
+    except OSError:
+        return None
+    return proceso.stdout.strip() or None
+
+def comparar(anterior, actual):
+    """
+    Muestra la variación de tiempo, memoria y bytes escritos entre dos corridas del benchmark.
+
+    Parametros:
+        anterior: Diccionario de resultados de la corrida anterior.
+        actual: Diccionario de resultados de la corrida actual.
+    """
+    previos = {(r["atenciones"], r["caso"]): r for r in anterior["resultados"]}
+    print(f"\nComparación con la versión {anterior.get('version')} ({anterior.get('fecha')}):")
+    print(f"{'Atenciones':>10}  {'Caso':<40}{'Tiempo':>10}{'Memoria':>10}{'Escritos':>10}")
+    for r in actual["resultados"]:
+        previo = previos.get((r["atenciones"], r["caso"]))
+        if previo is None:
+            continue
+        variaciones = []
+        for campo in ("segundos", "memoria_max_kb", "bytes_escritos"):
+            if previo[campo] and r[campo] is not None:
+                variaciones.append(f"{(r[campo] / previo[campo] - 1) * 100:>+9.1f}%")
+            else:
+                variaciones.append(f"{'-':>10}")
+        print(f"{r['atenciones']:>10}  {r['caso']:<40}{''.join(variaciones)}")
+
+def main():
+    """
+    Interpreta los argumentos, ejecuta el benchmark, guarda los resultados en JSON y, si se pidió,
+    los compara con una corrida anterior.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark del sistema de gestión veterinaria.")
+    parser.add_argument("--tamanios", type=int, nargs="+", default=TAMANIOS,
+                        help="cantidades de atenciones a generar")
+    parser.add_argument("--casos", nargs="+", choices=CASOS, default=list(CASOS),
+                        help="casos a medir")
+    parser.add_argument("--salida", default="benchmark_resultados.json",
+                        help="archivo JSON donde se guardan los resultados")
+    parser.add_argument("--comparar", help="archivo JSON de una corrida anterior para comparar")
+    parser.add_argument("--importacion", action="store_true",
+                        help="solo verificar el tiempo de importación del paquete")
+    parser.add_argument("--medir", help=argparse.SUPPRESS)
+    argumentos = parser.parse_args()
+
+    if argumentos.medir:
+        medir(argumentos.medir)
+        return
+
+    importacion = medir_importacion()
+    print(f"Importación del paquete: {importacion['milisegundos']} ms (presupuesto: {PRESUPUESTO_IMPORTACION_MS} ms)")
+    problemas = problemas_importacion(importacion)
+    for problema in problemas:
+        print("ERROR:", problema)
+    if argumentos.importacion:
+        sys.exit(1 if problemas else 0)
+
+    actual = {
+        "version": version_actual(),
+        "fecha": time.strftime("%Y.%m.%d %H.%M.%S"),
+        "python": sys.version.split()[0],
+        "almacen": os.environ.get("VETERINARIA_ALMACEN", "json"),
+        "importacion": importacion,
+        "resultados": ejecutar_benchmark(argumentos.tamanios, argumentos.casos)
+    }
+    with open(argumentos.salida, "w", encoding="utf-8") as f:
+        json.dump(actual, f, ensure_ascii=False, indent=4)
+    print(f"Resultados guardados en {argumentos.salida}")
+
+    if argumentos.comparar:
+        with open(argumentos.comparar, encoding="utf-8") as f:
+            comparar(json.load(f), actual)
+    if problemas:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
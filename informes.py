@@ -0,0 +1,299 @@
+"""
+----------------------------------------------------------------------------------------------
+Generación de informes por lotes del Sistema de Gestión Veterinaria
+
+Genera muchos informes en una sola corrida (por ejemplo, el cierre de mes: las atenciones del
+mes y los resúmenes anuales de cada año y de cada propietario). Los datos se cargan una sola
+vez: el almacén se carga al comenzar y cada partición de atenciones se lee a lo sumo una vez,
+aunque varios informes la usen. Los informes se arman en paralelo con asyncio: los datos de
+cada uno se toman del almacén y el armado del texto se ejecuta en un grupo de procesos
+(ProcessPoolExecutor); cada informe se escribe en su propio archivo y se informa el tiempo
+que tardó.
+
+Uso:
+    python informes.py especificaciones.json [--carpeta informes] [--procesos N]
+    python informes.py --cierre AAAA.MM [--carpeta informes] [--procesos N]
+
+Especificaciones (lista JSON, un objeto por informe):
+    {"informe": "atenciones_mes", "mes": "AAAA.MM"}
+    {"informe": "resumen_cantidades", "anio": "AAAA"}
+    {"informe": "resumen_pesos", "anio": "AAAA"}
+    Opcionales: "propietario" (DNI, limita el informe a sus mascotas) y "salida" (nombre del
+    archivo dentro de la carpeta, sin carpetas; por defecto se arma con el informe, el período
+    y el DNI). Los valores son textos: "anio": 2023 es inválido.
+----------------------------------------------------------------------------------------------
+"""
+
+#----------------------------------------------------------------------------------------------
+# MÓDULOS
+#----------------------------------------------------------------------------------------------
+import asyncio
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import veterinaria
+
+#----------------------------------------------------------------------------------------------
+# FUNCIONES
+#----------------------------------------------------------------------------------------------
+
+INFORMES = ("atenciones_mes", "resumen_cantidades", "resumen_pesos")
+FORMATO_MES = r"^\d{4}\.(0[1-9]|1[0-2])$"
+
+resumenes = {} #En el proceso principal: (anio, campo) -> {dni: matriz de sus mascotas}
+nombres = {} #En cada proceso del grupo: {'mascotas': ..., 'propietarios': ...} con los nombres
+
+def validar_especificacion(especificacion):
+    """
+    Comprueba que una especificación de informe tenga los datos que necesita, como textos con
+    el formato esperado, y que su archivo de salida quede dentro de la carpeta de informes.
+
+    Parametros:
+        especificacion: Diccionario con 'informe' y su período ('mes' o 'anio').
+    """
+    if not isinstance(especificacion, dict) or especificacion.get("informe") not in INFORMES:
+        raise ValueError(f"Informe inválido: {especificacion!r} (debe ser uno de {', '.join(INFORMES)}).")
+    if especificacion["informe"] == "atenciones_mes":
+        mes = especificacion.get("mes")
+        if not isinstance(mes, str) or not re.fullmatch(FORMATO_MES, mes):
+            raise ValueError(f"Mes inválido en {especificacion!r} (texto con formato AAAA.MM).")
+    else:
+        anio = especificacion.get("anio")
+        if not isinstance(anio, str) or not re.fullmatch(r"\d{4}", anio):
+            raise ValueError(f"Año inválido en {especificacion!r} (texto con formato AAAA).")
+    propietario = especificacion.get("propietario")
+    if propietario is not None and (not isinstance(propietario, str) or not re.fullmatch(r"\d{8}", propietario)):
+        raise ValueError(f"Propietario inválido en {especificacion!r} (texto con el DNI).")
+    salida = especificacion.get("salida")
+    if salida is not None:
+        if (not isinstance(salida, str) or salida in ("", ".", "..") or os.sep in salida
+                or (os.altsep and os.altsep in salida)):
+            raise ValueError(f"Salida inválida en {especificacion!r} (nombre de archivo, sin carpetas).")
+
+def nombre_salida(especificacion):
+    """
+    Parametros:
+        especificacion: Especificación del informe.
+
+    Retorno:
+        El nombre del archivo del informe: el indicado en 'salida' o uno armado con el informe,
+        el período y el DNI del propietario.
+    """
+    if especificacion.get("salida") is not None:
+        return especificacion["salida"]
+    partes = [especificacion["informe"], especificacion.get("mes") or especificacion.get("anio")]
+    if especificacion.get("propietario"):
+        partes.append(especificacion["propietario"])
+    return "_".join(partes) + ".txt"
+
+def especificaciones_cierre(mes):
+    """
+    Arma las especificaciones del cierre de mes: las atenciones del mes, los dos resúmenes
+    anuales de cada año con atenciones y los dos resúmenes del año del mes para cada
+    propietario activo.
+
+    Parametros:
+        mes: Mes a cerrar ('AAAA.MM').
+
+    Retorno:
+        Una lista de especificaciones.
+    """
+    especificaciones = [{"informe": "atenciones_mes", "mes": mes}]
+    anios = sorted({m[:4] for m in veterinaria.almacen.meses_con_atenciones()} | {mes[:4]})
+    for anio in anios:
+        especificaciones.append({"informe": "resumen_cantidades", "anio": anio})
+        especificaciones.append({"informe": "resumen_pesos", "anio": anio})
+    for dni in veterinaria.propietarios_activos():
+        especificaciones.append({"informe": "resumen_cantidades", "anio": mes[:4], "propietario": dni})
+        especificaciones.append({"informe": "resumen_pesos", "anio": mes[:4], "propietario": dni})
+    return especificaciones
+
+def resumen_por_propietario(anio, campo):
+    """
+    Arma una sola vez la matriz anual de todas las mascotas y la reparte por propietario, así
+    los resúmenes de cada propietario no recorren todas las mascotas de nuevo.
+
+    Parametros:
+        anio: Año en formato AAAA.
+        campo: 'cantidad' o 'costo'.
+
+    Retorno:
+        Un diccionario dni -> {id_mascota: {mes: total}}.
+    """
+    if (anio, campo) not in resumenes:
+        mascotas = veterinaria.almacen.obtener("mascotas")
+        por_propietario = {}
+        for id_masc, meses in veterinaria.resumen_anual(anio, campo).items():
+            por_propietario.setdefault(mascotas[id_masc]["propietario"], {})[id_masc] = meses
+        resumenes[(anio, campo)] = por_propietario
+    return resumenes[(anio, campo)]
+
+def obtener_datos(especificacion):
+    """
+    Toma del almacén los datos de un informe. Se ejecuta en el proceso principal, que es el
+    único que tiene el almacén cargado.
+
+    Parametros:
+        especificacion: Especificación del informe.
+
+    Retorno:
+        Para 'atenciones_mes', la lista de pares (id_atencion, datos) del mes; para los
+        resúmenes, la matriz id_mascota -> {mes: total} de resumen_anual().
+    """
+    propietario = especificacion.get("propietario")
+    if especificacion["informe"] == "atenciones_mes":
+        mes = especificacion["mes"]
+        return list(veterinaria.consultar_atenciones(mes, mes, propietario=propietario))
+    campo = "cantidad" if especificacion["informe"] == "resumen_cantidades" else "costo"
+    if propietario is None:
+        return veterinaria.resumen_anual(especificacion["anio"], campo)
+    return resumen_por_propietario(especificacion["anio"], campo).get(propietario, {})
+
+def iniciar_proceso(mascotas, propietarios):
+    """
+    Inicializa cada proceso del grupo con los nombres de mascotas y propietarios, que se envían
+    una sola vez por proceso en lugar de una vez por informe.
+
+    Parametros:
+        mascotas: Diccionario id_mascota -> {'nombre': ...}.
+        propietarios: Diccionario dni -> {'nombre': ...}.
+    """
+    nombres["mascotas"] = mascotas
+    nombres["propietarios"] = propietarios
+
+def armar_informe(especificacion, datos):
+    """
+    Arma el texto de un informe con el mismo formato que el menú. Se ejecuta en un proceso del grupo.
+
+    Parametros:
+        especificacion: Especificación del informe.
+        datos: Los datos devueltos por obtener_datos().
+
+    Retorno:
+        Una tupla (texto, segundos que tardó el armado).
+    """
+    inicio = time.perf_counter()
+    mascotas = nombres["mascotas"]
+    propietarios = nombres["propietarios"]
+    lineas = []
+    if especificacion.get("propietario"):
+        dni = especificacion["propietario"]
+        lineas.append(f"Propietario: {dni} ({propietarios.get(dni, {}).get('nombre', 'no registrado')})")
+
+    if especificacion["informe"] == "atenciones_mes":
+        mes = especificacion["mes"]
+        lineas.extend(veterinaria.lineas_atenciones_mes(mes, datos, mascotas, propietarios))
+        if not datos:
+            lineas.append(f"No hay atenciones registradas en el mes {mes}.")
+    elif especificacion["informe"] == "resumen_cantidades":
+        lineas.extend(veterinaria.lineas_resumen_anual("CANTIDADES TOTALES POR MES", especificacion["anio"], datos, mascotas))
+    else:
+        lineas.extend(veterinaria.lineas_resumen_anual("PESOS TOTALES POR MES", especificacion["anio"], datos, mascotas, montos=True))
+    return "\n".join(lineas).lstrip("\n") + "\n", time.perf_counter() - inicio
+
+def escribir_informe(ruta, texto):
+    """
+    Parametros:
+        ruta: Archivo donde se guarda el informe.
+        texto: Texto del informe.
+    """
+    with open(ruta, "w", encoding="utf-8") as f:
+        f.write(texto)
+
+async def generar_informe(grupo, especificacion, carpeta):
+    """
+    Genera un informe: toma sus datos del almacén, arma el texto en el grupo de procesos y lo
+    escribe en su archivo.
+
+    Parametros:
+        grupo: ProcessPoolExecutor donde se arma el texto.
+        especificacion: Especificación del informe.
+        carpeta: Carpeta de salida.
+
+    Retorno:
+        Una tupla (ruta, segundos), donde segundos es el tiempo de trabajo del informe (obtener
+        los datos, armarlo y escribirlo), sin contar la espera por un proceso libre.
+    """
+    inicio = time.perf_counter()
+    datos = obtener_datos(especificacion)
+    segundos = time.perf_counter() - inicio
+    texto, armado = await asyncio.get_running_loop().run_in_executor(grupo, armar_informe, especificacion, datos)
+    ruta = os.path.join(carpeta, nombre_salida(especificacion))
+    inicio = time.perf_counter()
+    await asyncio.to_thread(escribir_informe, ruta, texto)
+    return ruta, segundos + armado + time.perf_counter() - inicio
+
+async def generar_informes(especificaciones, carpeta="informes", procesos=None):
+    """
+    Genera todos los informes en paralelo. El almacén ya debe estar cargado.
+
+    Parametros:
+        especificaciones: Lista de especificaciones.
+        carpeta: Carpeta donde se escriben los informes (se crea si no existe).
+        procesos: Cantidad de procesos del grupo; None usa uno por núcleo.
+
+    Retorno:
+        Una lista de tuplas (ruta, segundos), en el orden de las especificaciones.
+    """
+    for especificacion in especificaciones:
+        validar_especificacion(especificacion)
+    os.makedirs(carpeta, exist_ok=True)
+    mascotas = {id_masc: {"nombre": datos["nombre"]} for id_masc, datos in veterinaria.almacen.obtener("mascotas").items()}
+    propietarios = {dni: {"nombre": datos["nombre"]} for dni, datos in veterinaria.almacen.obtener("propietarios").items()}
+    with ProcessPoolExecutor(max_workers=procesos, initializer=iniciar_proceso, initargs=(mascotas, propietarios)) as grupo:
+        return await asyncio.gather(*(generar_informe(grupo, especificacion, carpeta) for especificacion in especificaciones))
+
+#----------------------------------------------------------------------------------------------
+# CUERPO PRINCIPAL
+#----------------------------------------------------------------------------------------------
+def main():
+    """
+    Lee las especificaciones (o arma las del cierre de mes), genera los informes y muestra el
+    tiempo de cada uno y el total.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Genera informes del sistema veterinario por lotes.")
+    parser.add_argument("especificaciones", nargs="?", help="archivo JSON con la lista de informes")
+    parser.add_argument("--cierre", metavar="AAAA.MM", help="genera los informes del cierre del mes indicado")
+    parser.add_argument("--carpeta", default="informes", help="carpeta donde se escriben los informes")
+    parser.add_argument("--procesos", type=int, default=None, help="cantidad de procesos (por defecto, uno por núcleo)")
+    argumentos = parser.parse_args()
+    if not argumentos.especificaciones and not argumentos.cierre:
+        parser.error("indique un archivo de especificaciones o --cierre AAAA.MM")
+
+    inicio = time.perf_counter()
+    try:
+        veterinaria.almacen.cargar()
+    except (json.JSONDecodeError, OSError) as e:
+        print("No se pudieron cargar los datos:", e)
+        return 1
+    carga = time.perf_counter() - inicio
+
+    try:
+        if argumentos.cierre:
+            if not re.fullmatch(FORMATO_MES, argumentos.cierre):
+                raise ValueError("Mes de cierre inválido (formato AAAA.MM).")
+            especificaciones = especificaciones_cierre(argumentos.cierre)
+        else:
+            with open(argumentos.especificaciones, encoding="utf-8") as f:
+                especificaciones = json.load(f)
+            if not isinstance(especificaciones, list):
+                raise ValueError("El archivo de especificaciones debe contener una lista de informes.")
+        resultados = asyncio.run(generar_informes(especificaciones, argumentos.carpeta, argumentos.procesos))
+    except (ValueError, OSError) as e:
+        print("Error:", e)
+        return 1
+
+    print(f"{'Carga de datos':<50} {carga:>8.3f} s")
+    for ruta, segundos in resultados:
+        print(f"{ruta:<50} {segundos:>8.3f} s")
+    print(f"{len(resultados)} informes en {time.perf_counter() - inicio:.3f} s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
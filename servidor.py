@@ -0,0 +1,403 @@
+"""
+----------------------------------------------------------------------------------------------
+Servidor HTTP del Sistema de Gestión Veterinaria
+
+Expone propietarios, mascotas, atenciones e informes como una API JSON local para que varios
+puestos (recepción, consultorios) usen el sistema al mismo tiempo. Usa solo la biblioteca
+estándar: cada pedido se atiende en su propio hilo (ThreadingHTTPServer) y todos comparten el
+almacén en memoria del paquete veterinaria. Las lecturas se ejecutan en paralelo y las escrituras de
+a una, con un bloqueo de lectura/escritura. Lo que el almacén guarda en memoria al consultar
+(colecciones leídas de a partes, archivos de registros, índices de búsqueda) se arma con su propio
+cerrojo, así las lecturas en paralelo no se pisan (ver Almacen).
+
+Antes de cada lectura se revisa si otro proceso (el menú en otra terminal u otro servidor) guardó
+cambios en la carpeta de datos; si es así, se incorporan con el bloqueo exclusivo y recién después
+se responde, así nunca se devuelven datos viejos.
+
+Uso:
+    python servidor.py [--host 127.0.0.1] [--puerto 8000]
+
+Rutas:
+    GET    /propietarios                      Propietarios activos
+    GET    /propietarios/buscar?texto=&limite=  Propietarios por palabras del nombre o la dirección
+    GET    /propietarios/sugerir?texto=&limite= Propietarios por comienzo del nombre, email o teléfono
+    GET    /propietarios/<dni>                Un propietario
+    POST   /propietarios                      Alta (dni, nombre, direccion, email, telefono_principal, telefono_emergencia)
+    PUT    /propietarios/<dni>                Modificación (solo los campos enviados)
+    DELETE /propietarios/<dni>                Baja (queda inactivo)
+    GET    /mascotas                          Mascotas activas
+    GET    /mascotas/sugerir?texto=&limite=   Mascotas por comienzo del nombre
+    GET    /mascotas/<id>                     Una mascota
+    GET    /mascotas/<id>/historial           Atenciones de la mascota
+    POST   /mascotas                          Alta (propietario, nombre, sexo, especie, raza, edad, peso)
+    PUT    /mascotas/<id>                     Modificación (solo los campos enviados)
+    DELETE /mascotas/<id>                     Baja (queda inactiva)
+    GET    /atenciones?desde=&hasta=&mascota=&propietario=&limite=
+    GET    /atenciones/buscar?texto=&limite=  Atenciones por palabras del motivo, diagnóstico o tratamiento
+    POST   /atenciones                        Registro (mascota, motivo, diagnostico, tratamiento, costo_veterinario, costo_medicamentos)
+    GET    /informes/mes?mes=AAAA.MM          Atenciones del mes (por defecto el actual)
+    GET    /informes/anual?anio=AAAA&campo=   Totales por mascota y mes (campo: cantidad o costo)
+----------------------------------------------------------------------------------------------
+"""
+
+#----------------------------------------------------------------------------------------------
+# MÓDULOS
+#----------------------------------------------------------------------------------------------
+import json
+import sys
+import threading
+import time
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import veterinaria
+
+#----------------------------------------------------------------------------------------------
+# FUNCIONES
+#----------------------------------------------------------------------------------------------
+
+class BloqueoLecturaEscritura:
+    """
+    Bloqueo que permite varios lectores a la vez o un solo escritor. Un escritor que espera tiene
+    prioridad sobre los lectores nuevos, así un flujo constante de consultas no demora los registros.
+    """
+
+    def __init__(self):
+        self.condicion = threading.Condition()
+        self.lectores = 0
+        self.escribiendo = False
+        self.escritores_esperando = 0
+
+    def adquirir_lectura(self):
+        """
+        Espera a que no haya escritores activos ni esperando y entra como lector.
+        """
+        with self.condicion:
+            while self.escribiendo or self.escritores_esperando:
+                self.condicion.wait()
+            self.lectores += 1
+
+    def liberar_lectura(self):
+        """
+        Sale como lector; el último lector despierta a los escritores que esperan.
+        """
+        with self.condicion:
+            self.lectores -= 1
+            if self.lectores == 0:
+                self.condicion.notify_all()
+
+    def adquirir_escritura(self):
+        """
+        Espera a que no queden lectores ni otro escritor y entra como único escritor.
+        """
+        with self.condicion:
+            self.escritores_esperando += 1
+            while self.escribiendo or self.lectores:
+                self.condicion.wait()
+            self.escritores_esperando -= 1
+            self.escribiendo = True
+
+    def liberar_escritura(self):
+        """
+        Sale como escritor y despierta a todos los que esperan.
+        """
+        with self.condicion:
+            self.escribiendo = False
+            self.condicion.notify_all()
+
+    def ejecutar(self, funcion, escritura=False):
+        """
+        Ejecuta una función con el bloqueo tomado en modo lectura o escritura.
+
+        Parametros:
+            funcion: Función sin parámetros a ejecutar.
+            escritura: True para tomar el bloqueo en modo exclusivo.
+
+        Retorno:
+            Lo que devuelva la función.
+        """
+        if escritura:
+            self.adquirir_escritura()
+            try:
+                return funcion()
+            finally:
+                self.liberar_escritura()
+        self.adquirir_lectura()
+        try:
+            return funcion()
+        finally:
+            self.liberar_lectura()
+
+bloqueo = BloqueoLecturaEscritura() #Bloqueo compartido por todos los hilos del servidor
+
+class NoEncontrado(Exception):
+    """
+    El recurso pedido no existe (se responde con 404).
+    """
+
+def lista_atenciones(atenciones, limite=None):
+    """
+    Convierte pares (id_atencion, datos) en una lista de objetos JSON con el ID incluido.
+
+    Parametros:
+        atenciones: Iterable de pares (id_atencion, datos).
+        limite: Cantidad máxima de atenciones, o None para todas.
+
+    Retorno:
+        Una lista de diccionarios.
+    """
+    resultado = []
+    for id_atencion, datos in atenciones:
+        if limite is not None and len(resultado) >= limite:
+            break
+        resultado.append({"id": id_atencion, **datos})
+    return resultado
+
+def entero_limite(parametros, defecto=20):
+    """
+    Parametros:
+        parametros: Diccionario con los parámetros de la consulta.
+        defecto: Límite si no se indica (None para ninguno).
+
+    Retorno:
+        El parámetro 'limite' como número.
+    """
+    limite = parametros.get("limite", "")
+    if limite and not limite.isdigit():
+        raise ValueError("Límite inválido.")
+    return int(limite) if limite else defecto
+
+def buscar(nombre, clave):
+    """
+    Busca un propietario o una mascota por su clave.
+
+    Parametros:
+        nombre: 'propietarios' o 'mascotas'.
+        clave: DNI o ID.
+
+    Retorno:
+        Un diccionario con la clave y los datos del registro.
+    """
+    registros = veterinaria.almacen.obtener(nombre)
+    if clave not in registros:
+        raise NoEncontrado(f"No existe {clave} en {nombre}.")
+    return {"id": clave, **registros[clave]}
+
+def codificar(datos):
+    """
+    Retorno:
+        Los datos convertidos a JSON en UTF-8.
+    """
+    return json.dumps(datos, ensure_ascii=False, default=veterinaria.a_json).encode("utf-8")
+
+def texto(cuerpo, campo):
+    """
+    Lee un campo del cuerpo del pedido como texto ('' si no vino).
+    """
+    valor = cuerpo.get(campo)
+    return "" if valor is None else str(valor).strip()
+
+def resolver(metodo, partes, parametros, cuerpo):
+    """
+    Ejecuta la operación que corresponde a una ruta con las funciones de servicio del paquete veterinaria.
+
+    Parametros:
+        metodo: 'GET', 'POST', 'PUT' o 'DELETE'.
+        partes: Segmentos de la ruta, por ejemplo ['mascotas', '10000001', 'historial'].
+        parametros: Diccionario con los parámetros de la consulta (?clave=valor).
+        cuerpo: Diccionario con el JSON recibido (vacío en GET y DELETE).
+
+    Retorno:
+        Una tupla (codigo_http, operacion, escritura): operacion es una función sin parámetros que
+        hace el trabajo y devuelve los datos a responder, para ejecutarla con el bloqueo tomado;
+        escritura indica si modifica datos.
+    """
+    if partes == ["propietarios"] and metodo == "GET":
+        return 200, lambda: veterinaria.propietarios_activos(), False
+    if partes == ["propietarios"] and metodo == "POST":
+        return 201, lambda: {"dni": veterinaria.crear_propietario(
+            texto(cuerpo, "dni"), texto(cuerpo, "nombre"), texto(cuerpo, "direccion"), texto(cuerpo, "email"),
+            texto(cuerpo, "telefono_principal"), texto(cuerpo, "telefono_emergencia"))}, True
+    if partes == ["propietarios", "buscar"] and metodo == "GET":
+        limite = entero_limite(parametros)
+        return 200, lambda: [{"id": dni, **datos} for dni, datos in veterinaria.buscar_propietarios(
+            parametros.get("texto", ""), limite)], False
+    if partes == ["propietarios", "sugerir"] and metodo == "GET":
+        limite = entero_limite(parametros, 10)
+        return 200, lambda: [{"id": dni, **datos} for dni, datos in veterinaria.sugerir_propietarios(
+            parametros.get("texto", ""), limite)], False
+    if len(partes) == 2 and partes[0] == "propietarios":
+        dni = partes[1]
+        if metodo == "GET":
+            return 200, lambda: buscar("propietarios", dni), False
+        if metodo == "PUT":
+            return 200, lambda: veterinaria.actualizar_propietario(
+                dni, texto(cuerpo, "nombre"), texto(cuerpo, "direccion"), texto(cuerpo, "email"),
+                texto(cuerpo, "telefono_principal"), texto(cuerpo, "telefono_emergencia")), True
+        if metodo == "DELETE":
+            return 200, lambda: veterinaria.desactivar_propietario(dni) or {"dni": dni, "activo": False}, True
+
+    if partes == ["mascotas"] and metodo == "GET":
+        return 200, lambda: veterinaria.mascotas_activas(), False
+    if partes == ["mascotas"] and metodo == "POST":
+        return 201, lambda: {"id": veterinaria.crear_mascota(
+            texto(cuerpo, "propietario"), texto(cuerpo, "nombre"), texto(cuerpo, "sexo"), texto(cuerpo, "especie"),
+            texto(cuerpo, "raza"), texto(cuerpo, "edad"), texto(cuerpo, "peso"))}, True
+    if len(partes) == 3 and partes[0] == "mascotas" and partes[2] == "historial" and metodo == "GET":
+        return 200, lambda: lista_atenciones(veterinaria.historial_atenciones(partes[1])), False
+    if partes == ["mascotas", "sugerir"] and metodo == "GET":
+        limite = entero_limite(parametros, 10)
+        return 200, lambda: [{"id": id_masc, **datos} for id_masc, datos in veterinaria.sugerir_mascotas(
+            parametros.get("texto", ""), limite)], False
+    if len(partes) == 2 and partes[0] == "mascotas":
+        id_masc = partes[1]
+        if metodo == "GET":
+            return 200, lambda: buscar("mascotas", id_masc), False
+        if metodo == "PUT":
+            return 200, lambda: veterinaria.actualizar_mascota(
+                id_masc, texto(cuerpo, "nombre"), texto(cuerpo, "sexo"), texto(cuerpo, "especie"),
+                texto(cuerpo, "raza"), texto(cuerpo, "edad"), texto(cuerpo, "peso")), True
+        if metodo == "DELETE":
+            return 200, lambda: veterinaria.desactivar_mascota(id_masc) or {"id": id_masc, "activo": False}, True
+
+    if partes == ["atenciones"] and metodo == "GET":
+        limite = entero_limite(parametros, None)
+        return 200, lambda: lista_atenciones(veterinaria.consultar_atenciones(
+            parametros.get("desde", ""), parametros.get("hasta", ""),
+            parametros.get("mascota"), parametros.get("propietario")), limite), False
+    if partes == ["atenciones", "buscar"] and metodo == "GET":
+        limite = entero_limite(parametros)
+        return 200, lambda: lista_atenciones(veterinaria.buscar_atenciones(parametros.get("texto", ""), limite)), False
+    if partes == ["atenciones"] and metodo == "POST":
+        return 201, lambda: {"id": veterinaria.crear_atencion(
+            texto(cuerpo, "mascota"), texto(cuerpo, "motivo"), texto(cuerpo, "diagnostico"),
+            texto(cuerpo, "tratamiento"), texto(cuerpo, "costo_veterinario"), texto(cuerpo, "costo_medicamentos"))}, True
+
+    if partes == ["informes", "mes"] and metodo == "GET":
+        mes = parametros.get("mes") or time.strftime("%Y.%m")
+        return 200, lambda: lista_atenciones(veterinaria.consultar_atenciones(mes, mes)), False
+    if partes == ["informes", "anual"] and metodo == "GET":
+        campo = parametros.get("campo", "cantidad")
+        if campo not in ("cantidad", "costo", "costo_veterinario", "costo_medicamentos"):
+            raise ValueError("Campo inválido.")
+        return 200, lambda: veterinaria.resumen_anual(parametros.get("anio", ""), campo), False
+
+    raise NoEncontrado("Ruta no encontrada.")
+
+class ManejadorVeterinaria(BaseHTTPRequestHandler):
+    """
+    Atiende cada pedido HTTP: interpreta la ruta, ejecuta la operación con el bloqueo compartido
+    y responde en JSON. Los errores de validación (ValueError) se responden con 400 y cualquier
+    otro error, con 500 y un mensaje genérico (el detalle se muestra en la consola del servidor).
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.atender("GET")
+
+    def do_POST(self):
+        self.atender("POST")
+
+    def do_PUT(self):
+        self.atender("PUT")
+
+    def do_DELETE(self):
+        self.atender("DELETE")
+
+    def atender(self, metodo):
+        """
+        Ejecuta el pedido y envía la respuesta.
+
+        Parametros:
+            metodo: Método HTTP del pedido.
+        """
+        url = urlsplit(self.path)
+        partes = [parte for parte in url.path.split("/") if parte]
+        parametros = {clave: valores[0] for clave, valores in parse_qs(url.query).items()}
+        try:
+            cuerpo = self.leer_cuerpo()
+            codigo, operacion, escritura = resolver(metodo, partes, parametros, cuerpo)
+            if not escritura and bloqueo.ejecutar(veterinaria.almacen.hay_cambios):
+                #Otro proceso guardó cambios: se incorporan de a uno, sin lectores a la vez (las escrituras ya sincronizan)
+                bloqueo.ejecutar(veterinaria.almacen.sincronizar, escritura=True)
+            #Se convierte a JSON con el bloqueo tomado, para que otro hilo no cambie los datos mientras tanto
+            contenido = bloqueo.ejecutar(lambda: codificar(operacion()), escritura)
+        except NoEncontrado as e:
+            self.responder(404, codificar({"error": str(e)}))
+        except ValueError as e:
+            self.responder(400, codificar({"error": str(e)}))
+        except Exception:
+            #El detalle queda en la consola del servidor; el cliente no ve rutas ni datos internos
+            print(f"Error interno en {metodo} {self.path}:", file=sys.stderr)
+            traceback.print_exc()
+            self.responder(500, codificar({"error": "Error interno"}))
+        else:
+            self.responder(codigo, contenido)
+
+    def leer_cuerpo(self):
+        """
+        Retorno:
+            El JSON recibido en el cuerpo del pedido como diccionario (vacío si no hay cuerpo).
+        """
+        largo = int(self.headers.get("Content-Length") or 0)
+        if not largo:
+            return {}
+        try:
+            cuerpo = json.loads(self.rfile.read(largo))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            raise ValueError("El cuerpo del pedido no es un JSON válido.")
+        if not isinstance(cuerpo, dict):
+            raise ValueError("El cuerpo del pedido debe ser un objeto JSON.")
+        return cuerpo
+
+    def responder(self, codigo, contenido):
+        """
+        Envía una respuesta JSON.
+
+        Parametros:
+            codigo: Código HTTP.
+            contenido: JSON ya codificado en bytes.
+        """
+        self.send_response(codigo)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(contenido)))
+        self.end_headers()
+        self.wfile.write(contenido)
+
+    def log_message(self, formato, *argumentos):
+        return #No se muestra una línea por cada pedido
+
+#----------------------------------------------------------------------------------------------
+# CUERPO PRINCIPAL
+#----------------------------------------------------------------------------------------------
+def main():
+    """
+    Carga el almacén, inicia el servidor y, al detenerlo con Ctrl+C, vuelca el diario a los archivos.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Servidor HTTP del sistema de gestión veterinaria.")
+    parser.add_argument("--host", default="127.0.0.1", help="dirección donde escuchar")
+    parser.add_argument("--puerto", type=int, default=8000, help="puerto donde escuchar")
+    argumentos = parser.parse_args()
+
+    try:
+        veterinaria.almacen.cargar()
+    except (json.JSONDecodeError, OSError) as e:
+        print("No se pudieron cargar los datos:", e)
+        return
+
+    servidor = ThreadingHTTPServer((argumentos.host, argumentos.puerto), ManejadorVeterinaria)
+    print(f"Servidor veterinaria escuchando en http://{argumentos.host}:{argumentos.puerto}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\nDeteniendo servidor...")
+    finally:
+        servidor.server_close()
+        bloqueo.ejecutar(veterinaria.almacen.compactar, escritura=True)
+
+if __name__ == "__main__":
+    main()
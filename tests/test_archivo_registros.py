@@ -0,0 +1,83 @@
+"""
+Pruebas de los archivos de registros de las particiones ('.dat'): los IDs que no entran en un
+registro no se guardan cortados ni rompen la escritura, y la partición se sigue leyendo del JSON.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from veterinaria.almacenamiento import Almacen, ArchivoRegistros
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+VERSION = (1, 2, 3)
+
+
+def atencion(motivo="Control"):
+    return {"mascota": "10000001", "propietario": "12345678", "motivo": motivo, "diagnostico": "Sano",
+            "tratamiento": "Ninguno", "costo_veterinario": 1000.0, "costo_medicamentos": 0.0, "costo": 1000.0}
+
+
+class PruebaArchivoRegistros(unittest.TestCase):
+
+    def setUp(self):
+        self.carpeta = tempfile.TemporaryDirectory()
+        self.addCleanup(self.carpeta.cleanup)
+        self.ruta = os.path.join(self.carpeta.name, "2024.01.dat")
+
+    def test_lectura_de_los_registros_escritos(self):
+        ids = ["2024.01.05 10.00.00.000001-0000", "2024.01.05 10.00.00", "2024.01.31 23.59.59.999999-ffff"]
+        ArchivoRegistros.escribir(self.ruta, [(id_atencion, atencion(id_atencion[-4:])) for id_atencion in ids], VERSION)
+        registros = ArchivoRegistros(self.ruta)
+        self.addCleanup(registros.cerrar)
+        self.assertEqual(registros.version, VERSION)
+        for id_atencion in ids:
+            self.assertEqual(registros.obtener(id_atencion), atencion(id_atencion[-4:]))
+        for id_atencion in ("2024.01.05 10.00.00.000001-0000x", "2024.01.05 10.00.00.000001-0000" + "0" * 10, "2024.01.05 ñ"):
+            self.assertEqual(registros.posicion(id_atencion), -1)
+
+    def test_ids_que_no_entran_en_un_registro(self):
+        largo = "2024.01.05 10.00.00.000001-0000"
+        for ids in ([largo + "a", largo + "b"], ["2024.01.05 10.00.00 ñ"], ["2024.01.05 10.00.00 "]):
+            with self.subTest(ids=ids):
+                with self.assertRaises(ValueError):
+                    ArchivoRegistros.escribir(self.ruta, [(id_atencion, atencion()) for id_atencion in ids], VERSION)
+                self.assertFalse(os.path.exists(self.ruta))
+                self.assertEqual(os.listdir(self.carpeta.name), [])
+
+
+class PruebaParticionSinRegistros(unittest.TestCase):
+
+    def setUp(self):
+        carpeta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, carpeta, True)
+        for archivo in ("propietarios.json", "mascotas.json", "atenciones.json"):
+            shutil.copy(os.path.join(RAIZ, archivo), carpeta)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(carpeta)
+        Almacen().cargar() #Migra las atenciones a particiones
+
+    def test_id_largo_se_lee_del_json(self):
+        almacen = Almacen()
+        almacen.cargar()
+        nombre = almacen.particiones()[0]
+        archivo = almacen.archivo(nombre)
+        with open(archivo, encoding="utf-8") as f:
+            atenciones = json.load(f)
+        id_largo = min(atenciones) + "-importada-de-otro-sistema"
+        atenciones[id_largo] = atencion()
+        with open(archivo, "w", encoding="utf-8") as f:
+            json.dump(dict(sorted(atenciones.items())), f)
+
+        with mock.patch.object(Almacen, "escribir_registros", wraps=almacen.escribir_registros) as escribir:
+            self.assertIsNone(almacen.registros_particion(nombre))
+            self.assertIsNone(almacen.registros_particion(nombre)) #No se vuelve a intentar con el mismo JSON
+            self.assertEqual(escribir.call_count, 1)
+        self.assertEqual(almacen.obtener(nombre)[id_largo], atencion())
+
+
+if __name__ == "__main__":
+    unittest.main()
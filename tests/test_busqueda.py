@@ -0,0 +1,178 @@
+"""
+Pruebas de las búsquedas por texto, nombre y contacto: orden por relevancia, comparación sin
+mayúsculas ni acentos, y los índices al día después de modificar o borrar registros.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from veterinaria.almacenamiento import Almacen
+from veterinaria.busqueda import CAMPOS_CONTACTO, IndiceRegistros, IndiceTextos, normalizar, terminos
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def atencion(motivo, diagnostico="", tratamiento=""):
+    return {"mascota": "10000001", "propietario": "38111222", "motivo": motivo, "diagnostico": diagnostico,
+            "tratamiento": tratamiento, "costo_veterinario": 1000.0, "costo_medicamentos": 0.0, "costo": 1000.0}
+
+
+class PruebaTerminos(unittest.TestCase):
+
+    def test_sin_mayusculas_ni_acentos(self):
+        self.assertEqual(normalizar("ÑANDÚ Pingüino Artrítis"), "nandu pinguino artritis")
+        self.assertEqual(terminos("La ARTRÍTIS de la pata"), ("artritis", "pata"))
+        self.assertEqual(terminos("Artritis, artrítis y ARTRITIS"), ("artritis",))
+        self.assertEqual(terminos("de la y"), ())
+
+
+class PruebaIndiceTextos(unittest.TestCase):
+
+    def setUp(self):
+        self.indice = IndiceTextos(("motivo", "diagnostico"))
+        self.indice.agregar("a", {"motivo": "Control", "diagnostico": "Sano"})
+        self.indice.agregar("b", {"motivo": "Control", "diagnostico": "Otitis"})
+        self.indice.agregar("c", {"motivo": "Control", "diagnostico": "Otitis y dermatitis"})
+        self.indice.agregar("d", {"motivo": "Vacuna", "diagnostico": None})
+
+    def test_orden_por_relevancia(self):
+        #Más palabras buscadas primero; a igual cantidad, las menos frecuentes pesan más
+        self.assertEqual(self.indice.buscar("control otitis dermatitis"), ["c", "b", "a"])
+        self.assertEqual(self.indice.buscar("control vacuna"), ["d", "a", "b", "c"])
+        self.assertEqual(self.indice.buscar("control vacuna", limite=2), ["d", "a"])
+        self.assertEqual(self.indice.buscar("OTÍTIS"), ["b", "c"])
+        self.assertEqual(self.indice.buscar("fractura"), [])
+
+    def test_modificar_y_quitar(self):
+        self.indice.agregar("b", {"motivo": "Cirugía", "diagnostico": "Fractura"})
+        self.assertEqual(self.indice.buscar("otitis"), ["c"])
+        self.assertEqual(self.indice.buscar("cirugia"), ["b"])
+        self.indice.quitar("c")
+        self.indice.quitar("inexistente")
+        self.assertEqual(self.indice.buscar("otitis"), [])
+        self.assertNotIn("dermatitis", self.indice.claves)
+
+
+class PruebaIndiceRegistros(unittest.TestCase):
+
+    def setUp(self):
+        self.indice = IndiceRegistros(CAMPOS_CONTACTO)
+        self.indice.cargar([("1", {"nombre": "María Luisa Pérez", "email": "Maria@Email.com",
+                                   "telefonos": {"principal": "1155667788", "emergencia": "1199887766"}}),
+                            ("2", {"nombre": "Mario Peralta", "email": "mario@email.com",
+                                   "telefonos": {"principal": "1155667788", "emergencia": ""}}),
+                            ("3", {"nombre": "Luis Martínez", "email": None, "telefonos": None})])
+
+    def test_comienzo_del_nombre(self):
+        self.assertEqual(self.indice.buscar_nombre("mar"), ["1", "2", "3"])
+        self.assertEqual(self.indice.buscar_nombre("mar per"), ["1", "2"])
+        self.assertEqual(self.indice.buscar_nombre("PÉREZ luis"), ["1"])
+        self.assertEqual(self.indice.buscar_nombre("mar", limite=1), ["1"])
+        self.assertEqual(self.indice.buscar_nombre(""), [])
+
+    def test_contacto(self):
+        self.assertEqual(self.indice.buscar_valor("email", " maria@email.COM "), ["1"])
+        self.assertEqual(self.indice.buscar_valor("telefono", "1155667788"), ["1", "2"])
+        self.assertEqual(self.indice.buscar_valor("telefono", ""), [])
+
+    def test_modificar_y_quitar(self):
+        self.indice.agregar("2", {"nombre": "Mario Gómez", "email": "mgomez@email.com", "telefonos": {}})
+        self.assertEqual(self.indice.buscar_nombre("mar per"), ["1"])
+        self.assertEqual(self.indice.buscar_nombre("gom"), ["2"])
+        self.assertEqual(self.indice.buscar_valor("telefono", "1155667788"), ["1"])
+        self.assertEqual(self.indice.buscar_valor("email", "mario@email.com"), [])
+        self.indice.quitar("1")
+        self.assertEqual(self.indice.buscar_nombre("mar"), ["2", "3"])
+        self.assertEqual(self.indice.buscar_valor("telefono", "1155667788"), [])
+        self.assertEqual(self.indice.palabras, sorted(self.indice.palabras))
+
+
+class PruebaBusquedasAlmacen(unittest.TestCase):
+
+    def setUp(self):
+        carpeta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, carpeta, True)
+        for archivo in ("propietarios.json", "mascotas.json", "atenciones.json"):
+            shutil.copy(os.path.join(RAIZ, archivo), carpeta)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(carpeta)
+        Almacen().cargar() #Migra las atenciones a particiones
+        self.almacen = Almacen()
+        self.almacen.cargar()
+
+    def ids(self, consulta, limite=20):
+        return [id_atencion for id_atencion, _ in self.almacen.buscar_atenciones(consulta, limite)]
+
+    def test_atenciones_del_diario_y_de_las_particiones(self):
+        self.almacen.agregar_atencion("2025.01.10 10.00.00.000000-0001", atencion("Cojera", "Luxación de cadera"))
+        self.almacen.agregar_atencion("2025.02.10 10.00.00.000000-0001", atencion("Cojera", "Esguince"))
+        self.almacen.agregar_atencion("2025.02.11 10.00.00.000000-0001", atencion("Control", "Luxacion leve", "Reposo"))
+        #Primero la que tiene las dos palabras; a igual relevancia, la más reciente
+        esperado = ["2025.01.10 10.00.00.000000-0001", "2025.02.11 10.00.00.000000-0001", "2025.02.10 10.00.00.000000-0001"]
+        self.assertEqual(self.ids("COJERA luxacion"), esperado)
+        self.assertEqual(self.ids("LUXACIÓN"), esperado[:2][::-1])
+        self.assertEqual(self.ids("luxacion esguince"), esperado[::-1]) #La palabra menos frecuente pesa más
+        self.assertEqual(self.ids("cojera luxación", limite=1), esperado[:1])
+
+        self.almacen.compactar() #Pasan del índice del diario al de sus particiones
+        self.assertEqual(self.ids("COJERA luxacion"), esperado)
+        almacen = Almacen()
+        almacen.cargar()
+        self.assertEqual([id_atencion for id_atencion, _ in almacen.buscar_atenciones("cojera luxación")], esperado)
+
+    def test_atencion_modificada(self):
+        id_atencion = "2025.01.10 10.00.00.000000-0001"
+        self.almacen.agregar_atencion(id_atencion, atencion("Cojera", "Luxación"))
+        self.almacen.compactar()
+        self.assertEqual(self.ids("luxacion"), [id_atencion])
+        self.almacen.agregar_atencion(id_atencion, atencion("Cojera", "Fractura"))
+        self.assertEqual(self.ids("luxacion"), [])
+        self.assertEqual(self.ids("fractura"), [id_atencion])
+        self.almacen.compactar()
+        self.assertEqual(self.ids("luxacion"), [])
+        self.assertEqual(self.ids("fractura"), [id_atencion])
+
+    def test_propietarios_modificados_y_borrados(self):
+        propietarios = self.almacen.obtener("propietarios")
+        #Arma los índices antes de los cambios
+        self.assertEqual([dni for dni, _ in self.almacen.buscar_propietarios("siempreviva")], ["38111222"])
+        self.assertEqual([dni for dni, _ in self.almacen.buscar_por_nombre("propietarios", "gal")], ["38111222"])
+        self.assertEqual([dni for dni, _ in self.almacen.buscar_por_contacto("email", "juan.galvan@email.com")],
+                         ["38111222"])
+
+        propietarios["38111222"]["nombre"] = "Juan José Ñáñez"
+        propietarios["38111222"]["direccion"] = "Calle Única 10"
+        propietarios["38111222"]["email"] = "jnanez@email.com"
+        self.almacen.marcar("propietarios", "38111222")
+        self.assertEqual(self.almacen.buscar_propietarios("siempreviva"), [])
+        self.assertEqual([dni for dni, _ in self.almacen.buscar_propietarios("unica nanez")], ["38111222"])
+        self.assertEqual(self.almacen.buscar_por_nombre("propietarios", "galv"), [])
+        self.assertEqual([dni for dni, _ in self.almacen.buscar_por_nombre("propietarios", "ÑAÑ")], ["38111222"])
+        self.assertEqual(self.almacen.buscar_por_contacto("email", "juan.galvan@email.com"), [])
+        self.assertEqual([dni for dni, _ in self.almacen.buscar_por_contacto("email", "JNANEZ@email.com")], ["38111222"])
+
+        del propietarios["40233455"]
+        self.almacen.marcar("propietarios", "40233455")
+        self.assertEqual(self.almacen.buscar_propietarios("falsa"), [])
+        self.assertEqual(self.almacen.buscar_por_nombre("propietarios", "maria luisa"), [])
+        self.assertEqual(self.almacen.buscar_por_contacto("telefono", "1155667788"), [])
+
+        self.assertTrue(self.almacen.guardar())
+        almacen = Almacen()
+        almacen.cargar()
+        self.assertEqual([dni for dni, _ in almacen.buscar_propietarios("unica nanez")], ["38111222"])
+        self.assertEqual(almacen.buscar_por_nombre("propietarios", "maria luisa"), [])
+
+    def test_mascota_modificada(self):
+        mascotas = self.almacen.obtener("mascotas")
+        self.assertEqual([id_masc for id_masc, _ in self.almacen.buscar_por_nombre("mascotas", "max")], ["10000001"])
+        mascotas["10000001"]["nombre"] = "Rocío"
+        self.almacen.marcar("mascotas", "10000001")
+        self.assertEqual(self.almacen.buscar_por_nombre("mascotas", "max"), [])
+        self.assertEqual([id_masc for id_masc, _ in self.almacen.buscar_por_nombre("mascotas", "roci")], ["10000001"])
+
+
+if __name__ == "__main__":
+    unittest.main()
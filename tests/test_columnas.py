@@ -0,0 +1,76 @@
+"""
+Pruebas de ColumnasAtenciones: los agregados mensuales por mascota son los mismos con NumPy y
+con el cálculo en Python puro.
+"""
+
+import random
+import unittest
+from unittest import mock
+
+from veterinaria.almacenamiento import ColumnasAtenciones, cargar_numpy
+
+
+def atenciones_de_prueba(cantidad=3000):
+    """
+    Retorno:
+        Una lista ordenada de pares (id_atencion, datos) de dos años, con mascotas que cambian de propietario.
+    """
+    azar = random.Random(6)
+    atenciones = []
+    for n in range(cantidad):
+        anio = azar.choice((2023, 2024))
+        mes = azar.randint(1, 12)
+        mascota = "1%07d" % azar.randint(1, 40)
+        costo_veterinario = round(azar.uniform(0, 5000), 2)
+        costo_medicamentos = round(azar.uniform(0, 800), 2)
+        atenciones.append(("%d.%02d.%02d 10.00.00.%06d-0000" % (anio, mes, azar.randint(1, 28), n), {
+            "mascota": mascota, "propietario": "2%07d" % (int(mascota) % 7 + n % 2), "motivo": "Control",
+            "diagnostico": "", "tratamiento": "", "costo_veterinario": costo_veterinario,
+            "costo_medicamentos": costo_medicamentos, "costo": costo_veterinario + costo_medicamentos}))
+    return sorted(atenciones)
+
+
+def redondear(agregados):
+    return {mes: {mascota: {campo: round(valor, 6) if isinstance(valor, float) else valor
+                            for campo, valor in totales.items()}
+                  for mascota, totales in mascotas.items()}
+            for mes, mascotas in agregados.items()}
+
+
+class PruebaAgregados(unittest.TestCase):
+
+    def test_python_puro(self):
+        atenciones = atenciones_de_prueba()
+        esperado = {}
+        for id_atencion, datos in atenciones:
+            totales = esperado.setdefault(id_atencion[:7], {}).setdefault(datos["mascota"], {
+                "cantidad": 0, "costo": 0.0, "costo_veterinario": 0.0, "costo_medicamentos": 0.0})
+            totales["cantidad"] += 1
+            for campo in ColumnasAtenciones.CAMPOS_COSTO:
+                totales[campo] += datos[campo]
+        for mascotas in esperado.values():
+            for mascota, totales in mascotas.items(): #El propietario de la última atención de la mascota
+                totales["propietario"] = [d["propietario"] for _, d in atenciones if d["mascota"] == mascota][-1]
+
+        with mock.patch("veterinaria.almacenamiento.cargar_numpy", return_value=None):
+            agregados = ColumnasAtenciones(atenciones).agregados()
+        self.assertEqual(list(agregados), sorted(esperado))
+        self.assertEqual(redondear(agregados), redondear(esperado))
+
+    @unittest.skipIf(cargar_numpy() is None, "NumPy no está instalado")
+    def test_numpy_igual_a_python(self):
+        for atenciones in (atenciones_de_prueba(), atenciones_de_prueba(1), []):
+            with self.subTest(cantidad=len(atenciones)):
+                con_numpy = ColumnasAtenciones(atenciones).agregados()
+                with mock.patch("veterinaria.almacenamiento.cargar_numpy", return_value=None):
+                    sin_numpy = ColumnasAtenciones(atenciones).agregados()
+                self.assertEqual(list(con_numpy), list(sin_numpy))
+                self.assertEqual(redondear(con_numpy), redondear(sin_numpy))
+                for mascotas in con_numpy.values():
+                    for totales in mascotas.values():
+                        self.assertIs(type(totales["cantidad"]), int)
+                        self.assertIs(type(totales["costo"]), float)
+
+
+if __name__ == "__main__":
+    unittest.main()
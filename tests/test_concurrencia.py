@@ -0,0 +1,122 @@
+"""
+Pruebas de las consultas al almacén desde varios hilos a la vez (como las hace el servidor HTTP).
+"""
+
+import gc
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import weakref
+
+from veterinaria.almacenamiento import Almacen, PausaRecolector
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HILOS = 8
+
+
+def en_paralelo(funcion):
+    """
+    Ejecuta la función en varios hilos que arrancan juntos y devuelve sus resultados.
+    """
+    barrera = threading.Barrier(HILOS)
+    resultados = [None] * HILOS
+    errores = []
+
+    def ejecutar(i):
+        barrera.wait()
+        try:
+            resultados[i] = funcion()
+        except Exception as error:
+            errores.append(error)
+
+    hilos = [threading.Thread(target=ejecutar, args=(i,)) for i in range(HILOS)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    if errores:
+        raise errores[0]
+    return resultados
+
+
+class PruebaConsultasConcurrentes(unittest.TestCase):
+
+    def setUp(self):
+        carpeta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, carpeta, True)
+        for archivo in ("propietarios.json", "mascotas.json", "atenciones.json"):
+            shutil.copy(os.path.join(RAIZ, archivo), carpeta)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(carpeta)
+        Almacen().cargar() #Migra las atenciones a particiones y escribe instantáneas y registros
+
+    def test_archivo_de_registros_se_abre_una_vez(self):
+        almacen = Almacen()
+        almacen.cargar()
+        nombre = almacen.particiones()[0]
+        registros = en_paralelo(lambda: almacen.registros_particion(nombre))
+        self.assertIsNotNone(registros[0])
+        self.assertTrue(all(r is registros[0] for r in registros))
+        self.assertIs(almacen.registros[nombre], registros[0])
+
+    def test_consultas_con_caches_vacios(self):
+        almacen = Almacen()
+        almacen.cargar()
+        esperado = (almacen.historial("10000001"), almacen.buscar_atenciones("control"),
+                    almacen.buscar_propietarios("perez"), almacen.buscar_por_nombre("mascotas", "t"),
+                    len(almacen.obtener("propietarios")))
+
+        for _ in range(5):
+            almacen = Almacen()
+            almacen.cargar()
+            resultados = en_paralelo(lambda: (almacen.historial("10000001"), almacen.buscar_atenciones("control"),
+                                              almacen.buscar_propietarios("perez"),
+                                              almacen.buscar_por_nombre("mascotas", "t"),
+                                              len(almacen.obtener("propietarios"))))
+            for resultado in resultados:
+                self.assertEqual(resultado, esperado)
+        self.assertTrue(gc.isenabled())
+
+
+class PruebaPausaRecolector(unittest.TestCase):
+
+    def test_pausas_de_varios_hilos(self):
+        self.assertTrue(gc.isenabled())
+        segunda_adentro = threading.Event()
+        primera_afuera = threading.Event()
+        estados = []
+
+        def segunda():
+            with PausaRecolector():
+                segunda_adentro.set()
+                primera_afuera.wait()
+                estados.append(gc.isenabled()) #La primera pausa terminó, pero esta sigue
+
+        hilo = threading.Thread(target=segunda)
+        with PausaRecolector():
+            hilo.start()
+            segunda_adentro.wait()
+        primera_afuera.set()
+        hilo.join()
+        self.assertEqual(estados, [False])
+        self.assertTrue(gc.isenabled())
+
+    def test_ciclos_anteriores_se_recolectan(self):
+        class Nodo:
+            pass
+
+        nodo = Nodo()
+        nodo.ciclo = nodo
+        referencia = weakref.ref(nodo)
+        del nodo
+        with PausaRecolector():
+            registros = [Nodo() for _ in range(1000)]
+        gc.collect()
+        self.assertIsNone(referencia())
+        self.assertEqual(len(registros), 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+Pruebas del diario de atenciones: lo registrado antes de un corte se recupera al cargar, una
+línea a medio escribir se descarta y volver a aplicar un diario ya compactado no duplica nada.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from veterinaria.almacenamiento import Almacen
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIARIO = "atenciones_diario.jsonl"
+
+#Registra atenciones y termina sin compactar ni cerrar nada, como un corte del programa
+REGISTRAR_Y_CORTAR = """
+import os, sys
+from veterinaria.almacenamiento import Almacen
+almacen = Almacen()
+almacen.cargar()
+for id_atencion in sys.argv[1:]:
+    almacen.agregar_atencion(id_atencion, {"mascota": "10000001", "propietario": "38111222", "motivo": "Control",
+                                           "diagnostico": "Sano", "tratamiento": "Ninguno",
+                                           "costo_veterinario": 1000.0, "costo_medicamentos": 0.0, "costo": 1000.0})
+os._exit(0)
+"""
+
+
+class PruebaDiario(unittest.TestCase):
+
+    def setUp(self):
+        carpeta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, carpeta, True)
+        for archivo in ("propietarios.json", "mascotas.json", "atenciones.json"):
+            shutil.copy(os.path.join(RAIZ, archivo), carpeta)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(carpeta)
+        Almacen().cargar() #Migra las atenciones a particiones
+        self.cantidad = self.cantidad_manifiesto()
+
+    def registrar_y_cortar(self, *ids):
+        subprocess.run([sys.executable, "-c", REGISTRAR_Y_CORTAR, *ids], check=True, capture_output=True,
+                       env=dict(os.environ, PYTHONPATH=RAIZ))
+
+    def cantidad_manifiesto(self):
+        almacen = Almacen()
+        almacen.cargar()
+        return sum(datos["cantidad"] for datos in almacen.obtener(Almacen.MANIFIESTO).values())
+
+    def test_atenciones_registradas_antes_del_corte(self):
+        ids = ["2025.03.01 10.00.00.000001-0001", "2025.03.01 10.00.00.000002-0002"]
+        self.registrar_y_cortar(*ids)
+        self.assertFalse(os.path.exists(os.path.join("atenciones", "2025.03.json"))) #Solo están en el diario
+
+        almacen = Almacen()
+        almacen.cargar()
+        historial = [id_atencion for id_atencion, _ in almacen.historial("10000001")]
+        self.assertEqual(historial[-2:], ids)
+        self.assertEqual(almacen.obtener("mascotas")["10000001"]["historial"][-2:], ids)
+        self.assertIn("atenciones/2025.03", almacen.particiones())
+        almacen.compactar()
+        self.assertEqual(os.path.getsize(DIARIO), 0)
+        self.assertEqual(self.cantidad_manifiesto(), self.cantidad + 2)
+
+    def test_linea_incompleta_se_descarta(self):
+        self.registrar_y_cortar("2025.03.01 10.00.00.000001-0001")
+        tamanio = os.path.getsize(DIARIO)
+        with open(DIARIO, mode="ab") as f:
+            f.write(b'{"tipo": "atencion", "id": "2025.03.01 10.00.00.000002-00')
+
+        almacen = Almacen()
+        almacen.cargar()
+        self.assertEqual(os.path.getsize(DIARIO), tamanio)
+        self.assertTrue(almacen.existe_atencion("2025.03.01 10.00.00.000001-0001"))
+        self.assertFalse(almacen.existe_atencion("2025.03.01 10.00.00.000002-0002"))
+
+        self.registrar_y_cortar("2025.03.01 10.00.00.000003-0003") #La entrada nueva no queda pegada a la cortada
+        with open(DIARIO, encoding="utf-8") as f:
+            self.assertEqual([json.loads(linea)["id"] for linea in f],
+                             ["2025.03.01 10.00.00.000001-0001", "2025.03.01 10.00.00.000003-0003"])
+
+    def test_diario_ya_compactado_no_duplica(self):
+        self.registrar_y_cortar("2025.03.01 10.00.00.000001-0001")
+        with open(DIARIO, mode="rb") as f:
+            diario = f.read()
+        almacen = Almacen()
+        almacen.cargar()
+        almacen.compactar()
+        #Corte entre el guardado de las particiones y el vaciado del diario
+        with open(DIARIO, mode="wb") as f:
+            f.write(diario)
+
+        almacen = Almacen()
+        almacen.cargar()
+        historial = almacen.obtener("mascotas")["10000001"]["historial"]
+        self.assertEqual(historial.count("2025.03.01 10.00.00.000001-0001"), 1)
+        self.assertEqual(len(almacen.historial("10000001")), len(historial))
+        almacen.compactar()
+        self.assertEqual(self.cantidad_manifiesto(), self.cantidad + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
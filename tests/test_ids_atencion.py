@@ -0,0 +1,146 @@
+"""
+Pruebas de los IDs de atenciones: validación de su formato y de su fecha, y migración de los IDs
+del formato anterior.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from veterinaria.almacenamiento import Almacen, cargar_json
+from veterinaria.validacion import (completar_id_atencion, generador_ids, validar_id_atencion,
+                                    validar_id_atencion_anterior)
+
+
+class PruebaValidarIds(unittest.TestCase):
+
+    def test_ids_validos(self):
+        self.assertTrue(validar_id_atencion("2024.02.29 23.59.59.000001-0a1f"))
+        self.assertTrue(validar_id_atencion(generador_ids.nuevo()))
+        self.assertTrue(validar_id_atencion_anterior("2024.01.31 08.30.00"))
+
+    def test_fechas_inexistentes(self):
+        for id_atencion in ("2024.99.99 99.99.99", "2023.02.29 10.00.00", "2024.01.01 24.00.00", "2024.00.10 10.00.00"):
+            with self.subTest(id_atencion=id_atencion):
+                self.assertFalse(validar_id_atencion_anterior(id_atencion))
+                self.assertFalse(validar_id_atencion(id_atencion + ".000000-0000"))
+
+    def test_texto_sobrante(self):
+        for id_atencion in ("2024.01.31 08.30.00\n", " 2024.01.31 08.30.00", "2024.01.31 08.30.00x"):
+            with self.subTest(id_atencion=id_atencion):
+                self.assertFalse(validar_id_atencion_anterior(id_atencion))
+        for id_atencion in ("2024.01.31 08.30.00.000000-0000\n", "2024.01.31 08.30.00.000000-00000",
+                            "2024.01.31 08.30.00.000000-ABCD"):
+            with self.subTest(id_atencion=id_atencion):
+                self.assertFalse(validar_id_atencion(id_atencion))
+
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORTAR = """
+import json, sys
+import veterinaria
+from veterinaria.importacion import importar_archivo
+veterinaria.almacen.cargar()
+importados, rechazados = importar_archivo(sys.argv[1], "atenciones")
+print(json.dumps([importados, [motivo for _, motivo, _ in rechazados], veterinaria.almacen.particiones()]))
+"""
+
+
+class PruebaImportarIds(unittest.TestCase):
+
+    def test_importacion_rechaza_ids_invalidos(self):
+        carpeta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, carpeta, True)
+        for archivo in ("propietarios.json", "mascotas.json", "atenciones.json"):
+            shutil.copy(os.path.join(RAIZ, archivo), carpeta)
+        base = {"mascota": "10000002", "motivo": "Control", "diagnostico": "", "tratamiento": "",
+                "costo_veterinario": 100, "costo_medicamentos": 0}
+        with open(os.path.join(carpeta, "atenciones.jsonl"), "w", encoding="utf-8") as f:
+            for id_atencion in ("2024.99.99 99.99.99", "2024.13.05 10.00.00", "2024.02.30 10.00.00.000000-0000",
+                                "2024.01.05 10.00.00"):
+                f.write(json.dumps(dict(base, id=id_atencion)) + "\n")
+        proceso = subprocess.run([sys.executable, "-c", IMPORTAR, "atenciones.jsonl"], cwd=carpeta, check=True,
+                                 capture_output=True, text=True, env=dict(os.environ, PYTHONPATH=RAIZ))
+        importados, motivos, particiones = json.loads(proceso.stdout.splitlines()[-1])
+        self.assertEqual(importados, 1)
+        self.assertEqual(len(motivos), 3)
+        self.assertNotIn("atenciones/2024.99", particiones)
+        self.assertNotIn("atenciones/2024.13", particiones)
+        self.assertNotIn("atenciones/2024.02", particiones)
+        self.assertFalse(os.path.exists(os.path.join(carpeta, "atenciones", "2024.99.json")))
+
+
+class PruebaMigrarIds(unittest.TestCase):
+
+    def setUp(self):
+        carpeta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, carpeta, True)
+        for archivo in ("propietarios.json", "mascotas.json", "atenciones.json"):
+            shutil.copy(os.path.join(RAIZ, archivo), carpeta)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(carpeta)
+        self.anteriores = cargar_json("atenciones.json")
+        #Particiones con los IDs anteriores y una atención nueva del mismo segundo que una anterior
+        with mock.patch.object(Almacen, "migrar_ids_atenciones"):
+            almacen = Almacen()
+            almacen.cargar()
+            self.nuevo = min(self.anteriores) + ".000000-00ff"
+            almacen.agregar_atencion(self.nuevo, dict(self.anteriores[min(self.anteriores)], motivo="Nueva"))
+            almacen.compactar()
+
+    def verificar_migracion(self):
+        almacen = Almacen()
+        almacen.cargar()
+        esperados = sorted([completar_id_atencion(id_atencion) for id_atencion in self.anteriores] + [self.nuevo])
+        ids = []
+        for nombre in almacen.particiones():
+            particion = list(cargar_json(almacen.archivo(nombre)))
+            self.assertEqual(particion, sorted(particion))
+            self.assertEqual(almacen.obtener(Almacen.MANIFIESTO)[nombre.split("/", 1)[1]]["cantidad"], len(particion))
+            ids += particion
+        self.assertEqual(ids, esperados)
+        self.assertTrue(all(validar_id_atencion(id_atencion) for id_atencion in ids))
+        historiales = [id_atencion for datos in cargar_json("mascotas.json").values() for id_atencion in datos["historial"]]
+        self.assertEqual(sorted(historiales), esperados)
+        self.assertEqual([id_atencion for id_atencion, _ in almacen.atenciones_entre()], esperados)
+        for id_atencion, datos in self.anteriores.items():
+            self.assertEqual(almacen.obtener(almacen.particion(id_atencion))[completar_id_atencion(id_atencion)]["motivo"],
+                             datos["motivo"])
+
+    def test_migracion_por_tandas(self):
+        almacen = Almacen()
+        with mock.patch.object(Almacen, "migrar_ids_atenciones"):
+            almacen.cargar()
+        self.assertEqual(sum(map(validar_id_atencion_anterior, almacen.indice.fechas)), len(self.anteriores))
+        almacen.migrar_ids_atenciones(tamanio_tanda=2)
+        self.verificar_migracion()
+
+    def test_migracion_cortada_se_completa_al_cargar(self):
+        guardar = Almacen.guardar
+        guardados = []
+
+        def guardar_y_cortar(almacen):
+            if guardados:
+                return False #Corte después de la primera tanda
+            guardados.append(True)
+            return guardar(almacen)
+
+        almacen = Almacen()
+        with mock.patch.object(Almacen, "migrar_ids_atenciones"):
+            almacen.cargar()
+        with mock.patch.object(Almacen, "guardar", guardar_y_cortar):
+            almacen.migrar_ids_atenciones(tamanio_tanda=2)
+        migrados = [id_atencion for datos in cargar_json("mascotas.json").values() for id_atencion in datos["historial"]
+                    if id_atencion in map(completar_id_atencion, self.anteriores)]
+        self.assertTrue(0 < len(migrados) < len(self.anteriores))
+        self.verificar_migracion() #Cargar convierte el resto
+
+
+if __name__ == "__main__":
+    unittest.main()
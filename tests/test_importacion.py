@@ -0,0 +1,140 @@
+"""
+Pruebas de la importación de datos: los registros inválidos se rechazan con su línea y motivo
+(y quedan en '<archivo>.rechazados.jsonl'), y las atenciones del formato anterior con el mismo
+segundo se numeran en el orden del archivo.
+"""
+
+import csv
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from veterinaria.almacenamiento import Almacen
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+#Importa desde el menú, como un usuario que escribe el nombre del archivo
+IMPORTAR = """
+import sys
+import veterinaria
+from veterinaria import menu
+veterinaria.almacen.cargar()
+menu.importar_datos(sys.argv[1])
+"""
+
+
+def atencion(id_atencion, motivo, mascota="10000001", **campos):
+    return dict({"id": id_atencion, "mascota": mascota, "motivo": motivo, "diagnostico": "Sano",
+                 "tratamiento": "Ninguno", "costo_veterinario": 1000, "costo_medicamentos": 0}, **campos)
+
+
+class PruebaImportacion(unittest.TestCase):
+
+    def setUp(self):
+        self.carpeta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.carpeta, True)
+        for archivo in ("propietarios.json", "mascotas.json", "atenciones.json"):
+            shutil.copy(os.path.join(RAIZ, archivo), self.carpeta)
+
+    def importar(self, tipo, nombre_archivo):
+        """
+        Retorno:
+            Lo que el menú mostró y los registros del informe de rechazados ([] si no se escribió).
+        """
+        proceso = subprocess.run([sys.executable, "-c", IMPORTAR, tipo], cwd=self.carpeta, check=True,
+                                 input=nombre_archivo + "\n", capture_output=True, text=True,
+                                 env=dict(os.environ, PYTHONPATH=RAIZ))
+        informe = os.path.join(self.carpeta, nombre_archivo + ".rechazados.jsonl")
+        if not os.path.exists(informe):
+            return proceso.stdout, []
+        with open(informe, encoding="utf-8") as f:
+            return proceso.stdout, [json.loads(linea) for linea in f]
+
+    def almacen(self):
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.carpeta)
+        almacen = Almacen()
+        almacen.cargar()
+        return almacen
+
+    def test_atenciones_rechazadas(self):
+        lineas = [json.dumps(atencion("2024.03.01 10.00.00.000001-0001", "Válida")),
+                  "{no es json",
+                  json.dumps(atencion("2024.03.01 11.00.00", "Mascota inexistente", mascota="99999999")),
+                  json.dumps(atencion("2024.03.01 12.00.00", "Otro propietario", propietario="40233455")),
+                  json.dumps(atencion("2024.03.01 13.00.00", "")),
+                  json.dumps(atencion("2024.03.01 14.00.00", "Costo", costo_veterinario="mucho")),
+                  json.dumps(atencion("2024.03.01 10.00.00.000001-0001", "Repetida")),
+                  json.dumps(atencion("2023.05.10 10.30.00", "Ya registrada")),
+                  "[1, 2]"]
+        with open(os.path.join(self.carpeta, "atenciones.jsonl"), "w", encoding="utf-8") as f:
+            f.write("\n".join(lineas) + "\n")
+
+        salida, rechazados = self.importar("atenciones", "atenciones.jsonl")
+        self.assertIn("Se importaron 1 atenciones.", salida)
+        self.assertIn("Se rechazaron 8 registros", salida)
+        self.assertEqual([r["linea"] for r in rechazados], [2, 3, 4, 5, 6, 7, 8, 9])
+        self.assertIsNone(rechazados[0]["registro"])
+        self.assertEqual(rechazados[1]["registro"]["motivo"], "Mascota inexistente")
+        self.assertIn("propietario no coincide", rechazados[2]["motivo"])
+        self.assertIn("Ya hay una atención", rechazados[5]["motivo"])
+        self.assertIn("Ya hay una atención", rechazados[6]["motivo"])
+        for rechazado in rechazados:
+            self.assertTrue(rechazado["motivo"])
+
+        almacen = self.almacen()
+        self.assertEqual([datos["motivo"] for _, datos in almacen.atenciones_entre("2024.03", "2024.03")], ["Válida"])
+
+    def test_sin_rechazados_no_hay_informe(self):
+        with open(os.path.join(self.carpeta, "atenciones.jsonl"), "w", encoding="utf-8") as f:
+            f.write(json.dumps(atencion("2024.03.01 10.00.00", "Control")) + "\n")
+        salida, rechazados = self.importar("atenciones", "atenciones.jsonl")
+        self.assertIn("Se importaron 1 atenciones.", salida)
+        self.assertEqual(rechazados, [])
+        self.assertFalse(os.path.exists(os.path.join(self.carpeta, "atenciones.jsonl.rechazados.jsonl")))
+
+    def test_ids_anteriores_del_mismo_segundo(self):
+        with open(os.path.join(self.carpeta, "atenciones.csv"), "w", newline="", encoding="utf-8") as f:
+            escritor = csv.DictWriter(f, fieldnames=list(atencion("", "")))
+            escritor.writeheader()
+            for motivo in ("Primera", "Segunda", "Tercera"):
+                escritor.writerow(atencion("2024.04.02 09.30.00", motivo))
+            escritor.writerow(atencion("2024.04.02 09.30.01", "Otro segundo"))
+            escritor.writerow(atencion(" 2024.04.02 09.30.00 ", "Cuarta", mascota="10000002"))
+
+        salida, rechazados = self.importar("atenciones", "atenciones.csv")
+        self.assertIn("Se importaron 5 atenciones.", salida)
+        self.assertEqual(rechazados, [])
+        almacen = self.almacen()
+        self.assertEqual([(id_atencion, datos["motivo"]) for id_atencion, datos in almacen.atenciones_entre("2024.04", "2024.04")],
+                         [("2024.04.02 09.30.00.000000-0000", "Primera"),
+                          ("2024.04.02 09.30.00.000001-0000", "Segunda"),
+                          ("2024.04.02 09.30.00.000002-0000", "Tercera"),
+                          ("2024.04.02 09.30.00.000003-0000", "Cuarta"),
+                          ("2024.04.02 09.30.01.000000-0000", "Otro segundo")])
+        self.assertEqual(almacen.obtener("mascotas")["10000002"]["historial"][-1], "2024.04.02 09.30.00.000003-0000")
+
+    def test_propietarios_rechazados(self):
+        with open(os.path.join(self.carpeta, "propietarios.csv"), "w", newline="", encoding="utf-8") as f:
+            escritor = csv.writer(f)
+            escritor.writerow(["dni", "nombre", "direccion", "email", "telefono_principal", "telefono_emergencia"])
+            escritor.writerow([" 30111222 ", "Ana Gómez", "Calle 1", "ana@email.com", "1122334455", "1122334466"])
+            escritor.writerow(["30111333", "Luis Díaz", "Calle 2", "sin-arroba", "1122334455", "1122334466"])
+            escritor.writerow(["38111222", "Repetido", "Calle 3", "rep@email.com", "1122334455", "1122334466"])
+
+        salida, rechazados = self.importar("propietarios", "propietarios.csv")
+        self.assertIn("Se importaron 1 propietarios.", salida)
+        self.assertEqual([r["linea"] for r in rechazados], [3, 4])
+        self.assertEqual(rechazados[0]["registro"]["email"], "sin-arroba")
+        propietarios = self.almacen().obtener("propietarios")
+        self.assertEqual(propietarios["30111222"]["nombre"], "Ana Gómez")
+        self.assertNotIn("30111333", propietarios)
+        self.assertNotEqual(propietarios["38111222"]["nombre"], "Repetido")
+
+
+if __name__ == "__main__":
+    unittest.main()
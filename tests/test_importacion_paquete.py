@@ -0,0 +1,65 @@
+"""
+Pruebas del presupuesto de importación: 'import veterinaria' es rápido, no carga los módulos
+opcionales pesados y no crea archivos.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from benchmark import MODULOS_DIFERIDOS, PRESUPUESTO_IMPORTACION_MS
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPETICIONES = 5
+
+IMPORTAR = f"""
+import sys
+import veterinaria
+print(",".join(m for m in {MODULOS_DIFERIDOS!r} if m in sys.modules))
+"""
+
+
+def importar(carpeta):
+    """
+    Importa el paquete en un proceso nuevo con -X importtime.
+
+    Retorno:
+        Una tupla (milisegundos de 'import veterinaria', módulos diferidos que quedaron cargados).
+    """
+    proceso = subprocess.run([sys.executable, "-X", "importtime", "-c", IMPORTAR], cwd=carpeta, check=True,
+                             capture_output=True, text=True, env=dict(os.environ, PYTHONPATH=RAIZ))
+    for linea in proceso.stderr.splitlines():
+        #Formato: 'import time: propio | acumulado | módulo', en microsegundos
+        columnas = [columna.strip() for columna in linea.split("|")]
+        if len(columnas) == 3 and columnas[2] == "veterinaria":
+            return int(columnas[1]) / 1000, [m for m in proceso.stdout.strip().split(",") if m]
+    raise AssertionError(f"No se encontró 'veterinaria' en la salida de -X importtime:\n{proceso.stderr}")
+
+
+class PruebaImportacionPaquete(unittest.TestCase):
+
+    def setUp(self):
+        self.carpeta = tempfile.TemporaryDirectory()
+        self.addCleanup(self.carpeta.cleanup)
+        #Compila los .pyc antes de medir, como quedan después de la primera ejecución
+        importar(self.carpeta.name)
+
+    def test_tiempo_de_importacion(self):
+        #Se toma el menor tiempo, el menos afectado por otras tareas de la máquina
+        milisegundos = min(importar(self.carpeta.name)[0] for _ in range(REPETICIONES))
+        self.assertLessEqual(milisegundos, PRESUPUESTO_IMPORTACION_MS)
+
+    def test_no_carga_modulos_pesados(self):
+        cargados = importar(self.carpeta.name)[1]
+        for modulo in ("sqlite3", "numpy", "concurrent.futures"):
+            self.assertNotIn(modulo, cargados)
+        self.assertEqual(cargados, [])
+
+    def test_no_crea_archivos(self):
+        self.assertEqual(os.listdir(self.carpeta.name), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
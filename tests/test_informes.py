@@ -0,0 +1,53 @@
+"""
+Pruebas de la validación de las especificaciones de informes por lotes.
+"""
+
+import os
+import unittest
+
+import informes
+
+
+class PruebaValidarEspecificacion(unittest.TestCase):
+
+    def test_especificaciones_validas(self):
+        for especificacion in ({"informe": "atenciones_mes", "mes": "2023.01"},
+                               {"informe": "resumen_cantidades", "anio": "2023", "propietario": "12345678"},
+                               {"informe": "resumen_pesos", "anio": "2023", "salida": "pesos.txt"}):
+            with self.subTest(especificacion=especificacion):
+                informes.validar_especificacion(especificacion)
+
+    def test_valores_que_no_son_textos(self):
+        for especificacion in ({"informe": "resumen_cantidades", "anio": 2023},
+                               {"informe": "atenciones_mes", "mes": 2023.01},
+                               {"informe": "resumen_pesos", "anio": "2023", "propietario": 12345678},
+                               {"informe": "resumen_pesos", "anio": "2023", "salida": 5}):
+            with self.subTest(especificacion=especificacion):
+                with self.assertRaises(ValueError):
+                    informes.validar_especificacion(especificacion)
+
+    def test_formatos_invalidos(self):
+        for especificacion in ({"informe": "atenciones_mes", "mes": "2023.01\n"},
+                               {"informe": "atenciones_mes", "mes": "2023.13"},
+                               {"informe": "resumen_cantidades", "anio": "2023\n"},
+                               {"informe": "resumen_cantidades", "anio": "2023", "propietario": "../x"},
+                               {"informe": "otro", "anio": "2023"}):
+            with self.subTest(especificacion=especificacion):
+                with self.assertRaises(ValueError):
+                    informes.validar_especificacion(especificacion)
+
+    def test_salida_fuera_de_la_carpeta(self):
+        for salida in ("../../x", "/tmp/x", os.path.join("sub", "x.txt"), "..", ""):
+            with self.subTest(salida=salida):
+                with self.assertRaises(ValueError):
+                    informes.validar_especificacion({"informe": "resumen_pesos", "anio": "2023", "salida": salida})
+
+    def test_nombre_de_salida(self):
+        self.assertEqual(informes.nombre_salida({"informe": "resumen_pesos", "anio": "2023", "propietario": "12345678"}),
+                         "resumen_pesos_2023_12345678.txt")
+        self.assertEqual(informes.nombre_salida({"informe": "atenciones_mes", "mes": "2023.01", "salida": "enero.txt"}),
+                         "enero.txt")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+"""
+Pruebas de iterar_json: el resultado no depende del tamaño de bloque con que se lee el archivo.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+from veterinaria.almacenamiento import iterar_json
+
+
+class PruebaIterarJson(unittest.TestCase):
+
+    def setUp(self):
+        self.carpeta = tempfile.TemporaryDirectory()
+        self.addCleanup(self.carpeta.cleanup)
+
+    def recorrer(self, texto, tamanio_bloque):
+        nombre_archivo = os.path.join(self.carpeta.name, "datos.json")
+        with open(nombre_archivo, mode="w", encoding="utf-8") as f:
+            f.write(texto)
+        return list(iterar_json(nombre_archivo, tamanio_bloque))
+
+    def test_numeros_cortados_por_el_bloque(self):
+        textos = [
+            '{"a": 1.5}',
+            '{"a": 2e3, "b": -1.25E-2}',
+            '{"a": 10, "b": 3.75 , "c": 1e+2}',
+            '{"a": {"x": 1.5}, "b": [2.5, 3e1], "c": 12345.678}',
+        ]
+        for texto in textos:
+            esperado = list(json.loads(texto).items())
+            for tamanio_bloque in (1, 2, 3, 4, 5, 7, 65536):
+                with self.subTest(texto=texto, tamanio_bloque=tamanio_bloque):
+                    self.assertEqual(self.recorrer(texto, tamanio_bloque), esperado)
+
+    def test_textos_y_literales(self):
+        texto = '{"nombre": "María \\"Mary\\"", "activo": true, "nada": null, "vacio": {}}'
+        esperado = list(json.loads(texto).items())
+        for tamanio_bloque in (1, 2, 3, 8, 65536):
+            with self.subTest(tamanio_bloque=tamanio_bloque):
+                self.assertEqual(self.recorrer(texto, tamanio_bloque), esperado)
+
+    def test_objeto_vacio(self):
+        for tamanio_bloque in (1, 65536):
+            self.assertEqual(self.recorrer("  {  }\n", tamanio_bloque), [])
+
+    def test_archivo_invalido(self):
+        for texto in ('{"a": 1.5', '{"a": 1 2}', '{"a": 1.5,}', "[1, 2]"):
+            for tamanio_bloque in (1, 2, 65536):
+                with self.subTest(texto=texto, tamanio_bloque=tamanio_bloque):
+                    with self.assertRaises(json.JSONDecodeError):
+                        self.recorrer(texto, tamanio_bloque)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+Pruebas de los guardados por lotes: un lote registrado en 'lote_pendiente.json' que no llegó a
+aplicarse se completa al cargar, y uno que falla antes de registrarse deja los originales intactos.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from veterinaria import almacenamiento
+from veterinaria.almacenamiento import Almacen, escribir_temporal, guardar_json, guardar_lote, recuperar_lote
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOTE = "lote_pendiente.json"
+
+
+def leer(nombre_archivo):
+    with open(nombre_archivo, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class PruebaLote(unittest.TestCase):
+
+    def setUp(self):
+        carpeta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, carpeta, True)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(carpeta)
+        for nombre_archivo in ("a.json", "b.json", "c.json"):
+            guardar_json(nombre_archivo, {"version": 1})
+
+    def test_lote_completo(self):
+        self.assertTrue(guardar_lote({nombre_archivo: {"version": 2} for nombre_archivo in ("a.json", "b.json", "c.json")}))
+        for nombre_archivo in ("a.json", "b.json", "c.json"):
+            self.assertEqual(leer(nombre_archivo), {"version": 2})
+        self.assertEqual(sorted(os.listdir()), ["a.json", "b.json", "c.json"])
+
+    def test_corte_despues_de_registrar_el_lote(self):
+        temporales = {nombre_archivo: escribir_temporal(nombre_archivo, {"version": 2})
+                      for nombre_archivo in ("a.json", "b.json", "c.json")}
+        guardar_json(LOTE, temporales)
+        os.replace(temporales["a.json"], "a.json") #El corte llega después del primer reemplazo
+
+        recuperar_lote()
+        for nombre_archivo in ("a.json", "b.json", "c.json"):
+            self.assertEqual(leer(nombre_archivo), {"version": 2})
+        self.assertEqual(sorted(os.listdir()), ["a.json", "b.json", "c.json"])
+        recuperar_lote() #Sin lote pendiente no hace nada
+        self.assertEqual(sorted(os.listdir()), ["a.json", "b.json", "c.json"])
+
+    def test_corte_antes_de_registrar_el_lote(self):
+        escritos = []
+
+        def escribir_y_cortar(nombre_archivo, datos, posiciones=None):
+            if escritos:
+                raise OSError("Disco lleno")
+            escritos.append(nombre_archivo)
+            return escribir_temporal(nombre_archivo, datos, posiciones)
+
+        with mock.patch.object(almacenamiento, "escribir_temporal", escribir_y_cortar):
+            self.assertFalse(guardar_lote({nombre_archivo: {"version": 2} for nombre_archivo in ("a.json", "b.json")}))
+        for nombre_archivo in ("a.json", "b.json"):
+            self.assertEqual(leer(nombre_archivo), {"version": 1})
+        self.assertEqual(sorted(os.listdir()), ["a.json", "b.json", "c.json"]) #Sin temporales ni lote
+
+
+class PruebaRecuperarLoteAlmacen(unittest.TestCase):
+
+    def setUp(self):
+        carpeta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, carpeta, True)
+        for archivo in ("propietarios.json", "mascotas.json", "atenciones.json"):
+            shutil.copy(os.path.join(RAIZ, archivo), carpeta)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(carpeta)
+        Almacen().cargar() #Migra las atenciones a particiones
+
+    def test_cargar_completa_el_lote_pendiente(self):
+        propietarios = leer("propietarios.json")
+        mascotas = leer("mascotas.json")
+        dni = next(iter(propietarios))
+        id_masc = next(iter(mascotas))
+        propietarios[dni]["direccion"] = "Calle Nueva 123"
+        mascotas[id_masc]["peso"] = 31.5
+        temporales = {"mascotas.json": escribir_temporal("mascotas.json", mascotas),
+                      "propietarios.json": escribir_temporal("propietarios.json", propietarios)}
+        guardar_json(LOTE, temporales)
+        os.replace(temporales["mascotas.json"], "mascotas.json")
+
+        almacen = Almacen()
+        almacen.cargar()
+        self.assertFalse(os.path.exists(LOTE))
+        self.assertFalse(os.path.exists("propietarios.json.tmp"))
+        self.assertEqual(almacen.obtener("propietarios")[dni]["direccion"], "Calle Nueva 123")
+        self.assertEqual(almacen.obtener("mascotas")[id_masc]["peso"], 31.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
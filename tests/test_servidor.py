@@ -0,0 +1,121 @@
+"""
+Pruebas del servidor HTTP con otro proceso escribiendo en la misma carpeta de datos, y de las
+respuestas a errores internos.
+"""
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+import urllib.request
+from http.server import ThreadingHTTPServer
+from unittest import mock
+
+import servidor
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ESCRITOR = """
+import veterinaria
+veterinaria.almacen.cargar()
+veterinaria.crear_propietario("11112222", "Ana Sosa", "Calle 10", "ana.sosa@email.com", "1133334444", "1155556666")
+veterinaria.crear_atencion("10000002", "Control anual", "Sano", "Ninguno", 1500, 0)
+"""
+
+
+def puerto_libre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class PruebaServidorConOtroProceso(unittest.TestCase):
+
+    def iniciar(self, almacen):
+        carpeta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, carpeta, True)
+        for archivo in ("propietarios.json", "mascotas.json", "atenciones.json"):
+            shutil.copy(os.path.join(RAIZ, archivo), carpeta)
+        self.entorno = dict(os.environ, PYTHONPATH=RAIZ, VETERINARIA_ALMACEN=almacen)
+        self.carpeta = carpeta
+        self.puerto = puerto_libre()
+        servidor = subprocess.Popen([sys.executable, os.path.join(RAIZ, "servidor.py"), "--puerto", str(self.puerto)],
+                                    cwd=carpeta, env=self.entorno, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self.addCleanup(servidor.wait)
+        self.addCleanup(servidor.terminate)
+        for _ in range(100):
+            try:
+                self.pedir("/propietarios")
+                return
+            except OSError:
+                time.sleep(0.1)
+        self.fail("El servidor no respondió.")
+
+    def pedir(self, ruta):
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{self.puerto}{ruta}", timeout=10) as respuesta:
+                return respuesta.status, json.loads(respuesta.read())
+        except urllib.error.HTTPError as error:
+            return error.code, json.loads(error.read())
+
+    def escribir_desde_otro_proceso(self):
+        subprocess.run([sys.executable, "-c", ESCRITOR], cwd=self.carpeta, env=self.entorno, check=True,
+                       stdout=subprocess.DEVNULL)
+
+    def verificar_lecturas(self, almacen):
+        self.iniciar(almacen)
+        #Se consultan antes, así el servidor ya tiene en memoria lo que después cambia
+        self.assertEqual(self.pedir("/propietarios/11112222")[0], 404)
+        historial = self.pedir("/mascotas/10000002/historial")[1]
+        self.assertEqual(self.pedir("/propietarios/sugerir?texto=ana")[1], [])
+
+        self.escribir_desde_otro_proceso()
+
+        codigo, propietario = self.pedir("/propietarios/11112222")
+        self.assertEqual(codigo, 200)
+        self.assertEqual(propietario["nombre"], "Ana Sosa")
+        nuevo_historial = self.pedir("/mascotas/10000002/historial")[1]
+        self.assertEqual(len(nuevo_historial), len(historial) + 1)
+        self.assertEqual(nuevo_historial[-1]["motivo"], "Control anual")
+        self.assertEqual([p["id"] for p in self.pedir("/propietarios/sugerir?texto=ana")[1]], ["11112222"])
+        self.assertIn("11112222", [p["id"] for p in self.pedir("/propietarios/buscar?texto=sosa")[1]])
+
+    def test_lecturas_ven_cambios_de_otro_proceso_json(self):
+        self.verificar_lecturas("json")
+
+    def test_lecturas_ven_cambios_de_otro_proceso_sqlite(self):
+        self.verificar_lecturas("sqlite")
+
+
+class PruebaErrorInterno(unittest.TestCase):
+
+    def test_no_muestra_el_detalle_al_cliente(self):
+        http = ThreadingHTTPServer(("127.0.0.1", 0), servidor.ManejadorVeterinaria)
+        self.addCleanup(http.server_close)
+        hilo = threading.Thread(target=http.serve_forever)
+        hilo.start()
+        self.addCleanup(hilo.join)
+        self.addCleanup(http.shutdown)
+
+        consola = io.StringIO()
+        error = OSError("[Errno 13] Permission denied: '/datos/privados/propietarios.json'")
+        with mock.patch.object(servidor, "resolver", side_effect=error), contextlib.redirect_stderr(consola):
+            with self.assertRaises(urllib.error.HTTPError) as respuesta:
+                urllib.request.urlopen(f"http://127.0.0.1:{http.server_address[1]}/propietarios", timeout=10)
+        self.assertEqual(respuesta.exception.code, 500)
+        self.assertEqual(json.loads(respuesta.exception.read()), {"error": "Error interno"})
+        respuesta.exception.close()
+        self.assertIn("GET /propietarios", consola.getvalue())
+        self.assertIn("/datos/privados/propietarios.json", consola.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+"""
+----------------------------------------------------------------------------------------------
+Título: Sistema de Gestión Veterinaria
+Fecha: 31/05/2025
+Autor: Grupo 6
+
+Descripción:
+Sistema de gestión para ingresar, modificar, eliminar y listar propietarios y mascotas,
+asociar atenciones, calcular estadísticas mensuales/anuales, y generar informes.
+
+Módulos:
+    almacenamiento: almacenes JSON y SQLite, índices y bloqueo entre procesos.
+    entidades: registros de propietarios, mascotas y atenciones y su conversión a JSON.
+    busqueda: índices para buscar atenciones y propietarios por palabras, y propietarios y mascotas
+              por nombre, email o teléfono.
+    validacion: formato de los IDs de atenciones y validaciones de los datos ingresados.
+    servicios: altas, modificaciones, bajas y consultas (sin input() ni print()).
+    informes: resúmenes anuales, atenciones agrupadas y líneas de los informes.
+    importacion: importación desde archivos CSV o JSON Lines.
+    menu: menú interactivo de consola (se ejecuta con 'python -m veterinaria').
+
+Importar el paquete no lee archivos ni muestra el menú: los datos se leen con almacen.cargar().
+----------------------------------------------------------------------------------------------
+"""
+
+#----------------------------------------------------------------------------------------------
+# MÓDULOS
+#----------------------------------------------------------------------------------------------
+from .almacenamiento import Almacen, AlmacenSQLite, almacen, crear_almacen
+from .entidades import Atencion, Mascota, Propietario, Telefonos, a_json
+from .validacion import (ID_ATENCION, ID_ATENCION_ANTERIOR, completar_id_atencion, generador_ids,
+                         validar_id_atencion, validar_id_atencion_anterior)
+from .servicios import (actualizar_mascota, actualizar_propietario, buscar_atenciones, buscar_mascota_activa,
+                        buscar_propietario_activo, buscar_propietarios, consultar_atenciones, crear_atencion,
+                        crear_mascota, crear_propietario, desactivar_mascota, desactivar_propietario,
+                        historial_atenciones, mascotas_activas, preparar_atencion, propietarios_activos,
+                        sugerir_mascotas, sugerir_propietarios)
+from .informes import agrupar_atenciones, lineas_atenciones_mes, lineas_resumen_anual, resumen_anual
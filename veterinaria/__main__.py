@@ -0,0 +1,8 @@
+"""
+Punto de entrada del programa: python -m veterinaria
+"""
+
+from .menu import main
+
+if __name__ == "__main__":
+    main()
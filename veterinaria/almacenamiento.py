@@ -0,0 +1,2963 @@
+"""
+----------------------------------------------------------------------------------------------
+Título: Sistema de Gestión Veterinaria - Almacenamiento
+Fecha: 31/05/2025
+Autor: Grupo 6
+
+Descripción:
+Almacenes de datos (archivos JSON con diario y particiones mensuales, o base SQLite), con sus
+índices, instantáneas, archivos de registros y bloqueo entre procesos.
+----------------------------------------------------------------------------------------------
+"""
+
+#----------------------------------------------------------------------------------------------
+# MÓDULOS
+#----------------------------------------------------------------------------------------------
+#sqlite3, NumPy y concurrent.futures se importan recién cuando se usan (ver cargar_numpy), así
+#importar el paquete es rápido y no carga módulos que la mayoría de las operaciones no necesita
+import json
+import re
+import os
+import bisect
+import functools
+import gc
+import heapq
+import mmap
+import operator
+import pickle
+import struct
+import sys
+import threading
+from array import array
+from collections.abc import MutableMapping
+
+try:
+    import fcntl #Bloqueo de archivos entre procesos; no existe en Windows
+except ImportError:
+    fcntl = None
+
+from .busqueda import (CAMPOS_ATENCION, CAMPOS_CONTACTO, CAMPOS_PROPIETARIO, IndiceRegistros, IndiceTextos,
+                       indexar_atenciones, peso, terminos, textos_atencion)
+from .entidades import Atencion, Mascota, Propietario, Telefonos, a_json
+from .validacion import ID_ATENCION_ANTERIOR, completar_id_atencion
+
+#----------------------------------------------------------------------------------------------
+# FUNCIONES
+#----------------------------------------------------------------------------------------------
+def cargar_json(nombre_archivo):
+    """
+    Carga datos desde un archivo JSON.
+
+    Parametros:
+        nombre_archivo: La ruta y el nombre del archivo JSON a cargar.
+
+    Retorno:
+        Un diccionario con los datos del archivo, o un diccionario vacío si el archivo no existe.
+        Si el archivo existe pero está dañado se informa el error y se lanza json.JSONDecodeError,
+        para no reemplazar los datos guardados por un diccionario vacío en el próximo guardado.
+    """
+    try:
+        f = open(nombre_archivo, mode="r", encoding="utf-8")
+        datos = json.load(f)
+        f.close()
+        return datos
+    except FileNotFoundError as error:
+        print("Error al cargar JSON:", error)
+        return {}
+    except json.JSONDecodeError as error:
+        print(f"Error al cargar JSON: el archivo '{nombre_archivo}' está dañado ({error}).")
+        raise
+
+def iterar_json(nombre_archivo, tamanio_bloque=65536):
+    """
+    Recorre un archivo JSON cuyo contenido es un objeto, devolviendo sus pares clave-valor a
+    medida que se leen, sin cargar el archivo completo en memoria. El archivo se lee de a
+    bloques y cada par se decodifica con json apenas está completo en el bloque leído.
+
+    Parametros:
+        nombre_archivo: La ruta y el nombre del archivo JSON a recorrer.
+        tamanio_bloque: Cantidad de caracteres que se leen por vez.
+
+    Retorno:
+        Un generador de pares (clave, valor) en el orden del archivo. Lanza json.JSONDecodeError
+        si el archivo no es un objeto JSON válido.
+    """
+    decodificador = json.JSONDecoder()
+    espacios = re.compile(r"[ \t\r\n]*")
+    dos_puntos = re.compile(r"[ \t\r\n]*:[ \t\r\n]*")
+    f = open(nombre_archivo, mode="r", encoding="utf-8")
+    try:
+        buffer = ""
+        fin_archivo = False
+        while not fin_archivo and not buffer.strip(): #Lee hasta encontrar el comienzo del objeto
+            bloque = f.read(tamanio_bloque)
+            fin_archivo = bloque == ""
+            buffer += bloque
+        posicion = espacios.match(buffer).end()
+        if buffer[posicion:posicion + 1] != "{":
+            raise json.JSONDecodeError("Se esperaba un objeto JSON", buffer, posicion)
+        posicion += 1
+        primero = True
+
+        while True:
+            inicio = posicion
+            try:
+                #Decodifica un par completo: [","] clave ":" valor. Si el bloque lo corta al medio
+                #se agrega el bloque siguiente y se vuelve a intentar desde el comienzo del par.
+                posicion = espacios.match(buffer, posicion).end()
+                if buffer[posicion] == "}":
+                    return
+                if not primero:
+                    if buffer[posicion] != ",":
+                        raise json.JSONDecodeError("Se esperaba ',' o '}'", buffer, posicion)
+                    posicion = espacios.match(buffer, posicion + 1).end()
+                clave, posicion = decodificador.raw_decode(buffer, posicion)
+                separador = dos_puntos.match(buffer, posicion)
+                if separador is None or not isinstance(clave, str):
+                    raise json.JSONDecodeError("Se esperaba una clave de texto y ':'", buffer, posicion)
+                valor, posicion = decodificador.raw_decode(buffer, separador.end())
+                #El valor se acepta recién cuando le sigue ',' o '}': un número cortado por el
+                #bloque ("1." de "1.5", "2" de "2e3") se decodifica igual, pero sin lo que sigue
+                siguiente = espacios.match(buffer, posicion).end()
+                if buffer[siguiente] not in ",}":
+                    raise json.JSONDecodeError("Se esperaba ',' o '}'", buffer, siguiente)
+            except (IndexError, json.JSONDecodeError):
+                if fin_archivo:
+                    raise json.JSONDecodeError("El archivo no es un objeto JSON válido", buffer, inicio)
+                bloque = f.read(tamanio_bloque)
+                fin_archivo = bloque == ""
+                buffer = buffer[inicio:] + bloque
+                posicion = 0
+                continue
+
+            yield clave, valor
+            primero = False
+    finally:
+        f.close()
+
+def sincronizar_directorio(nombre_archivo):
+    """
+    Fuerza en disco la entrada de directorio de un archivo recién renombrado. En sistemas que
+    no permiten abrir directorios (Windows) no hace nada.
+
+    Parametros:
+        nombre_archivo: Archivo cuyo directorio se sincroniza.
+    """
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(nombre_archivo)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def escribir_temporal(nombre_archivo, datos, posiciones=None):
+    """
+    Escribe los datos en un archivo temporal junto al destino y lo sincroniza con el disco.
+
+    Parametros:
+        nombre_archivo: Archivo destino.
+        datos: El diccionario con los datos a guardar.
+        posiciones: Diccionario donde anotar, para cada clave, la posición en bytes y el largo de
+                    su registro dentro del archivo (ver ColeccionDiferida), o None. El archivo
+                    queda igual en los dos casos; con posiciones se escribe registro por registro.
+
+    Retorno:
+        El nombre del archivo temporal escrito.
+    """
+    temporal = nombre_archivo + ".tmp"
+    if posiciones is None:
+        f = open(temporal, mode="w", encoding="utf-8")
+    else:
+        f = open(temporal, mode="wb")
+    try:
+        if posiciones is None:
+            json.dump(datos, f, ensure_ascii=False, indent=4, default=a_json)
+        else:
+            posicion = f.write(b"{")
+            for clave, valor in datos.items():
+                prefijo = ("," if posicion > 1 else "") + "\n    " + json.dumps(clave, ensure_ascii=False) + ": "
+                posicion += f.write(prefijo.encode("utf-8"))
+                registro = json.dumps(valor, ensure_ascii=False, indent=4, default=a_json).replace("\n", "\n    ").encode("utf-8")
+                posiciones[clave] = (posicion, len(registro))
+                posicion += f.write(registro)
+            f.write(b"\n}" if datos else b"}")
+        f.flush()
+        os.fsync(f.fileno())
+    finally:
+        f.close()
+    return temporal
+
+def guardar_json(nombre_archivo, datos, posiciones=None):
+    """
+    Guarda un diccionario de datos en un archivo con formato JSON.
+    Los datos se escriben primero en un archivo temporal que luego reemplaza al original,
+    por lo que un corte o un disco lleno nunca dejan el archivo a medio escribir.
+
+    Parametros:
+        nombre_archivo: La ruta y el nombre del archivo donde se guardarán los datos.
+        datos: El diccionario con los datos a guardar.
+        posiciones: Diccionario donde anotar la posición de cada registro, o None (ver escribir_temporal).
+
+    Retorno:
+        True si se guardó correctamente, False si hubo un error.
+    """
+    try:
+        temporal = escribir_temporal(nombre_archivo, datos, posiciones)
+        os.replace(temporal, nombre_archivo)
+        sincronizar_directorio(nombre_archivo)
+        return True
+    except (FileNotFoundError, OSError) as error:
+        print("Error al guardar JSON:", error)
+        return False
+
+def guardar_lote(archivos, nombre_lote="lote_pendiente.json", posiciones=None):
+    """
+    Guarda varios archivos JSON como una única operación. Se escriben todos los temporales,
+    luego se registra el lote en 'nombre_lote' y recién entonces se reemplazan los originales.
+    Si el programa se corta después de registrar el lote, recuperar_lote() termina los
+    reemplazos al iniciar; si se corta antes, los originales quedan intactos.
+
+    Parametros:
+        archivos: Diccionario con clave = nombre del archivo y valor = datos a guardar.
+        nombre_lote: Archivo donde se registra el lote mientras se aplica.
+        posiciones: Diccionario nombre del archivo -> diccionario donde anotar la posición de cada
+                    registro, para los archivos que la necesitan (ver escribir_temporal), o None.
+
+    Retorno:
+        True si el lote se guardó correctamente, False si hubo un error.
+    """
+    if posiciones is None:
+        posiciones = {}
+    if len(archivos) == 1:
+        for nombre_archivo, datos in archivos.items():
+            return guardar_json(nombre_archivo, datos, posiciones.get(nombre_archivo))
+
+    temporales = {}
+    try:
+        for nombre_archivo, datos in archivos.items():
+            temporales[nombre_archivo] = escribir_temporal(nombre_archivo, datos, posiciones.get(nombre_archivo))
+        if not guardar_json(nombre_lote, temporales):
+            raise OSError(f"No se pudo registrar el lote en '{nombre_lote}'.")
+    except OSError as error:
+        print("Error al guardar JSON:", error)
+        for temporal in temporales.values():
+            if os.path.exists(temporal):
+                os.remove(temporal)
+        return False
+
+    recuperar_lote(nombre_lote)
+    return True
+
+def recuperar_lote(nombre_lote="lote_pendiente.json"):
+    """
+    Completa un lote registrado por guardar_lote() que no llegó a aplicarse del todo,
+    reemplazando cada archivo por su temporal. Si no hay lote pendiente no hace nada.
+
+    Parametros:
+        nombre_lote: Archivo donde guardar_lote() registra los lotes.
+    """
+    if not os.path.exists(nombre_lote):
+        return
+    f = open(nombre_lote, mode="r", encoding="utf-8")
+    temporales = json.load(f)
+    f.close()
+    for nombre_archivo, temporal in temporales.items():
+        if os.path.exists(temporal): #Si ya no existe, el reemplazo se hizo antes del corte
+            os.replace(temporal, nombre_archivo)
+            sincronizar_directorio(nombre_archivo)
+    os.remove(nombre_lote)
+    sincronizar_directorio(nombre_lote)
+
+def version_archivo(nombre_archivo):
+    """
+    Identifica la versión de un archivo en disco sin leerlo. Como los archivos se reemplazan
+    completos al guardarlos, cualquier escritura cambia el inodo, la fecha o el tamaño.
+
+    Parametros:
+        nombre_archivo: Ruta del archivo.
+
+    Retorno:
+        Una tupla (inodo, fecha_modificacion_ns, tamanio), o None si el archivo no existe.
+    """
+    try:
+        estado = os.stat(nombre_archivo)
+    except FileNotFoundError:
+        return None
+    return (estado.st_ino, estado.st_mtime_ns, estado.st_size)
+
+FORMATO_INSTANTANEA = 3 #Cambiarlo si cambia la estructura de las instantáneas, para descartar las anteriores
+
+def ruta_instantanea(nombre_archivo, extension=".pkl"):
+    """
+    Devuelve el archivo de instantánea asociado a un archivo JSON.
+
+    Parametros:
+        nombre_archivo: Ruta del archivo JSON, por ejemplo 'mascotas.json'.
+        extension: '.pkl' para la instantánea de los datos, '.idx' para la de las posiciones de los registros,
+                   '.terminos' para el índice de textos de una partición.
+
+    Retorno:
+        La ruta de la instantánea, por ejemplo 'mascotas.pkl'.
+    """
+    return os.path.splitext(nombre_archivo)[0] + extension
+
+def internar(datos):
+    """
+    Reemplaza en el lugar cada texto de un diccionario o lista (y de los que contiene) por su
+    versión internada, de modo que los valores repetidos (motivos, diagnósticos, tratamientos,
+    especies...) queden como un único objeto en memoria y se escriban una sola vez en la instantánea.
+
+    Parametros:
+        datos: Diccionario o lista a recorrer.
+    """
+    pares = datos.items() if isinstance(datos, dict) else enumerate(datos)
+    for clave, valor in list(pares):
+        if isinstance(valor, str):
+            datos[clave] = sys.intern(valor)
+        elif isinstance(valor, (dict, list)):
+            internar(valor)
+
+def cargar_instantanea(nombre_archivo, version, extension=".pkl", clase=None):
+    """
+    Lee la instantánea binaria de un archivo JSON si corresponde a la versión actual del JSON.
+
+    Parametros:
+        nombre_archivo: Ruta del archivo JSON.
+        version: Versión actual del archivo JSON (ver version_archivo).
+        extension: Extensión de la instantánea (ver ruta_instantanea).
+        clase: Clase de los registros, si la instantánea puede estar guardada por columnas (ver guardar_instantanea).
+
+    Retorno:
+        Los datos de la instantánea, o None si no existe, está dañada o el JSON cambió después de generarla.
+    """
+    try:
+        with open(ruta_instantanea(nombre_archivo, extension), "rb") as f:
+            if pickle.load(f) != (FORMATO_INSTANTANEA, version):
+                return None
+            datos = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, ValueError, TypeError, AttributeError):
+        return None
+    if clase is not None and isinstance(datos, tuple):
+        claves, columnas = datos
+        datos = dict(zip(claves, map(clase, *columnas)))
+    return datos
+
+def guardar_instantanea(nombre_archivo, datos, version, extension=".pkl", clase=None):
+    """
+    Escribe la instantánea binaria (pickle protocolo 5) de un archivo JSON. Antes de los datos se
+    guarda la versión del JSON que representan, para descartarla si el JSON se modifica después.
+    Si no se puede escribir se ignora: el JSON sigue siendo la fuente de los datos.
+
+    Si todos los registros son de la clase indicada, se guardan por columnas (las claves y una
+    lista por campo) en lugar de objeto por objeto. Los textos repetidos (ver INTERNADOS) ya son
+    un único objeto en memoria, y pickle escribe cada objeto una sola vez: al leerla vuelven a
+    ser uno solo, sin internarlos de nuevo.
+
+    Parametros:
+        nombre_archivo: Ruta del archivo JSON.
+        datos: Contenido del archivo JSON.
+        version: Versión del archivo JSON con ese contenido (ver version_archivo).
+        extension: Extensión de la instantánea (ver ruta_instantanea).
+        clase: Clase de los registros de la colección (ver entidades), o None.
+    """
+    if clase is not None and all(type(registro) is clase for registro in datos.values()):
+        registros = list(datos.values())
+        columnas = [list(map(operator.attrgetter(campo), registros)) for campo in clase.CAMPOS]
+        datos = (list(datos), columnas)
+    ruta = ruta_instantanea(nombre_archivo, extension)
+    temporal = f"{ruta}.{os.getpid()}.tmp" #Un temporal por proceso: varios pueden regenerarla a la vez
+    try:
+        with open(temporal, "wb") as f:
+            pickle.dump((FORMATO_INSTANTANEA, version), f, protocol=5)
+            pickle.dump(datos, f, protocol=5)
+        os.replace(temporal, ruta)
+    except OSError:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+
+class PausaRecolector:
+    """
+    Pausa el recolector de ciclos de Python mientras se crean muchos registros juntos (al leer
+    una colección). Cada registro es un objeto que el recolector sigue, y con cientos de miles
+    recién creados lo recorre una y otra vez sin encontrar nada: los registros no forman ciclos.
+    Lo mismo pasa con los de las colecciones ya leídas mientras se lee el archivo de otra, por
+    eso la pausa abarca la lectura completa y no solo la creación de los registros.
+
+    El recolector es uno solo para todo el proceso, así que las pausas de varios hilos (el
+    servidor HTTP) se cuentan: se reactiva cuando termina la última, si estaba activo antes
+    de la primera.
+    """
+
+    cerrojo = threading.Lock()
+    pausas = 0 #Pausas en curso, de todos los hilos
+    activo = False #Si el recolector estaba activo antes de la primera pausa en curso
+
+    def __enter__(self):
+        with PausaRecolector.cerrojo:
+            if PausaRecolector.pausas == 0:
+                PausaRecolector.activo = gc.isenabled()
+                gc.disable()
+            PausaRecolector.pausas += 1
+        return self
+
+    def __exit__(self, *excepcion):
+        with PausaRecolector.cerrojo:
+            PausaRecolector.pausas -= 1
+            if PausaRecolector.pausas == 0 and PausaRecolector.activo:
+                gc.enable()
+
+def convertir_registros(datos, clase):
+    """
+    Convierte los registros de una colección leída de JSON a la clase de sus registros.
+
+    Parametros:
+        datos: Diccionario clave -> diccionario del registro.
+        clase: Clase de los registros (ver entidades), o None para dejarlos como diccionarios.
+
+    Retorno:
+        Diccionario clave -> registro.
+    """
+    if clase is None:
+        return datos
+    return clase.coleccion_desde_json(datos)
+
+def cargar_coleccion(nombre_archivo, instantanea=True, clase=None):
+    """
+    Carga un archivo JSON usando su instantánea binaria si está al día, que se lee varias veces
+    más rápido. Si no hay instantánea o el JSON es más nuevo, se lee el JSON y se regenera.
+    El recolector de ciclos queda pausado durante toda la lectura (ver PausaRecolector).
+
+    Parametros:
+        nombre_archivo: La ruta y el nombre del archivo JSON a cargar.
+        instantanea: False para leer siempre el JSON sin usar ni generar instantáneas. Los
+                     registros quedan entonces como los diccionarios leídos del JSON.
+        clase: Clase de los registros de la colección (Propietario, Mascota o Atencion), o None.
+
+    Retorno:
+        Los datos del archivo, o un diccionario vacío si no existe (como cargar_json).
+    """
+    if not instantanea:
+        return cargar_json(nombre_archivo) #Quedan como diccionarios: convertirlos tarda más que leer el JSON
+    with PausaRecolector():
+        version = version_archivo(nombre_archivo) #Antes de leer: si el JSON cambia mientras tanto, la instantánea queda vieja
+        if version is None:
+            return convertir_registros(cargar_json(nombre_archivo), clase)
+        datos = cargar_instantanea(nombre_archivo, version, clase=clase)
+        if datos is None:
+            datos = convertir_registros(cargar_json(nombre_archivo), clase)
+            internar(datos)
+            guardar_instantanea(nombre_archivo, datos, version, clase=clase)
+        return datos
+
+def combinar_cambios(actuales, nuevos, claves):
+    """
+    Reemplaza en el lugar el contenido de una colección por el leído del disco, conservando los
+    registros que este proceso modificó y todavía no guardó. Si ambas versiones de un registro
+    tienen 'historial', se conserva la unión de los dos.
+
+    Parametros:
+        actuales: Diccionario en memoria de la colección.
+        nuevos: Diccionario leído del disco.
+        claves: Claves de los registros modificados en memoria.
+    """
+    for clave in claves:
+        if clave not in actuales:
+            continue
+        datos = actuales[clave]
+        if clave in nuevos and "historial" in datos and "historial" in nuevos[clave]:
+            datos["historial"] = sorted(set(datos["historial"]) | set(nuevos[clave]["historial"]))
+        nuevos[clave] = datos
+    actuales.clear()
+    actuales.update(nuevos)
+
+class ColeccionDiferida(MutableMapping):
+    """
+    Colección de un archivo JSON (propietarios o mascotas) que se lee recién cuando se usa.
+    Mientras no se recorre ni se modifica, consultar un registro suelto (coleccion[clave], get,
+    'in', len) no lee el archivo completo: el índice de posiciones ('.idx', escrito junto con el
+    JSON) indica dónde empieza y cuánto mide cada registro, y se decodifica solo ese tramo.
+
+    Recorrerla, modificarla o consultar muchos registros sueltos la carga completa; desde ahí se
+    comporta como el diccionario de siempre. Los registros ya entregados se conservan al cargarla,
+    así los cambios hechos sobre ellos no se pierden.
+
+    Varios hilos pueden consultarla a la vez: la carga completa, el índice y los registros
+    sueltos se leen con su cerrojo tomado, así se leen una sola vez y ningún hilo ve un estado
+    a medio armar.
+    """
+
+    LIMITE_REGISTROS = 1000 #Registros sueltos a partir de los cuales conviene leer el archivo completo
+
+    def __init__(self, archivo, cargar, usar_indice=True, clase=None):
+        """
+        Parametros:
+            archivo: Ruta del archivo JSON de la colección.
+            cargar: Función sin parámetros que lee la colección completa y devuelve el diccionario.
+            usar_indice: False para no usar el índice de posiciones (siempre se carga completa).
+            clase: Clase de los registros (ver entidades), o None para dejarlos como diccionarios.
+        """
+        self.archivo = archivo
+        self.cargar = cargar
+        self.usar_indice = usar_indice
+        self.clase = clase
+        self.datos = None #Diccionario completo, una vez cargado
+        self.registros = {} #Registros leídos de a uno antes de cargarla completa
+        self.indice = None
+        self.version_indice = None
+        self.cerrojo = threading.RLock()
+
+    def cargada(self):
+        """
+        Retorno:
+            True si la colección ya se leyó completa.
+        """
+        return self.datos is not None
+
+    def contenido(self):
+        """
+        Lee la colección completa si todavía no se leyó.
+
+        Retorno:
+            El diccionario con todos los registros.
+        """
+        if self.datos is None:
+            with self.cerrojo:
+                if self.datos is None: #Otro hilo pudo cargarla mientras se esperaba el cerrojo
+                    datos = self.cargar()
+                    datos.update(self.registros)
+                    self.registros = {}
+                    self.indice = None
+                    self.datos = datos
+        return self.datos
+
+    def reiniciar(self):
+        """
+        Olvida los registros sueltos y el índice (por ejemplo, porque otro proceso reescribió el
+        archivo). Solo se usa mientras la colección no está cargada completa.
+        """
+        with self.cerrojo:
+            self.registros = {}
+            self.indice = None
+            self.version_indice = None
+
+    def obtener_indice(self):
+        """
+        Lee el índice de posiciones si corresponde a la versión actual del archivo.
+
+        Retorno:
+            El diccionario clave -> (posición, largo), o None si no hay un índice al día.
+        """
+        with self.cerrojo:
+            if self.indice is None and self.usar_indice and self.datos is None:
+                version = version_archivo(self.archivo)
+                if version is not None:
+                    self.indice = cargar_instantanea(self.archivo, version, ".idx")
+                    self.version_indice = version
+            return self.indice
+
+    def leer_registro(self, clave):
+        """
+        Lee un registro suelto usando el índice de posiciones.
+
+        Parametros:
+            clave: Clave del registro.
+
+        Retorno:
+            El diccionario del registro. Lanza KeyError si no existe.
+        """
+        with self.cerrojo:
+            if self.datos is not None:
+                return self.datos[clave]
+            if clave in self.registros:
+                return self.registros[clave]
+            indice = self.obtener_indice()
+            if indice is None or len(self.registros) >= self.LIMITE_REGISTROS:
+                return self.contenido()[clave]
+            posicion, largo = indice[clave]
+            with open(self.archivo, "rb") as f:
+                estado = os.fstat(f.fileno())
+                if (estado.st_ino, estado.st_mtime_ns, estado.st_size) != self.version_indice:
+                    self.reiniciar() #El archivo se reemplazó después de leer el índice
+                    return self.leer_registro(clave)
+                f.seek(posicion)
+                registro = json.loads(f.read(largo))
+            if self.clase is not None:
+                registro = self.clase.desde_json(registro)
+            self.registros[clave] = registro
+            return registro
+
+    def __getitem__(self, clave):
+        if self.datos is not None:
+            return self.datos[clave]
+        return self.leer_registro(clave)
+
+    def __contains__(self, clave):
+        if self.datos is not None:
+            return clave in self.datos
+        if clave in self.registros:
+            return True
+        indice = self.obtener_indice()
+        return clave in (indice if indice is not None else self.contenido())
+
+    def __len__(self):
+        if self.datos is None:
+            indice = self.obtener_indice()
+            if indice is not None:
+                return len(indice)
+        return len(self.contenido())
+
+    def __iter__(self):
+        return iter(self.contenido())
+
+    def __setitem__(self, clave, valor):
+        self.contenido()[clave] = valor
+
+    def __delitem__(self, clave):
+        del self.contenido()[clave]
+
+    def keys(self):
+        return self.contenido().keys()
+
+    def items(self):
+        return self.contenido().items()
+
+    def values(self):
+        return self.contenido().values()
+
+class BloqueoArchivo:
+    """
+    Bloqueo exclusivo entre procesos (fcntl.flock sobre un archivo), para que varias terminales
+    puedan trabajar sobre la misma carpeta de datos sin pisarse los cambios. Es reentrante dentro
+    del proceso: puede tomarse de nuevo mientras ya está tomado y se libera al salir del bloque
+    más externo. En sistemas sin fcntl (Windows) no bloquea.
+    """
+
+    def __init__(self, ruta):
+        """
+        Parametros:
+            ruta: Archivo usado como bloqueo (se crea vacío si no existe).
+        """
+        self.ruta = ruta
+        self.archivo = None
+        self.nivel = 0
+        self.tomas = 0 #Cantidad de veces que se tomó desde afuera; identifica cada período de bloqueo
+
+    def __enter__(self):
+        if self.nivel == 0:
+            self.archivo = open(self.ruta, mode="a")
+            if fcntl is not None:
+                fcntl.flock(self.archivo.fileno(), fcntl.LOCK_EX)
+            self.tomas += 1
+        self.nivel += 1
+        return self
+
+    def __exit__(self, *excepcion):
+        self.nivel -= 1
+        if self.nivel == 0:
+            self.archivo.close() #Cerrar el archivo libera el bloqueo
+            self.archivo = None
+
+class IndiceAtenciones:
+    """
+    Índices en memoria de los IDs de atenciones: por mascota, por propietario y por fecha.
+    Cada lista se mantiene ordenada (los IDs empiezan con la fecha y hora), así las consultas
+    por rango de fechas se resuelven con búsqueda binaria (bisect) sin recorrer las atenciones.
+    """
+
+    def __init__(self):
+        self.por_mascota = {}
+        self.por_propietario = {}
+        self.fechas = []
+
+    def agregar(self, id_atencion, mascota, propietario):
+        """
+        Agrega una atención a los tres índices. Si ya estaba, no se duplica.
+
+        Parametros:
+            id_atencion: ID de la atención.
+            mascota: ID de la mascota atendida.
+            propietario: DNI del propietario.
+        """
+        for lista in (self.por_mascota.setdefault(mascota, []),
+                      self.por_propietario.setdefault(propietario, []),
+                      self.fechas):
+            posicion = bisect.bisect_left(lista, id_atencion)
+            if posicion == len(lista) or lista[posicion] != id_atencion:
+                lista.insert(posicion, id_atencion)
+
+    def cargar(self, atenciones):
+        """
+        Vacía los índices y los arma con muchas atenciones juntas: primero las agrega al final de
+        cada lista y después ordena cada lista una sola vez, en lugar de insertar una por una.
+
+        Parametros:
+            atenciones: Iterable de tuplas (id_atencion, mascota, propietario).
+        """
+        self.limpiar()
+        for id_atencion, mascota, propietario in atenciones:
+            self.por_mascota.setdefault(mascota, []).append(id_atencion)
+            self.por_propietario.setdefault(propietario, []).append(id_atencion)
+            self.fechas.append(id_atencion)
+        for lista in (*self.por_mascota.values(), *self.por_propietario.values(), self.fechas):
+            lista[:] = sorted(set(lista))
+
+    def agregar_varias(self, atenciones):
+        """
+        Agrega muchas atenciones que todavía no están indexadas: las suma al final de cada lista
+        afectada y ordena esas listas una sola vez.
+
+        Parametros:
+            atenciones: Iterable de tuplas (id_atencion, mascota, propietario) con IDs nuevos.
+        """
+        tocadas = {id(self.fechas): self.fechas}
+        for id_atencion, mascota, propietario in atenciones:
+            for lista in (self.por_mascota.setdefault(mascota, []), self.por_propietario.setdefault(propietario, [])):
+                lista.append(id_atencion)
+                tocadas[id(lista)] = lista
+            self.fechas.append(id_atencion)
+        for lista in tocadas.values():
+            lista.sort() #Las listas ya estaban ordenadas: sort solo mezcla la parte nueva
+
+    def quitar(self, id_atencion, mascota, propietario):
+        """
+        Quita una atención de los tres índices, si estaba.
+
+        Parametros:
+            id_atencion: ID de la atención.
+            mascota: ID de la mascota atendida.
+            propietario: DNI del propietario.
+        """
+        for lista in (self.por_mascota.get(mascota, []), self.por_propietario.get(propietario, []), self.fechas):
+            posicion = bisect.bisect_left(lista, id_atencion)
+            if posicion < len(lista) and lista[posicion] == id_atencion:
+                del lista[posicion]
+
+    def limpiar(self):
+        """
+        Vacía los tres índices.
+        """
+        self.por_mascota.clear()
+        self.por_propietario.clear()
+        self.fechas.clear()
+
+    def cantidad(self):
+        """
+        Retorno:
+            La cantidad de atenciones indexadas.
+        """
+        return len(self.fechas)
+
+    def buscar(self, desde="", hasta="", mascota=None, propietario=None):
+        """
+        Devuelve los IDs de las atenciones entre dos fechas, opcionalmente de una mascota o de
+        un propietario.
+
+        Parametros:
+            desde: Prefijo de la primera fecha incluida ('AAAA', 'AAAA.MM' o 'AAAA.MM.DD'); '' sin límite.
+            hasta: Prefijo de la última fecha incluida; '' sin límite. Se incluyen todos los IDs
+                   que empiezan con él (hasta='2023.05' incluye todo mayo).
+            mascota: ID de mascota para usar su índice, o None.
+            propietario: DNI de propietario para usar su índice, o None.
+
+        Retorno:
+            Una lista de IDs ordenada por fecha.
+        """
+        if mascota is not None:
+            lista = self.por_mascota.get(mascota, [])
+        elif propietario is not None:
+            lista = self.por_propietario.get(propietario, [])
+        else:
+            lista = self.fechas
+        inicio = bisect.bisect_left(lista, desde) if desde else 0
+        fin = bisect.bisect_left(lista, rango_prefijo(hasta)[1]) if hasta else len(lista)
+        return lista[inicio:fin]
+
+class ArchivoRegistros:
+    """
+    Archivo de registros de ancho fijo con las atenciones de una partición mensual, para leer
+    atenciones sueltas (por ejemplo el historial de una mascota) sin leer el JSON del mes.
+    El archivo se abre con mmap: solo se leen del disco las páginas de los registros consultados,
+    por lo que la memoria usada no depende del tamaño de la partición.
+
+    Formato (números little-endian):
+        cabecera: 'VETR', formato, cantidad de registros y versión (inodo, fecha, tamaño) del JSON de origen.
+        registros: uno por atención, ordenados por ID, con el ID (31 bytes), los tres costos y la
+                   posición y el largo dentro de los textos de mascota, propietario, motivo,
+                   diagnóstico y tratamiento. Como están ordenados y tienen ancho fijo, la posición
+                   de una atención se encuentra con búsqueda binaria sobre los IDs.
+        textos: los textos en UTF-8, cada texto repetido guardado una sola vez.
+    """
+
+    FORMATO = 1
+    CABECERA = struct.Struct("<4sIIQqQ")
+    REGISTRO = struct.Struct("<31s3d10I")
+    ANCHO_ID = 31
+    TEXTOS = ("mascota", "propietario", "motivo", "diagnostico", "tratamiento")
+    COSTOS = ("costo_veterinario", "costo_medicamentos", "costo")
+
+    def __init__(self, ruta):
+        """
+        Abre un archivo de registros. Lanza ValueError si no tiene el formato esperado.
+
+        Parametros:
+            ruta: Ruta del archivo.
+        """
+        with open(ruta, "rb") as f:
+            self.mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            marca, formato, self.cantidad, inodo, fecha, tamanio = self.CABECERA.unpack_from(self.mapa)
+        except struct.error:
+            self.mapa.close()
+            raise ValueError(f"El archivo '{ruta}' no es un archivo de registros.")
+        self.inicio_textos = self.CABECERA.size + self.cantidad * self.REGISTRO.size
+        if marca != b"VETR" or formato != self.FORMATO or len(self.mapa) < self.inicio_textos:
+            self.mapa.close()
+            raise ValueError(f"El archivo '{ruta}' no es un archivo de registros.")
+        self.version = (inodo, fecha, tamanio)
+
+    def cerrar(self):
+        """
+        Libera el mapeo del archivo.
+        """
+        self.mapa.close()
+
+    @classmethod
+    def clave(cls, id_atencion):
+        """
+        Parametros:
+            id_atencion: ID de la atención.
+
+        Retorno:
+            El ID tal como se guarda en los registros (ASCII completado con espacios hasta
+            ANCHO_ID), o None si no se puede guardar sin cambiarlo: no es ASCII, es más largo que
+            ANCHO_ID (se cortaría y podría coincidir con otro) o termina en espacio.
+        """
+        try:
+            codificado = id_atencion.encode("ascii")
+        except UnicodeEncodeError:
+            return None
+        if len(codificado) > cls.ANCHO_ID or codificado.endswith(b" "):
+            return None
+        return codificado.ljust(cls.ANCHO_ID, b" ")
+
+    def posicion(self, id_atencion):
+        """
+        Busca una atención por búsqueda binaria sobre los IDs de los registros.
+
+        Parametros:
+            id_atencion: ID de la atención.
+
+        Retorno:
+            El número de registro, o -1 si la atención no está en el archivo.
+        """
+        clave = self.clave(id_atencion)
+        if clave is None:
+            return -1
+        inicio, fin = 0, self.cantidad
+        while inicio < fin:
+            medio = (inicio + fin) // 2
+            desplazamiento = self.CABECERA.size + medio * self.REGISTRO.size
+            if self.mapa[desplazamiento:desplazamiento + self.ANCHO_ID] < clave:
+                inicio = medio + 1
+            else:
+                fin = medio
+        desplazamiento = self.CABECERA.size + inicio * self.REGISTRO.size
+        if inicio < self.cantidad and self.mapa[desplazamiento:desplazamiento + self.ANCHO_ID] == clave:
+            return inicio
+        return -1
+
+    def leer(self, numero):
+        """
+        Decodifica un registro.
+
+        Parametros:
+            numero: Número de registro (0 a cantidad - 1).
+
+        Retorno:
+            Un par (id_atencion, datos) con los datos como Atencion.
+        """
+        campos = self.REGISTRO.unpack_from(self.mapa, self.CABECERA.size + numero * self.REGISTRO.size)
+        textos = []
+        for i in range(len(self.TEXTOS)):
+            posicion = self.inicio_textos + campos[4 + 2 * i]
+            textos.append(self.mapa[posicion:posicion + campos[5 + 2 * i]].decode("utf-8"))
+        return campos[0].decode("ascii").rstrip(" "), Atencion(*textos, *campos[1:4])
+
+    def textos(self, campos):
+        """
+        Recorre en orden los textos de todos los registros sin decodificar los registros completos;
+        cada texto distinto se decodifica una sola vez.
+
+        Parametros:
+            campos: Campos de textos a leer (de TEXTOS).
+
+        Retorno:
+            Un generador de tuplas con los textos de cada registro.
+        """
+        referencias = [4 + 2 * self.TEXTOS.index(campo) for campo in campos]
+        decodificados = {} #Posición -> texto
+        for campos_registro in self.REGISTRO.iter_unpack(self.mapa[self.CABECERA.size:self.inicio_textos]):
+            textos = []
+            for referencia in referencias:
+                posicion = campos_registro[referencia]
+                texto = decodificados.get(posicion)
+                if texto is None:
+                    inicio = self.inicio_textos + posicion
+                    texto = decodificados[posicion] = self.mapa[inicio:inicio + campos_registro[referencia + 1]].decode("utf-8")
+                textos.append(texto)
+            yield tuple(textos)
+
+    def obtener(self, id_atencion):
+        """
+        Parametros:
+            id_atencion: ID de la atención.
+
+        Retorno:
+            La Atencion con sus datos, o None si no está en el archivo.
+        """
+        numero = self.posicion(id_atencion)
+        return self.leer(numero)[1] if numero >= 0 else None
+
+    @classmethod
+    def escribir(cls, ruta, atenciones, version):
+        """
+        Escribe un archivo de registros completo, reemplazando el anterior recién al terminar.
+        Lanza ValueError si algún ID no se puede guardar en un registro (ver clave): esas
+        particiones se siguen leyendo del JSON.
+
+        Parametros:
+            ruta: Ruta del archivo.
+            atenciones: Iterable de pares (id_atencion, datos), preferentemente ordenado por ID.
+            version: Versión del JSON del que salen las atenciones (ver version_archivo).
+        """
+        registros = []
+        textos = bytearray()
+        posiciones = {} #Texto -> (posición, largo) en la zona de textos
+        for id_atencion, datos in atenciones:
+            referencias = []
+            for campo in cls.TEXTOS:
+                texto = datos[campo]
+                if texto not in posiciones:
+                    codificado = texto.encode("utf-8")
+                    posiciones[texto] = (len(textos), len(codificado))
+                    textos += codificado
+                referencias.extend(posiciones[texto])
+            clave = cls.clave(id_atencion)
+            if clave is None:
+                raise ValueError(f"El ID de atención {id_atencion!r} no se puede guardar en un archivo de registros.")
+            registros.append(cls.REGISTRO.pack(clave, *(datos[campo] for campo in cls.COSTOS), *referencias))
+        if any(registros[i] > registros[i + 1] for i in range(len(registros) - 1)):
+            registros.sort() #Cada registro empieza con su ID: ordenar los bytes los ordena por ID
+        temporal = f"{ruta}.{os.getpid()}.tmp" #Un temporal por proceso: varios pueden regenerarlo a la vez
+        with open(temporal, "wb") as f:
+            f.write(cls.CABECERA.pack(b"VETR", cls.FORMATO, len(registros), *version))
+            f.write(b"".join(registros))
+            f.write(textos)
+        os.replace(temporal, ruta)
+
+@functools.cache
+def cargar_numpy():
+    """
+    Importa NumPy la primera vez que se necesita. Es opcional: si está instalado, los cálculos
+    por columnas lo usan; importarlo tarda más que el resto del programa, por eso no se hace al inicio.
+
+    Retorno:
+        El módulo numpy, o None si no está instalado.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+class ColumnasAtenciones:
+    """
+    Representación por columnas de un conjunto de atenciones, pensada para calcular totales
+    agrupados sobre muchas atenciones. Cada atención ocupa una posición en arreglos numéricos:
+    período (año * 12 + mes - 1), índice de mascota, índice de propietario y los tres costos.
+    Los IDs de mascotas y propietarios se guardan una sola vez en las listas 'mascotas' y
+    'propietarios'. Si NumPy está instalado las columnas son arreglos de NumPy y las sumas
+    agrupadas se hacen con np.bincount; si no, se usan arreglos de 'array' y bucles de Python.
+    Los procesos de fragmentos la usan para calcular los agregados mensuales (ver agregados()),
+    de los que salen los resúmenes anuales sin volver a recorrer las atenciones.
+    """
+
+    CAMPOS_COSTO = ("costo", "costo_veterinario", "costo_medicamentos")
+
+    def __init__(self, atenciones):
+        """
+        Parametros:
+            atenciones: Iterable de pares (id_atencion, datos), por ejemplo almacen.iterar_atenciones().
+        """
+        self.mascotas = []
+        self.propietarios = []
+        self.propietario_de_mascota = [] #Índice de propietario de cada mascota (el de su última atención)
+        indices_mascota = {}
+        indices_propietario = {}
+        columnas = {"periodo": array("i"), "mascota": array("i"), "propietario": array("i")}
+        for campo in self.CAMPOS_COSTO:
+            columnas[campo] = array("d")
+
+        for id_atencion, datos in atenciones:
+            i_masc = indices_mascota.get(datos["mascota"])
+            if i_masc is None:
+                i_masc = indices_mascota[datos["mascota"]] = len(self.mascotas)
+                self.mascotas.append(datos["mascota"])
+                self.propietario_de_mascota.append(0)
+            i_prop = indices_propietario.get(datos["propietario"])
+            if i_prop is None:
+                i_prop = indices_propietario[datos["propietario"]] = len(self.propietarios)
+                self.propietarios.append(datos["propietario"])
+            self.propietario_de_mascota[i_masc] = i_prop
+
+            columnas["periodo"].append(int(id_atencion[:4]) * 12 + int(id_atencion[5:7]) - 1)
+            columnas["mascota"].append(i_masc)
+            columnas["propietario"].append(i_prop)
+            for campo in self.CAMPOS_COSTO:
+                columnas[campo].append(datos[campo])
+
+        np = cargar_numpy()
+        if np is not None:
+            columnas = {nombre: np.frombuffer(columna, dtype=np.int32 if columna.typecode == "i" else np.float64)
+                        for nombre, columna in columnas.items()}
+        self.columnas = columnas
+        self.cantidad = len(columnas["periodo"])
+
+    def agregados(self):
+        """
+        Calcula los totales mensuales por mascota con el mismo formato que 'atenciones/agregados'.
+
+        Retorno:
+            Un diccionario 'AAAA.MM' -> {id_mascota: totales}.
+        """
+        columnas = self.columnas
+        agregados = {}
+        if not self.cantidad:
+            return agregados
+        primero = int(min(columnas["periodo"]))
+
+        np = cargar_numpy()
+        if np is not None:
+            periodo = columnas["periodo"] - primero
+            cantidad_periodos = int(periodo.max()) + 1
+            combinada = columnas["mascota"].astype(np.int64) * cantidad_periodos + periodo
+            cuentas = np.bincount(combinada)
+            posiciones = np.flatnonzero(cuentas)
+            sumas = [np.bincount(combinada, weights=columnas[campo])[posiciones].tolist() for campo in self.CAMPOS_COSTO]
+            for n, posicion in enumerate(posiciones.tolist()):
+                i_masc, p = divmod(posicion, cantidad_periodos)
+                totales = {"propietario": self.propietarios[self.propietario_de_mascota[i_masc]],
+                           "cantidad": int(cuentas[posicion])}
+                for campo, suma in zip(self.CAMPOS_COSTO, sumas):
+                    totales[campo] = suma[n]
+                agregados.setdefault(nombre_periodo(p + primero), {})[self.mascotas[i_masc]] = totales
+        else:
+            for posicion in range(self.cantidad):
+                i_masc = columnas["mascota"][posicion]
+                mes = agregados.setdefault(nombre_periodo(columnas["periodo"][posicion]), {})
+                totales = mes.get(self.mascotas[i_masc])
+                if totales is None:
+                    totales = mes[self.mascotas[i_masc]] = {"propietario": self.propietarios[self.propietario_de_mascota[i_masc]],
+                                                             "cantidad": 0, "costo": 0.0,
+                                                             "costo_veterinario": 0.0, "costo_medicamentos": 0.0}
+                totales["cantidad"] += 1
+                for campo in self.CAMPOS_COSTO:
+                    totales[campo] += columnas[campo][posicion]
+        return {mes: agregados[mes] for mes in sorted(agregados)}
+
+def nombre_periodo(periodo):
+    """
+    Convierte un período numérico (año * 12 + mes - 1) en el texto 'AAAA.MM'.
+
+    Parametros:
+        periodo: Número de período.
+
+    Retorno:
+        El texto 'AAAA.MM' del período.
+    """
+    anio, mes = divmod(periodo, 12)
+    return f"{anio:04d}.{mes + 1:02d}"
+
+UMBRAL_PARALELO = 200000 #Con menos atenciones, las sumas se hacen en un solo proceso
+CLAVES_AGRUPACION = ("anio", "mes", "dia", "mascota", "propietario", "motivo", "diagnostico", "tratamiento")
+CAMPOS_AGRUPACION = ("cantidad", "costo", "costo_veterinario", "costo_medicamentos")
+
+def iterar_fragmento(fragmento):
+    """
+    Recorre las atenciones de un fragmento (ver Almacen.fragmentos). Un fragmento solo tiene
+    datos simples, así se puede enviar a otro proceso y leerse allí.
+
+    Parametros:
+        fragmento: ('archivo', ruta, prefijo) para una partición guardada, ('sqlite', ruta, desde, hasta)
+                   para un rango de la base, o ('memoria', pares) para atenciones que solo están en memoria.
+
+    Retorno:
+        Un generador de pares (id_atencion, datos) ordenados por fecha.
+    """
+    if fragmento[0] == "archivo":
+        for id_atencion, datos in iterar_json(fragmento[1]):
+            if id_atencion.startswith(fragmento[2]):
+                yield id_atencion, datos
+    elif fragmento[0] == "sqlite":
+        import sqlite3
+        conexion = sqlite3.connect(fragmento[1])
+        try:
+            consulta = (f"SELECT id, {', '.join(AlmacenSQLite.COLUMNAS_ATENCION)} FROM atenciones "
+                        "WHERE fecha >= ? AND fecha < ? ORDER BY fecha")
+            for fila in conexion.execute(consulta, fragmento[2:]):
+                yield fila[0], dict(zip(AlmacenSQLite.COLUMNAS_ATENCION, fila[1:]))
+        finally:
+            conexion.close()
+    else:
+        yield from fragmento[1]
+
+def procesar_fragmentos(funcion, fragmentos, argumentos=(), procesos=None, umbral=UMBRAL_PARALELO):
+    """
+    Aplica una función a cada fragmento de atenciones. Si en total hay al menos 'umbral'
+    atenciones, los fragmentos se reparten entre los procesos de un ProcessPoolExecutor
+    (los más grandes primero) y cada proceso lee sus atenciones por su cuenta; si son menos,
+    se procesan en este proceso, sin el costo de iniciar otros.
+
+    Parametros:
+        funcion: Función de nivel de módulo funcion(fragmento, *argumentos) que devuelve un resultado parcial.
+        fragmentos: Lista de pares (fragmento, cantidad_de_atenciones).
+        argumentos: Argumentos adicionales para la función.
+        procesos: Cantidad de procesos; None usa uno por núcleo y 1 fuerza un solo proceso.
+        umbral: Cantidad mínima de atenciones para usar varios procesos.
+
+    Retorno:
+        La lista de resultados parciales, en el orden de los fragmentos.
+    """
+    if procesos == 1 or len(fragmentos) < 2 or sum(cantidad for _, cantidad in fragmentos) < umbral:
+        return [funcion(fragmento, *argumentos) for fragmento, _ in fragmentos]
+    from concurrent.futures import ProcessPoolExecutor
+
+    orden = sorted(range(len(fragmentos)), key=lambda i: -fragmentos[i][1])
+    resultados = [None] * len(fragmentos)
+    with ProcessPoolExecutor(max_workers=procesos) as grupo:
+        futuros = {i: grupo.submit(funcion, fragmentos[i][0], *argumentos) for i in orden}
+        for i, futuro in futuros.items():
+            resultados[i] = futuro.result()
+    return resultados
+
+def agregados_fragmento(fragmento):
+    """
+    Parametros:
+        fragmento: Fragmento de atenciones (ver iterar_fragmento).
+
+    Retorno:
+        Los totales mensuales por mascota de las atenciones del fragmento (ver ColumnasAtenciones.agregados).
+    """
+    return ColumnasAtenciones(iterar_fragmento(fragmento)).agregados()
+
+def agrupar_fragmento(fragmento, claves, campo):
+    """
+    Suma un campo (o cuenta atenciones) de un fragmento agrupando por las claves indicadas.
+
+    Parametros:
+        fragmento: Fragmento de atenciones (ver iterar_fragmento).
+        claves: Tupla de claves de CLAVES_AGRUPACION.
+        campo: Uno de CAMPOS_AGRUPACION.
+
+    Retorno:
+        Un diccionario tupla_de_valores -> total.
+    """
+    largos = {"anio": 4, "mes": 7, "dia": 10}
+    totales = {}
+    for id_atencion, datos in iterar_fragmento(fragmento):
+        grupo = tuple(id_atencion[:largos[clave]] if clave in largos else datos[clave] for clave in claves)
+        totales[grupo] = totales.get(grupo, 0) + (1 if campo == "cantidad" else datos[campo])
+    return totales
+
+class Almacen:
+    """
+    Repositorio en memoria de propietarios, mascotas y atenciones.
+
+    Cada colección se lee del disco una sola vez (al iniciar el programa o en el primer acceso)
+    y se mantiene en memoria. Las funciones marcan las colecciones que modifican y al guardar
+    solamente se escriben esas, en lugar de releer y reescribir los tres archivos en cada operación.
+
+    Las atenciones se guardan particionadas por mes en la carpeta 'atenciones' (un archivo
+    'AAAA.MM.json' por mes) con un manifiesto que lista las particiones existentes. Cada
+    partición es una colección más, llamada 'atenciones/AAAA.MM', y solo se lee cuando una
+    operación necesita atenciones de ese mes.
+
+    Junto a las particiones se mantiene 'atenciones/agregados': los totales de cada mes por
+    mascota (cantidad, costo, costo_veterinario y costo_medicamentos, con su propietario), que
+    se actualizan con cada atención registrada y permiten armar los resúmenes anuales sin
+    recorrer las atenciones.
+
+    Varios procesos pueden usar la misma carpeta de datos: cada escritura se hace con el bloqueo
+    'veterinaria.lock' tomado y, antes de escribir, sincronizar() incorpora lo que los otros
+    procesos guardaron desde la última lectura (comparando la versión de cada archivo), de modo
+    que ningún guardado pisa cambios ajenos.
+
+    Las consultas pueden hacerse desde varios hilos a la vez (el servidor HTTP), mientras ninguno
+    modifique datos: lo que se guarda en memoria al consultar (colecciones leídas, archivos de
+    registros, índices de búsqueda) se arma con el cerrojo del almacén tomado, de a un hilo, y
+    recién completo queda a la vista de los demás.
+    """
+
+    MANIFIESTO = "atenciones/manifiesto"
+    AGREGADOS = "atenciones/agregados"
+
+    def __init__(self, archivos=None, diario="atenciones_diario.jsonl", limite_diario=500,
+                 carpeta_atenciones="atenciones", archivo_atenciones="atenciones.json",
+                 archivo_bloqueo="veterinaria.lock", archivo_secuencia="mascotas_secuencia.json",
+                 instantaneas=True):
+        """
+        Parametros:
+            archivos: Diccionario con clave = nombre de la colección y valor = archivo JSON asociado.
+                      Si no se indica se usan 'propietarios.json' y 'mascotas.json'.
+            diario: Archivo JSON Lines donde se agregan las atenciones nuevas antes de compactarlas.
+            limite_diario: Cantidad de entradas del diario a partir de la cual se compacta automáticamente.
+            carpeta_atenciones: Carpeta con las particiones mensuales de atenciones y su manifiesto.
+            archivo_atenciones: Archivo único de atenciones del formato anterior, que se migra
+                                a particiones la primera vez que se carga el almacén.
+            archivo_bloqueo: Archivo usado para bloquear las escrituras entre procesos.
+            archivo_secuencia: Archivo con el próximo ID de mascota sin reservar.
+            instantaneas: Si es True, cada colección se lee de su instantánea binaria ('.pkl') cuando
+                          está al día con el JSON, y se regenera al guardar o si el JSON es más nuevo.
+                          Lo mismo con los archivos de registros ('.dat') de las particiones.
+                          Sin instantáneas los registros leídos quedan como diccionarios (ver entidades).
+        """
+        if archivos is None:
+            archivos = {
+                "propietarios": "propietarios.json",
+                "mascotas": "mascotas.json"
+            }
+        self.archivos = archivos
+        self.colecciones = {}
+        self.modificadas = set()
+        self.diario = diario
+        self.limite_diario = limite_diario
+        self.entradas_diario = 0
+        self.pendientes = set() #Colecciones con cambios que por ahora solo están en el diario
+        self.carpeta_atenciones = carpeta_atenciones
+        self.archivo_atenciones = archivo_atenciones
+        self.indice = IndiceAtenciones()
+        self.bloqueo = BloqueoArchivo(archivo_bloqueo)
+        self.versiones = {} #Versión en disco de cada colección cuando se leyó o guardó por última vez
+        self.claves_modificadas = {} #Registros modificados de cada colección, para combinar con cambios ajenos
+        self.inodo_diario = None
+        self.posicion_diario = 0 #Bytes del diario ya aplicados
+        self.sincronizando = False
+        self.sincronizado = 0 #Toma del bloqueo en la que se sincronizó por última vez
+        self.archivo_secuencia = archivo_secuencia
+        self.bloque_ids_mascota = 100
+        self.proximo_id_mascota = 0 #IDs reservados por este proceso: [proximo_id_mascota, limite_id_mascota)
+        self.limite_id_mascota = 0
+        self.instantaneas = instantaneas
+        self.registros = {} #Archivos de registros abiertos de las particiones que no están en memoria
+        self.registros_fallidos = {} #Partición -> versión del JSON cuyo archivo de registros no se pudo escribir
+        self.textos = {} #Índice de textos de cada partición guardada: nombre -> (versión, índice, IDs)
+        self.textos_nuevos = IndiceTextos(CAMPOS_ATENCION) #Atenciones del diario que todavía no están en su partición guardada
+        self.textos_propietarios = None #Índice de textos de los propietarios, se arma en la primera búsqueda
+        self.indices_registros = {} #Índices por nombre, email y teléfonos de propietarios y mascotas (ver indice_registros)
+        self.cerrojo = threading.RLock() #Para llenar los cachés de las consultas desde varios hilos
+
+    def cargar(self):
+        """
+        Carga en memoria el manifiesto de atenciones y las mascotas, arma los índices de atenciones
+        y vuelve a aplicar las entradas del diario que no llegaron a compactarse. Los propietarios
+        se leen recién cuando se usan (ver ColeccionDiferida) y las particiones de atenciones,
+        cuando se consultan.
+        """
+        with self.bloqueo:
+            recuperar_lote()
+            self.migrar_atenciones()
+            for nombre in self.archivos:
+                self.obtener(nombre)
+            self.obtener(self.MANIFIESTO)
+            self.verificar_agregados()
+            self.reproducir_diario() #Antes de verificar el índice: el historial guardado puede incluir entradas del diario
+            self.verificar_indice()
+            self.migrar_ids_atenciones()
+
+    def archivo(self, nombre):
+        """
+        Devuelve el archivo JSON donde se guarda una colección.
+
+        Parametros:
+            nombre: Nombre de la colección ('propietarios', 'mascotas', 'atenciones/manifiesto'
+                    o 'atenciones/AAAA.MM').
+
+        Retorno:
+            La ruta del archivo.
+        """
+        if nombre in self.archivos:
+            return self.archivos[nombre]
+        return os.path.join(self.carpeta_atenciones, nombre.split("/", 1)[1] + ".json")
+
+    def obtener(self, nombre):
+        """
+        Devuelve el diccionario de una colección, leyéndolo del archivo solo la primera vez.
+
+        Parametros:
+            nombre: Nombre de la colección ('propietarios', 'mascotas', 'atenciones/manifiesto'
+                    o una partición 'atenciones/AAAA.MM').
+
+        Retorno:
+            El diccionario en memoria de la colección (para propietarios y mascotas, una
+            ColeccionDiferida que lee el archivo recién cuando se usa). Los cambios que se hagan
+            sobre él deben informarse con marcar() para que se guarden.
+        """
+        if nombre not in self.colecciones:
+            with self.cerrojo:
+                if nombre not in self.colecciones: #Otro hilo pudo leerla mientras se esperaba el cerrojo
+                    self.versiones[nombre] = version_archivo(self.archivo(nombre))
+                    if nombre in self.archivos:
+                        coleccion = ColeccionDiferida(self.archivo(nombre), functools.partial(self.leer_coleccion, nombre),
+                                                      self.instantaneas, self.clase(nombre))
+                    elif nombre in (self.MANIFIESTO, self.AGREGADOS) and not os.path.exists(self.archivo(nombre)):
+                        coleccion = {}
+                    elif self.es_particion(nombre) and nombre.split("/", 1)[1] not in self.obtener(self.MANIFIESTO):
+                        coleccion = {} #Partición de un mes que todavía no tiene atenciones
+                    else:
+                        coleccion = cargar_coleccion(self.archivo(nombre), self.instantaneas, self.clase(nombre))
+                    self.colecciones[nombre] = coleccion
+        return self.colecciones[nombre]
+
+    def leer_coleccion(self, nombre):
+        """
+        Lee completa una colección del archivo (o de su instantánea) y anota la versión leída.
+
+        Parametros:
+            nombre: Nombre de la colección.
+
+        Retorno:
+            El diccionario con los datos del archivo.
+        """
+        self.versiones[nombre] = version_archivo(self.archivo(nombre))
+        return cargar_coleccion(self.archivo(nombre), self.instantaneas, self.clase(nombre))
+
+    def clase(self, nombre):
+        """
+        Parametros:
+            nombre: Nombre de la colección.
+
+        Retorno:
+            La clase de sus registros (Propietario, Mascota o Atencion), o None si la colección
+            guarda otros datos (el manifiesto y los agregados).
+        """
+        if self.es_particion(nombre):
+            return Atencion
+        return {"propietarios": Propietario, "mascotas": Mascota}.get(nombre)
+
+    def contenido(self, nombre):
+        """
+        Devuelve el diccionario completo de una colección ya obtenida, leyéndola completa si es
+        una ColeccionDiferida que todavía no se leyó (por ejemplo, para guardarla).
+
+        Parametros:
+            nombre: Nombre de la colección.
+
+        Retorno:
+            El diccionario con todos los registros.
+        """
+        coleccion = self.colecciones[nombre]
+        return coleccion.contenido() if isinstance(coleccion, ColeccionDiferida) else coleccion
+
+    def es_particion(self, nombre):
+        """
+        Indica si una colección es una partición mensual de atenciones.
+
+        Parametros:
+            nombre: Nombre de la colección.
+
+        Retorno:
+            True si es una partición 'atenciones/AAAA.MM', False en caso contrario.
+        """
+        return nombre.startswith("atenciones/") and nombre not in (self.MANIFIESTO, self.AGREGADOS)
+
+    def particion(self, id_atencion):
+        """
+        Devuelve el nombre de la partición (colección) que guarda una atención.
+
+        Parametros:
+            id_atencion: ID de la atención (empieza con 'AAAA.MM').
+
+        Retorno:
+            El nombre de la colección, por ejemplo 'atenciones/2023.05'.
+        """
+        return "atenciones/" + id_atencion[:7]
+
+    def particiones(self, prefijo=""):
+        """
+        Lista las particiones existentes cuyo mes empieza con el prefijo, sin leer ninguna.
+
+        Parametros:
+            prefijo: '' para todas, 'AAAA' para las de un año o 'AAAA.MM' para la de un mes.
+
+        Retorno:
+            Una lista ordenada de nombres de colección 'atenciones/AAAA.MM'.
+        """
+        manifiesto = self.obtener(self.MANIFIESTO)
+        return ["atenciones/" + mes for mes in sorted(manifiesto) if mes.startswith(prefijo[:7])]
+
+    def migrar_atenciones(self):
+        """
+        Si todavía existe el archivo único de atenciones del formato anterior y no hay manifiesto,
+        reparte sus atenciones en particiones mensuales, guarda todo en un solo lote y renombra el
+        archivo anterior agregándole '.migrado' para conservarlo como respaldo.
+        """
+        if os.path.exists(self.archivo(self.MANIFIESTO)) or not os.path.exists(self.archivo_atenciones):
+            return
+        atenciones = cargar_json(self.archivo_atenciones)
+        os.makedirs(self.carpeta_atenciones, exist_ok=True)
+        manifiesto = self.obtener(self.MANIFIESTO)
+        for id_atencion in sorted(atenciones):
+            nombre = self.particion(id_atencion)
+            self.colecciones.setdefault(nombre, {})[id_atencion] = Atencion.desde_json(atenciones[id_atencion])
+        for nombre, particion in self.colecciones.items():
+            if self.es_particion(nombre):
+                mes = nombre.split("/", 1)[1]
+                manifiesto[mes] = {"archivo": mes + ".json", "cantidad": len(particion)}
+        archivos = {self.archivo(nombre): datos for nombre, datos in self.colecciones.items()
+                    if nombre.startswith("atenciones/")}
+        if guardar_lote(archivos):
+            self.guardado([nombre for nombre in self.colecciones if nombre.startswith("atenciones/")], archivos)
+            os.replace(self.archivo_atenciones, self.archivo_atenciones + ".migrado")
+            print(f"Atenciones migradas a {len(manifiesto)} particiones mensuales en '{self.carpeta_atenciones}'.")
+
+    def migrar_ids_atenciones(self, tamanio_tanda=100000):
+        """
+        Convierte los IDs de atención del formato anterior (AAAA.MM.DD HH.MM.SS, que no distingue
+        dos atenciones del mismo segundo) al actual agregándoles '.000000-0000' (ver
+        completar_id_atencion). Solo se leen las particiones que tienen IDs anteriores y se guardan,
+        junto con el historial de las mascotas, por tandas de hasta 'tamanio_tanda' atenciones. Si
+        el programa se corta en el medio, las tandas ya guardadas quedan convertidas y el resto se
+        convierte en el próximo inicio.
+
+        Parametros:
+            tamanio_tanda: Cantidad aproximada de atenciones convertidas por cada guardado.
+        """
+        anteriores = [id_atencion for id_atencion in self.indice.fechas if ID_ATENCION_ANTERIOR.match(id_atencion)]
+        if not anteriores:
+            return
+        self.compactar() #Las entradas del diario usan los IDs anteriores
+        meses = sorted({id_atencion[:7] for id_atencion in anteriores})
+        mascotas = self.obtener("mascotas")
+        tanda = []
+        for mes in meses:
+            nombre = "atenciones/" + mes
+            atenciones = self.obtener(nombre)
+            convertidas = {(completar_id_atencion(k) if ID_ATENCION_ANTERIOR.match(k) else k): datos
+                           for k, datos in atenciones.items()}
+            self.colecciones[nombre] = {k: convertidas[k] for k in sorted(convertidas)}
+            self.marcar(nombre)
+            tanda.append(nombre)
+            if sum(len(self.colecciones[n]) for n in tanda) >= tamanio_tanda or mes == meses[-1]:
+                meses_tanda = {n.split("/", 1)[1] for n in tanda}
+                for datos in mascotas.values():
+                    datos["historial"] = [completar_id_atencion(k) if k[:7] in meses_tanda and ID_ATENCION_ANTERIOR.match(k) else k
+                                          for k in datos["historial"]]
+                self.marcar("mascotas")
+                if not self.guardar():
+                    return
+                for n in tanda:
+                    del self.colecciones[n] #Se vuelven a leer si se consultan
+                tanda = []
+        self.verificar_indice()
+        print(f"Se actualizaron {len(anteriores)} IDs de atenciones al formato con fracción de segundo.")
+
+    def marcar(self, nombre, clave=None):
+        """
+        Registra que una colección fue modificada y debe escribirse en el próximo guardado.
+
+        Parametros:
+            nombre: Nombre de la colección modificada.
+            clave: Clave del registro modificado, o None si se modificó toda la colección. Los
+                   archivos se reescriben completos, pero la clave permite conservar este cambio
+                   si otro proceso guardó la colección mientras tanto (ver sincronizar()).
+        """
+        self.modificadas.add(nombre)
+        claves = self.claves_modificadas.setdefault(nombre, set())
+        if nombre in self.colecciones:
+            self.contenido(nombre) #Las colecciones se guardan completas: una modificada se lee entera
+        if clave is None:
+            claves.update(self.colecciones.get(nombre, {}))
+        else:
+            claves.add(clave)
+        self.actualizar_busquedas(nombre, clave)
+
+    def actualizar_busquedas(self, nombre, clave=None):
+        """
+        Mantiene al día los índices de búsqueda ya armados de propietarios y mascotas (ver
+        buscar_propietarios e indice_registros) cuando se modifica un registro: se vuelve a
+        indexar solo ese registro, o se descartan los índices si cambió toda la colección.
+
+        Parametros:
+            nombre: Nombre de la colección modificada.
+            clave: Clave del registro modificado, o None si se modificó toda la colección.
+        """
+        indices = [self.indices_registros.get(nombre), self.textos_propietarios if nombre == "propietarios" else None]
+        indices = [indice for indice in indices if indice is not None]
+        if not indices:
+            return
+        if clave is None:
+            self.descartar_busquedas(nombre)
+            return
+        registros = self.obtener(nombre)
+        for indice in indices:
+            if clave in registros:
+                indice.agregar(clave, registros[clave])
+            else:
+                indice.quitar(clave)
+
+    def descartar_busquedas(self, nombre):
+        """
+        Descarta los índices de búsqueda de una colección que se volvió a leer; se arman de nuevo
+        en la próxima búsqueda.
+
+        Parametros:
+            nombre: 'propietarios' o 'mascotas'.
+        """
+        self.indices_registros.pop(nombre, None)
+        if nombre == "propietarios":
+            self.textos_propietarios = None
+
+    def nuevo_id_mascota(self):
+        """
+        Entrega el próximo ID de mascota de 8 dígitos que no esté usado. Los IDs se toman de un
+        bloque reservado por este proceso (ver reservar_ids_mascota), por lo que casi nunca hace
+        falta leer o escribir el disco, y se saltean los que ya existen (por ejemplo, IDs
+        importados o generados al azar por versiones anteriores).
+
+        Retorno:
+            El ID como texto.
+        """
+        mascotas = self.obtener("mascotas")
+        while True:
+            if self.proximo_id_mascota >= self.limite_id_mascota:
+                self.proximo_id_mascota, self.limite_id_mascota = self.reservar_ids_mascota(self.bloque_ids_mascota)
+            id_masc = str(self.proximo_id_mascota)
+            self.proximo_id_mascota += 1
+            if id_masc not in mascotas:
+                return id_masc
+
+    def reservar_ids_mascota(self, cantidad):
+        """
+        Reserva para este proceso un bloque de IDs de mascota consecutivos, avanzando la secuencia
+        guardada en 'archivo_secuencia' con el bloqueo tomado, así dos procesos nunca reciben el
+        mismo bloque.
+
+        Parametros:
+            cantidad: Cantidad de IDs a reservar.
+
+        Retorno:
+            Una tupla (primero, limite) con el rango reservado [primero, limite).
+        """
+        with self.bloqueo:
+            secuencia = cargar_json(self.archivo_secuencia) if os.path.exists(self.archivo_secuencia) else {}
+            primero = secuencia.get("siguiente", 10000000)
+            limite = min(primero + cantidad, 100000000)
+            if primero >= limite:
+                raise ValueError("No quedan IDs de mascota disponibles.")
+            if not guardar_json(self.archivo_secuencia, {"siguiente": limite}):
+                raise OSError(f"No se pudo guardar la secuencia de IDs en '{self.archivo_secuencia}'.")
+        return primero, limite
+
+    def posiciones_indice(self, nombres):
+        """
+        Prepara los diccionarios donde guardar_lote() anota la posición de cada registro de
+        propietarios y mascotas, para escribir después sus índices '.idx'.
+
+        Parametros:
+            nombres: Nombres de las colecciones a guardar.
+
+        Retorno:
+            Diccionario archivo -> diccionario vacío (vacío si no se usan instantáneas).
+        """
+        if not self.instantaneas:
+            return {}
+        return {self.archivo(nombre): {} for nombre in nombres if nombre in self.archivos}
+
+    def guardado(self, nombres, archivos, posiciones=None):
+        """
+        Registra que las colecciones indicadas se acaban de escribir: anota su nueva versión
+        en disco, olvida sus registros modificados y actualiza sus instantáneas.
+
+        Parametros:
+            nombres: Nombres de las colecciones guardadas.
+            archivos: Diccionario archivo -> datos que se pasó a guardar_lote().
+            posiciones: Diccionario archivo -> posiciones de los registros que completó guardar_lote().
+        """
+        posiciones = posiciones or {}
+        for nombre in nombres:
+            self.versiones[nombre] = version_archivo(self.archivo(nombre))
+            self.claves_modificadas.pop(nombre, None)
+            if self.instantaneas and self.versiones[nombre] is not None:
+                guardar_instantanea(self.archivo(nombre), archivos[self.archivo(nombre)], self.versiones[nombre],
+                                    clase=self.clase(nombre))
+                if self.archivo(nombre) in posiciones:
+                    guardar_instantanea(self.archivo(nombre), posiciones[self.archivo(nombre)], self.versiones[nombre], ".idx")
+                if self.es_particion(nombre) and self.escribir_registros(nombre, archivos[self.archivo(nombre)],
+                                                                        self.versiones[nombre]):
+                    atenciones = archivos[self.archivo(nombre)]
+                    indice = indexar_atenciones(textos_atencion(atenciones[id_atencion]) for id_atencion in sorted(atenciones))
+                    guardar_instantanea(self.archivo(nombre), indice, self.versiones[nombre], ".terminos")
+                    self.textos[nombre] = (self.versiones[nombre], indice, None)
+            if self.es_particion(nombre):
+                for id_atencion in [id_atencion for id_atencion in self.textos_nuevos.documentos
+                                    if self.particion(id_atencion) == nombre]:
+                    self.textos_nuevos.quitar(id_atencion) #Ya está en el índice de la partición
+
+    def guardar(self):
+        """
+        Escribe en disco solamente las colecciones marcadas como modificadas. Si son varias,
+        se guardan juntas como un solo lote para que queden consistentes entre sí.
+
+        Retorno:
+            True si se guardó correctamente, False si hubo un error (las colecciones siguen marcadas).
+        """
+        with self.bloqueo:
+            self.sincronizar()
+            if not self.modificadas:
+                return True
+            archivos = {self.archivo(nombre): self.contenido(nombre) for nombre in sorted(self.modificadas)}
+            posiciones = self.posiciones_indice(self.modificadas)
+            if not guardar_lote(archivos, posiciones=posiciones):
+                return False
+            self.guardado(self.modificadas, archivos, posiciones)
+            self.modificadas.clear()
+            return True
+
+    def hay_cambios(self):
+        """
+        Indica, sin tomar el bloqueo ni leer los archivos, si otro proceso guardó cambios que
+        sincronizar() todavía no incorporó: si el diario se compactó o creció, o si cambió la
+        versión de alguna colección en memoria.
+
+        Retorno:
+            True si hace falta sincronizar, False si los datos en memoria están al día.
+        """
+        version = version_archivo(self.diario)
+        if (version[0] if version else None) != self.inodo_diario or (version is not None and version[2] != self.posicion_diario):
+            return True
+        return any(version_archivo(self.archivo(nombre)) != self.versiones.get(nombre) for nombre in list(self.colecciones))
+
+    def sincronizar(self):
+        """
+        Incorpora los cambios que otros procesos guardaron desde la última lectura. Si cambió el
+        archivo de propietarios o de mascotas se vuelve a leer, conservando los registros que este
+        proceso modificó y no guardó; si se compactó el diario o cambió alguna partición, se
+        descartan las atenciones en memoria (se releen cuando se consultan). Después se aplican
+        las entradas nuevas del diario. Mientras el bloqueo siga tomado no hace falta repetirlo:
+        nadie más puede escribir.
+        """
+        if self.sincronizando or (self.bloqueo.nivel and self.sincronizado == self.bloqueo.tomas):
+            return
+        self.sincronizando = True
+        try:
+            with self.bloqueo:
+                recuperar_lote()
+                version = version_archivo(self.diario)
+                diario_reemplazado = (version[0] if version else None) != self.inodo_diario
+                cambiadas = [nombre for nombre in self.colecciones
+                             if version_archivo(self.archivo(nombre)) != self.versiones.get(nombre)]
+                if diario_reemplazado or cambiadas:
+                    atenciones = diario_reemplazado or any(nombre.startswith("atenciones/") for nombre in cambiadas)
+                    for nombre in cambiadas:
+                        if nombre in self.archivos:
+                            self.versiones[nombre] = version_archivo(self.archivo(nombre))
+                            coleccion = self.colecciones[nombre]
+                            if isinstance(coleccion, ColeccionDiferida) and not coleccion.cargada():
+                                coleccion.reiniciar() #Sin leer todavía: basta con releer del archivo nuevo
+                            else:
+                                combinar_cambios(self.contenido(nombre),
+                                                 cargar_coleccion(self.archivo(nombre), self.instantaneas, self.clase(nombre)),
+                                                 self.claves_modificadas.get(nombre, ()))
+                            self.descartar_busquedas(nombre)
+                    if atenciones:
+                        for nombre in [nombre for nombre in self.colecciones
+                                       if nombre.startswith("atenciones/") and nombre not in self.modificadas]:
+                            del self.colecciones[nombre]
+                        self.pendientes.clear()
+                        self.textos_nuevos = IndiceTextos(CAMPOS_ATENCION)
+                    self.posicion_diario = 0 #Las colecciones releídas no incluyen las entradas del diario
+                    self.entradas_diario = 0
+                    self.reproducir_diario()
+                    if atenciones:
+                        self.verificar_indice()
+                else:
+                    self.reproducir_diario()
+                self.sincronizado = self.bloqueo.tomas
+        finally:
+            self.sincronizando = False
+
+    def agregar_atencion(self, id_atencion, datos):
+        """
+        Registra una atención nueva agregando una sola línea al diario en lugar de reescribir
+        'atenciones.json' y 'mascotas.json'. La línea se escribe y sincroniza con el disco antes
+        de aplicar el cambio en memoria, de modo que una atención informada como registrada
+        sobrevive a un corte del programa. La atención queda en la partición de su mes.
+
+        Parametros:
+            id_atencion: ID de la atención (fecha y hora).
+            datos: Diccionario con los datos de la atención; datos["mascota"] recibe la entrada de historial.
+        """
+        entrada = {"tipo": "atencion", "id": id_atencion, "datos": datos}
+        with self.bloqueo:
+            self.sincronizar()
+            self.escribir_diario(entrada)
+            self.aplicar_entrada(entrada)
+            if self.entradas_diario >= self.limite_diario:
+                self.compactar()
+
+    def agregar_atenciones(self, atenciones):
+        """
+        Registra muchas atenciones juntas (por ejemplo en una importación). No se escribe una
+        línea de diario por atención: se aplican en memoria y se guardan todas en un solo lote,
+        escribiendo una vez cada partición modificada.
+
+        Las atenciones nuevas se indexan todas juntas al final y el historial de cada mascota
+        afectada se toma del índice, en lugar de insertar una por una en listas largas.
+
+        Parametros:
+            atenciones: Lista de pares (id_atencion, datos).
+        """
+        with self.bloqueo:
+            self.sincronizar()
+            nuevas = []
+            for id_atencion, datos in dict(atenciones).items():
+                nueva = not self.existe_atencion(id_atencion)
+                self.aplicar_entrada({"tipo": "atencion", "id": id_atencion, "datos": datos}, indexar=not nueva)
+                if nueva:
+                    nuevas.append((id_atencion, datos["mascota"], datos["propietario"]))
+            self.indice.agregar_varias(nuevas)
+            mascotas = self.obtener("mascotas")
+            for id_masc in {mascota for _, mascota, _ in nuevas}:
+                if id_masc in mascotas:
+                    mascotas[id_masc]["historial"] = self.indice.buscar(mascota=id_masc)
+            self.compactar()
+
+    def existe_atencion(self, id_atencion):
+        """
+        Parametros:
+            id_atencion: ID de la atención.
+
+        Retorno:
+            True si la atención ya está registrada.
+        """
+        return bool(self.indice.buscar(id_atencion, id_atencion))
+
+    def escribir_diario(self, entrada):
+        """
+        Agrega una entrada al final del diario y fuerza su escritura en disco.
+
+        Parametros:
+            entrada: Diccionario con la operación a registrar.
+        """
+        linea = (json.dumps(entrada, ensure_ascii=False, default=a_json) + "\n").encode("utf-8")
+        f = open(self.diario, mode="ab")
+        f.write(linea)
+        f.flush()
+        os.fsync(f.fileno())
+        self.inodo_diario = os.fstat(f.fileno()).st_ino
+        f.close()
+        self.posicion_diario += len(linea)
+
+    def aplicar_entrada(self, entrada, indexar=True):
+        """
+        Aplica en memoria una entrada del diario. Aplicar dos veces la misma entrada no duplica
+        el historial, por lo que es seguro reproducir un diario que ya fue compactado en parte.
+
+        Parametros:
+            entrada: Diccionario leído del diario.
+            indexar: Si es False no se actualizan el índice ni el historial; solo para atenciones
+                     nuevas que después se indexan juntas (ver agregar_atenciones).
+        """
+        if entrada["tipo"] == "atencion":
+            id_atencion = entrada["id"]
+            datos = Atencion.desde_json(entrada["datos"])
+            nombre = self.particion(id_atencion)
+            atenciones = self.obtener(nombre)
+            mascotas = self.obtener("mascotas")
+            agregados = self.obtener(self.AGREGADOS)
+            anterior = atenciones.get(id_atencion)
+            if anterior is not None and anterior["mascota"] != datos["mascota"]:
+                self.indice.quitar(id_atencion, anterior["mascota"], anterior["propietario"])
+                if anterior["mascota"] in mascotas and id_atencion in mascotas[anterior["mascota"]]["historial"]:
+                    mascotas[anterior["mascota"]]["historial"].remove(id_atencion)
+            if anterior is None:
+                mes = nombre.split("/", 1)[1]
+                manifiesto = self.obtener(self.MANIFIESTO)
+                manifiesto.setdefault(mes, {"archivo": mes + ".json", "cantidad": 0})["cantidad"] += 1
+                self.pendientes.add(self.MANIFIESTO)
+                sumar_agregado(agregados, id_atencion, datos)
+            elif anterior != datos:
+                sumar_agregado(agregados, id_atencion, anterior, -1)
+                sumar_agregado(agregados, id_atencion, datos)
+            self.pendientes.add(self.AGREGADOS)
+            atenciones[id_atencion] = datos
+            self.textos_nuevos.agregar(id_atencion, datos)
+            if indexar:
+                self.indice.agregar(id_atencion, datos["mascota"], datos["propietario"])
+                if datos["mascota"] in mascotas:
+                    historial = mascotas[datos["mascota"]]["historial"]
+                    if id_atencion not in historial:
+                        historial.append(id_atencion)
+            self.pendientes.update((nombre, "mascotas"))
+        self.entradas_diario += 1
+
+    def reproducir_diario(self):
+        """
+        Lee el diario desde la última entrada ya aplicada y aplica las siguientes (al cargar, todas).
+        Si la última línea quedó incompleta por un corte durante la escritura, se descarta y se
+        recorta el archivo para que las próximas entradas no queden pegadas a ella.
+        """
+        try:
+            f = open(self.diario, mode="rb")
+        except FileNotFoundError:
+            self.inodo_diario = None
+            self.posicion_diario = 0
+            return
+
+        self.inodo_diario = os.fstat(f.fileno()).st_ino
+        leidos = f.seek(self.posicion_diario)
+        for linea in f:
+            if not linea.endswith(b"\n"): #Linea cortada a mitad de escritura
+                break
+            try:
+                entrada = json.loads(linea)
+            except json.JSONDecodeError:
+                break
+            self.aplicar_entrada(entrada)
+            leidos += len(linea)
+        tamanio = f.seek(0, os.SEEK_END)
+        f.close()
+        self.posicion_diario = leidos
+
+        if leidos < tamanio:
+            print("Se descartó una entrada incompleta del diario de atenciones.")
+            f = open(self.diario, mode="r+b")
+            f.truncate(leidos)
+            f.close()
+
+    def compactar(self):
+        """
+        Vuelca a los archivos JSON las colecciones que tienen cambios solo en el diario y luego
+        vacía el diario. Primero se escriben los archivos (en un solo lote) y recién después se
+        vacía el diario, así un corte entre ambos pasos solo provoca que se reapliquen entradas
+        ya guardadas. Si el guardado falla el diario se conserva.
+
+        El diario vacío reemplaza al anterior como un archivo nuevo, así los otros procesos
+        detectan que fue compactado y releen las atenciones.
+        """
+        with self.bloqueo:
+            self.sincronizar()
+            if not self.pendientes:
+                return
+            nombres = sorted(self.pendientes | self.modificadas)
+            archivos = {}
+            for nombre in nombres:
+                datos = self.contenido(nombre)
+                if self.es_particion(nombre):
+                    datos = {k: datos[k] for k in sorted(datos)} #Las particiones se guardan ordenadas por fecha
+                archivos[self.archivo(nombre)] = datos
+            os.makedirs(self.carpeta_atenciones, exist_ok=True)
+            posiciones = self.posiciones_indice(nombres)
+            if not guardar_lote(archivos, posiciones=posiciones):
+                return
+            self.guardado(nombres, archivos, posiciones)
+            self.modificadas.clear()
+            self.pendientes.clear()
+            f = open(self.diario + ".tmp", mode="w", encoding="utf-8")
+            f.close()
+            os.replace(self.diario + ".tmp", self.diario)
+            sincronizar_directorio(self.diario)
+            self.inodo_diario = version_archivo(self.diario)[0]
+            self.posicion_diario = 0
+            self.entradas_diario = 0
+
+    def iterar_atenciones(self):
+        """
+        Recorre todas las atenciones registradas ordenadas por fecha.
+
+        Retorno:
+            Un generador de pares (id_atencion, datos).
+        """
+        return self.iterar_periodo("")
+
+    def iterar_periodo(self, prefijo):
+        """
+        Recorre las atenciones cuyo ID (fecha y hora) empieza con el prefijo indicado, partición
+        por partición. Las particiones que ya están en memoria se recorren directamente; las demás
+        se leen con iterar_json(), sin cargarlas completas ni conservarlas, por lo que la memoria
+        usada no depende de la cantidad de atenciones.
+
+        Parametros:
+            prefijo: '' para todas, año ('AAAA') o mes ('AAAA.MM') a consultar.
+
+        Retorno:
+            Un generador de pares (id_atencion, datos).
+        """
+        for nombre in self.particiones(prefijo):
+            if nombre in self.colecciones:
+                atenciones = self.colecciones[nombre]
+                pares = ((k, atenciones[k]) for k in sorted(atenciones))
+            else:
+                pares = iterar_json(self.archivo(nombre)) #Las particiones se guardan ordenadas por fecha
+            for k, datos in pares:
+                if k.startswith(prefijo):
+                    yield k, datos
+
+    def fragmentos(self, prefijo=""):
+        """
+        Divide las atenciones de un período en fragmentos que otro proceso puede leer por su
+        cuenta: uno por partición mensual. Las particiones con cambios que todavía no están en
+        disco (solo en el diario) se envían con sus atenciones en memoria.
+
+        Parametros:
+            prefijo: '' para todas, 'AAAA' para un año o 'AAAA.MM' para un mes.
+
+        Retorno:
+            Una lista de pares (fragmento, cantidad_de_atenciones); ver iterar_fragmento().
+        """
+        manifiesto = self.obtener(self.MANIFIESTO)
+        fragmentos = []
+        for nombre in self.particiones(prefijo):
+            if nombre in self.pendientes or nombre in self.modificadas:
+                atenciones = self.colecciones[nombre]
+                pares = [(k, atenciones[k]) for k in sorted(atenciones) if k.startswith(prefijo)]
+                fragmentos.append((("memoria", pares), len(pares)))
+            else:
+                fragmentos.append((("archivo", self.archivo(nombre), prefijo), manifiesto[nombre.split("/", 1)[1]]["cantidad"]))
+        return fragmentos
+
+    def atenciones_periodo(self, prefijo):
+        """
+        Devuelve las atenciones cuyo ID (fecha y hora) empieza con el prefijo indicado.
+        Solo se leen las particiones de los meses incluidos en el período.
+
+        Parametros:
+            prefijo: Año ('AAAA') o mes ('AAAA.MM') a consultar.
+
+        Retorno:
+            Un diccionario id_atencion -> datos ordenado por fecha.
+        """
+        return dict(self.iterar_periodo(prefijo))
+
+    def historial(self, id_masc):
+        """
+        Devuelve las atenciones registradas para una mascota.
+
+        Parametros:
+            id_masc: ID de la mascota.
+
+        Retorno:
+            Una lista de pares (id_atencion, datos) ordenada por fecha.
+        """
+        return list(self.atenciones_entre(mascota=id_masc))
+
+    def atenciones_entre(self, desde="", hasta="", mascota=None, propietario=None):
+        """
+        Recorre las atenciones entre dos fechas, opcionalmente de una mascota o de un propietario,
+        usando los índices. Solo se leen las particiones de los meses que tienen atenciones buscadas.
+
+        Parametros:
+            desde: Prefijo de la primera fecha incluida ('AAAA', 'AAAA.MM' o 'AAAA.MM.DD'); '' sin límite.
+            hasta: Prefijo de la última fecha incluida; '' sin límite.
+            mascota: ID de mascota, o None para no filtrar por mascota.
+            propietario: DNI de propietario, o None para no filtrar por propietario.
+
+        Retorno:
+            Un generador de pares (id_atencion, datos) ordenado por fecha.
+        """
+        for id_atencion in self.indice.buscar(desde, hasta, mascota, propietario):
+            nombre = self.particion(id_atencion)
+            registros = None if nombre in self.colecciones else self.registros_particion(nombre)
+            if registros is not None:
+                datos = registros.obtener(id_atencion)
+                if datos is not None:
+                    yield id_atencion, datos
+                continue
+            atenciones = self.obtener(nombre)
+            if id_atencion in atenciones:
+                yield id_atencion, atenciones[id_atencion]
+
+    def registros_particion(self, nombre):
+        """
+        Devuelve el archivo de registros de una partición guardada, para leer sus atenciones de a
+        una sin cargar el JSON. Si el archivo no existe o es anterior al JSON, se regenera
+        recorriendo el JSON (sin conservarlo en memoria).
+
+        Parametros:
+            nombre: Nombre de la partición, por ejemplo 'atenciones/2023.05'.
+
+        Retorno:
+            El ArchivoRegistros abierto, o None si no se usan (ver 'instantaneas') o no se pudo generar.
+        """
+        if not self.instantaneas:
+            return None
+        version = version_archivo(self.archivo(nombre))
+        registros = self.registros.get(nombre)
+        if registros is not None and registros.version == version:
+            return registros
+        with self.cerrojo: #Un solo hilo abre o regenera el archivo de cada partición
+            registros = self.registros.get(nombre)
+            if registros is not None and registros.version == version:
+                return registros
+            #El archivo anterior no se cierra: otro hilo puede estar leyéndolo. Su mapeo se libera
+            #cuando nadie lo usa.
+            self.registros.pop(nombre, None)
+            if version is None or self.registros_fallidos.get(nombre) == version:
+                return None #No se vuelve a intentar hasta que cambie el JSON
+            ruta = os.path.splitext(self.archivo(nombre))[0] + ".dat"
+            try:
+                registros = ArchivoRegistros(ruta)
+            except (OSError, ValueError):
+                registros = None
+            if registros is not None and registros.version != version:
+                registros.cerrar()
+                registros = None
+            if registros is None:
+                if self.escribir_registros(nombre, iterar_json(self.archivo(nombre)), version):
+                    registros = ArchivoRegistros(ruta)
+                else:
+                    self.registros_fallidos[nombre] = version
+            if registros is not None:
+                self.registros[nombre] = registros
+            return registros
+
+    def escribir_registros(self, nombre, atenciones, version):
+        """
+        Escribe el archivo de registros ('AAAA.MM.dat') de una partición. Si no se puede escribir
+        se ignora: las atenciones se siguen leyendo del JSON.
+
+        Parametros:
+            nombre: Nombre de la partición.
+            atenciones: Diccionario o iterable de pares (id_atencion, datos) de la partición.
+            version: Versión del JSON de la partición con esas atenciones.
+
+        Retorno:
+            True si se escribió, False si no.
+        """
+        if isinstance(atenciones, dict):
+            atenciones = atenciones.items()
+        ruta = os.path.splitext(self.archivo(nombre))[0] + ".dat"
+        try:
+            ArchivoRegistros.escribir(ruta, atenciones, version)
+        except (OSError, KeyError, TypeError, ValueError, struct.error): #ValueError incluye JSONDecodeError
+            if os.path.exists(f"{ruta}.{os.getpid()}.tmp"):
+                os.remove(f"{ruta}.{os.getpid()}.tmp")
+            return False
+        return True
+
+    def textos_particion(self, nombre):
+        """
+        Devuelve el índice de textos de una partición guardada (ver busqueda.indexar_atenciones).
+        Se lee de su archivo '.terminos' si está al día con el JSON; si no, se arma recorriendo el
+        archivo de registros (o el JSON) y se guarda para las próximas búsquedas.
+
+        Parametros:
+            nombre: Nombre de la partición, por ejemplo 'atenciones/2023.05'.
+
+        Retorno:
+            Diccionario término -> números de atención, o None si la partición no está guardada.
+        """
+        version = version_archivo(self.archivo(nombre))
+        if version is None:
+            return None
+        guardado = self.textos.get(nombre)
+        if guardado is not None and guardado[0] == version:
+            return guardado[1]
+        with self.cerrojo:
+            guardado = self.textos.get(nombre)
+            if guardado is not None and guardado[0] == version: #Lo armó otro hilo mientras se esperaba el cerrojo
+                return guardado[1]
+            registros = self.registros_particion(nombre)
+            ids = None
+            indice = cargar_instantanea(self.archivo(nombre), version, ".terminos") if registros is not None else None
+            if indice is None and registros is not None:
+                indice = indexar_atenciones(registros.textos(CAMPOS_ATENCION))
+                guardar_instantanea(self.archivo(nombre), indice, version, ".terminos")
+            elif indice is None: #Sin archivo de registros: los números se traducen a IDs con la lista ordenada
+                atenciones = sorted(iterar_json(self.archivo(nombre)))
+                ids = [id_atencion for id_atencion, _ in atenciones]
+                indice = indexar_atenciones(textos_atencion(datos) for _, datos in atenciones)
+            self.textos[nombre] = (version, indice, ids)
+            return indice
+
+    def atencion_numero(self, nombre, numero):
+        """
+        Parametros:
+            nombre: Nombre de una partición con su índice de textos ya leído (ver textos_particion).
+            numero: Número de atención dentro de la partición (su posición en el orden por ID).
+
+        Retorno:
+            Un par (id_atencion, datos); datos es None si no hay archivo de registros para leerlos.
+        """
+        ids = self.textos[nombre][2]
+        if ids is not None:
+            return ids[numero], None
+        return self.registros_particion(nombre).leer(numero)
+
+    def buscar_atenciones(self, consulta, limite=20):
+        """
+        Busca atenciones por las palabras de su motivo, diagnóstico o tratamiento (ver busqueda).
+        Se usa el índice de textos de cada partición guardada y, para las atenciones del diario,
+        el que se actualiza al registrarlas, así no se recorren las atenciones. Las particiones se
+        recorren de la más nueva a la más vieja y se deja de recorrer cuando ya hay 'limite'
+        atenciones con todas las palabras buscadas: las más viejas no pueden superarlas.
+
+        Parametros:
+            consulta: Texto a buscar.
+            limite: Cantidad máxima de resultados.
+
+        Retorno:
+            Una lista de pares (id_atencion, datos) ordenada por relevancia (a igual relevancia,
+            primero las más recientes).
+        """
+        indices = {}
+        for mes in self.obtener(self.MANIFIESTO):
+            indice = self.textos_particion("atenciones/" + mes)
+            if indice is not None:
+                indices["atenciones/" + mes] = indice
+        nuevos = self.textos_nuevos
+        total = self.indice.cantidad()
+        pesos = {}
+        for termino in terminos(consulta):
+            frecuencia = nuevos.frecuencia(termino) + sum(len(indice.get(termino, ())) for indice in indices.values())
+            pesos[termino] = peso(total, frecuencia)
+        maximo = sum(pesos.values())
+        candidatos = [(puntaje, id_atencion, None) for id_atencion, puntaje in nuevos.puntajes(pesos).items()]
+        nuevos_particion = {}
+        for id_atencion in nuevos.documentos:
+            nombre = self.particion(id_atencion)
+            nuevos_particion[nombre] = nuevos_particion.get(nombre, 0) + 1
+        for nombre in sorted(indices, reverse=True):
+            completos = sum(1 for puntaje, id_atencion, _ in candidatos
+                            if puntaje >= maximo and self.particion(id_atencion) > nombre)
+            if completos >= limite:
+                break
+            puntajes = {}
+            for termino, valor in pesos.items():
+                for numero in indices[nombre].get(termino, ()):
+                    puntajes[numero] = puntajes.get(numero, 0.0) + valor
+            #Las del diario ya están entre los candidatos: se toman de más para poder descartarlas
+            mejores = heapq.nlargest(limite + nuevos_particion.get(nombre, 0), puntajes,
+                                     key=lambda numero: (puntajes[numero], numero))
+            for numero in mejores:
+                id_atencion, datos = self.atencion_numero(nombre, numero)
+                if id_atencion not in nuevos.documentos:
+                    candidatos.append((puntajes[numero], id_atencion, datos))
+        resultado = []
+        for _, id_atencion, datos in heapq.nlargest(limite, candidatos, key=operator.itemgetter(0, 1)):
+            nombre = self.particion(id_atencion)
+            if datos is None or nombre in self.colecciones:
+                datos = self.obtener(nombre).get(id_atencion, datos)
+            if datos is not None:
+                resultado.append((id_atencion, datos))
+        return resultado
+
+    def buscar_propietarios(self, consulta, limite=20):
+        """
+        Busca propietarios por las palabras de su nombre o dirección (ver busqueda). El índice se
+        arma en la primera búsqueda y después se actualiza con cada propietario modificado.
+
+        Parametros:
+            consulta: Texto a buscar.
+            limite: Cantidad máxima de resultados.
+
+        Retorno:
+            Una lista de pares (dni, datos) ordenada por relevancia.
+        """
+        propietarios = self.obtener("propietarios")
+        indice = self.textos_propietarios
+        if indice is None:
+            with self.cerrojo:
+                if self.textos_propietarios is None: #Se arma completo antes de dejarlo a la vista de otros hilos
+                    indice = IndiceTextos(CAMPOS_PROPIETARIO)
+                    for dni, datos in propietarios.items():
+                        indice.agregar(dni, datos)
+                    self.textos_propietarios = indice
+                indice = self.textos_propietarios
+        return [(dni, propietarios[dni]) for dni in indice.buscar(consulta, limite)]
+
+    def indice_registros(self, nombre):
+        """
+        Devuelve los índices para encontrar propietarios (por nombre, email o teléfono) o mascotas
+        (por nombre) sin recorrer la colección. Se arman la primera vez que se usan y después se
+        actualizan con cada registro modificado (ver marcar).
+
+        Parametros:
+            nombre: 'propietarios' o 'mascotas'.
+
+        Retorno:
+            El IndiceRegistros de la colección.
+        """
+        indice = self.indices_registros.get(nombre)
+        if indice is None:
+            with self.cerrojo:
+                if nombre not in self.indices_registros: #Otro hilo pudo armarlo mientras se esperaba el cerrojo
+                    indice = IndiceRegistros(CAMPOS_CONTACTO if nombre == "propietarios" else None)
+                    with PausaRecolector():
+                        indice.cargar(self.obtener(nombre).items())
+                    self.indices_registros[nombre] = indice
+                indice = self.indices_registros[nombre]
+        return indice
+
+    def buscar_por_nombre(self, nombre, texto, limite=10):
+        """
+        Parametros:
+            nombre: 'propietarios' o 'mascotas'.
+            texto: Comienzo de las palabras del nombre (ver IndiceRegistros.buscar_nombre).
+            limite: Cantidad máxima de resultados.
+
+        Retorno:
+            Una lista de pares (clave, datos) en orden alfabético.
+        """
+        registros = self.obtener(nombre)
+        return [(clave, registros[clave]) for clave in self.indice_registros(nombre).buscar_nombre(texto, limite)]
+
+    def buscar_por_contacto(self, tipo, valor):
+        """
+        Parametros:
+            tipo: 'email' o 'telefono' (principal o de emergencia).
+            valor: Email o teléfono completo.
+
+        Retorno:
+            Una lista de pares (dni, datos) de los propietarios con ese email o teléfono.
+        """
+        propietarios = self.obtener("propietarios")
+        return [(dni, propietarios[dni]) for dni in self.indice_registros("propietarios").buscar_valor(tipo, valor)]
+
+    def verificar_indice(self):
+        """
+        Arma los índices a partir del historial de cada mascota (que ya está en memoria) y del
+        propietario de la mascota, sin leer las particiones. Si la cantidad de atenciones indexadas
+        no coincide con la del manifiesto, el historial no está al día y se reconstruye.
+        """
+        self.indice.cargar((id_atencion, id_masc, datos["propietario"])
+                           for id_masc, datos in self.obtener("mascotas").items()
+                           for id_atencion in datos["historial"])
+        esperadas = sum(datos["cantidad"] for datos in self.obtener(self.MANIFIESTO).values())
+        if self.indice.cantidad() != esperadas:
+            self.reconstruir_indice()
+
+    def reconstruir_indice(self):
+        """
+        Vuelve a armar los índices recorriendo todas las atenciones y corrige el historial de las
+        mascotas para que contenga exactamente sus atenciones registradas.
+        """
+        mascotas = self.obtener("mascotas")
+        self.indice.cargar((id_atencion, datos["mascota"], datos["propietario"])
+                           for id_atencion, datos in self.iterar_atenciones())
+        for id_masc, datos in mascotas.items():
+            datos["historial"] = self.indice.buscar(mascota=id_masc)
+        self.marcar("mascotas")
+        self.guardar()
+        print("Se reconstruyó el índice de atenciones y el historial de las mascotas.")
+
+    def verificar_agregados(self):
+        """
+        Comprueba que los totales guardados coincidan, mes por mes, con la cantidad de atenciones
+        del manifiesto. Si falta el archivo de agregados o no coincide, lo reconstruye.
+        """
+        manifiesto = self.obtener(self.MANIFIESTO)
+        agregados = self.obtener(self.AGREGADOS)
+        cantidades = {mes: sum(t["cantidad"] for t in totales.values()) for mes, totales in agregados.items()}
+        esperadas = {mes: datos["cantidad"] for mes, datos in manifiesto.items() if datos["cantidad"]}
+        if cantidades != esperadas:
+            self.reconstruir_agregados()
+
+    def reconstruir_agregados(self):
+        """
+        Vuelve a calcular los totales por mes y mascota recorriendo todas las atenciones y los guarda.
+        Cada mes se pasa a columnas y se suma por separado; con muchas atenciones, los meses se
+        reparten entre varios procesos (ver procesar_fragmentos).
+        """
+        agregados = {}
+        for parcial in procesar_fragmentos(agregados_fragmento, self.fragmentos()):
+            agregados.update(parcial) #Cada fragmento es un mes distinto: los parciales no se superponen
+        self.colecciones[self.AGREGADOS] = {mes: agregados[mes] for mes in sorted(agregados)}
+        self.marcar(self.AGREGADOS)
+        os.makedirs(self.carpeta_atenciones, exist_ok=True)
+        self.guardar()
+
+    def resumen_anual(self, anio, propietario=None):
+        """
+        Devuelve los totales de atenciones por mascota y mes de un año, tomados de los agregados
+        mensuales (sin recorrer las atenciones).
+
+        Parametros:
+            anio: Año a consultar ('AAAA').
+            propietario: DNI para limitar el resumen a las mascotas de un propietario, o None para todas.
+
+        Retorno:
+            Un diccionario id_mascota -> {mes: totales} con los meses como enteros 1 a 12, donde
+            totales es un diccionario con 'propietario', 'cantidad', 'costo', 'costo_veterinario'
+            y 'costo_medicamentos'. Solo aparecen las mascotas y meses con atenciones.
+        """
+        agregados = self.obtener(self.AGREGADOS)
+        resumen = {}
+        for mes in range(1, 13):
+            for id_masc, totales in agregados.get(f"{anio}.{mes:02d}", {}).items():
+                if propietario is None or totales["propietario"] == propietario:
+                    resumen.setdefault(id_masc, {})[mes] = totales
+        return resumen
+
+    def meses_con_atenciones(self):
+        """
+        Retorno:
+            Una lista ordenada de los meses ('AAAA.MM') que tienen atenciones registradas.
+        """
+        return [mes for mes, totales in sorted(self.obtener(self.AGREGADOS).items()) if totales]
+
+def sumar_agregado(agregados, id_atencion, datos, signo=1):
+    """
+    Suma (o resta, con signo=-1) una atención a los totales mensuales por mascota.
+
+    Parametros:
+        agregados: Diccionario 'AAAA.MM' -> {id_mascota: totales} a actualizar.
+        id_atencion: ID de la atención (empieza con 'AAAA.MM').
+        datos: Diccionario con los datos de la atención.
+        signo: 1 para sumar la atención, -1 para quitarla.
+    """
+    mes = agregados.setdefault(id_atencion[:7], {})
+    totales = mes.setdefault(datos["mascota"], {
+        "propietario": datos["propietario"],
+        "cantidad": 0,
+        "costo": 0.0,
+        "costo_veterinario": 0.0,
+        "costo_medicamentos": 0.0
+    })
+    totales["cantidad"] += signo
+    for campo in ("costo", "costo_veterinario", "costo_medicamentos"):
+        totales[campo] += signo * datos[campo]
+    if totales["cantidad"] == 0:
+        del mes[datos["mascota"]]
+        if not mes:
+            del agregados[id_atencion[:7]]
+
+class AlmacenSQLite(Almacen):
+    """
+    Almacén alternativo que guarda los datos en una base SQLite local en lugar de los tres
+    archivos JSON. Propietarios y mascotas se mantienen en memoria como en el almacén JSON,
+    pero se guardan registro por registro; las atenciones quedan solo en la base y los informes
+    se resuelven con consultas sobre los índices por mascota, propietario y fecha. Los totales
+    mensuales por mascota se mantienen en la tabla 'agregados', actualizada junto con cada atención.
+    """
+
+    ESQUEMA = """
+        CREATE TABLE IF NOT EXISTS propietarios (
+            dni TEXT PRIMARY KEY,
+            activo INTEGER NOT NULL,
+            nombre TEXT NOT NULL,
+            direccion TEXT NOT NULL,
+            email TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS telefonos (
+            propietario TEXT NOT NULL REFERENCES propietarios (dni),
+            tipo TEXT NOT NULL,
+            numero TEXT NOT NULL,
+            PRIMARY KEY (propietario, tipo)
+        );
+        CREATE TABLE IF NOT EXISTS mascotas (
+            id TEXT PRIMARY KEY,
+            activo INTEGER NOT NULL,
+            nombre TEXT NOT NULL,
+            sexo TEXT NOT NULL,
+            especie TEXT NOT NULL,
+            raza TEXT NOT NULL,
+            edad INTEGER NOT NULL,
+            peso REAL NOT NULL,
+            propietario TEXT NOT NULL REFERENCES propietarios (dni)
+        );
+        CREATE TABLE IF NOT EXISTS atenciones (
+            id TEXT PRIMARY KEY,
+            fecha TEXT NOT NULL,
+            mascota TEXT NOT NULL REFERENCES mascotas (id),
+            propietario TEXT NOT NULL REFERENCES propietarios (dni),
+            motivo TEXT NOT NULL,
+            diagnostico TEXT NOT NULL,
+            tratamiento TEXT NOT NULL,
+            costo_veterinario REAL NOT NULL,
+            costo_medicamentos REAL NOT NULL,
+            costo REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS agregados (
+            mes TEXT NOT NULL,
+            mascota TEXT NOT NULL,
+            propietario TEXT NOT NULL,
+            cantidad INTEGER NOT NULL,
+            costo REAL NOT NULL,
+            costo_veterinario REAL NOT NULL,
+            costo_medicamentos REAL NOT NULL,
+            PRIMARY KEY (mes, mascota)
+        );
+        CREATE TABLE IF NOT EXISTS secuencias (
+            nombre TEXT PRIMARY KEY,
+            siguiente INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS atenciones_mascota ON atenciones (mascota, fecha);
+        CREATE INDEX IF NOT EXISTS atenciones_propietario ON atenciones (propietario, fecha);
+        CREATE INDEX IF NOT EXISTS atenciones_fecha ON atenciones (fecha);
+        CREATE INDEX IF NOT EXISTS mascotas_propietario ON mascotas (propietario);
+    """
+
+    #Búsqueda por palabras en los textos de las atenciones: tabla FTS5 que toma los textos de la tabla
+    #'atenciones' (no los repite) y disparadores que la actualizan con cada alta, cambio o baja
+    ESQUEMA_TEXTOS = """
+        CREATE VIRTUAL TABLE IF NOT EXISTS atenciones_textos USING fts5 (
+            motivo, diagnostico, tratamiento,
+            content = 'atenciones', tokenize = 'unicode61 remove_diacritics 2'
+        );
+        CREATE TRIGGER IF NOT EXISTS atenciones_textos_alta AFTER INSERT ON atenciones BEGIN
+            INSERT INTO atenciones_textos (rowid, motivo, diagnostico, tratamiento)
+            VALUES (new.rowid, new.motivo, new.diagnostico, new.tratamiento);
+        END;
+        CREATE TRIGGER IF NOT EXISTS atenciones_textos_baja AFTER DELETE ON atenciones BEGIN
+            INSERT INTO atenciones_textos (atenciones_textos, rowid, motivo, diagnostico, tratamiento)
+            VALUES ('delete', old.rowid, old.motivo, old.diagnostico, old.tratamiento);
+        END;
+        CREATE TRIGGER IF NOT EXISTS atenciones_textos_cambio AFTER UPDATE ON atenciones BEGIN
+            INSERT INTO atenciones_textos (atenciones_textos, rowid, motivo, diagnostico, tratamiento)
+            VALUES ('delete', old.rowid, old.motivo, old.diagnostico, old.tratamiento);
+            INSERT INTO atenciones_textos (rowid, motivo, diagnostico, tratamiento)
+            VALUES (new.rowid, new.motivo, new.diagnostico, new.tratamiento);
+        END;
+    """
+
+    COLUMNAS_ATENCION = ("mascota", "propietario", "motivo", "diagnostico", "tratamiento",
+                         "costo_veterinario", "costo_medicamentos", "costo")
+
+    def __init__(self, ruta="veterinaria.db"):
+        """
+        Parametros:
+            ruta: Archivo de la base de datos SQLite.
+        """
+        super().__init__()
+        self.ruta = ruta
+        self.conexion = None
+        self.claves_modificadas = {"propietarios": set(), "mascotas": set()}
+        self.version_datos = None
+        self.busqueda_textos = False #Si la base tiene la tabla de búsqueda de textos (ver crear_indice_textos)
+
+    def cargar(self):
+        """
+        Abre la base (creando las tablas si hace falta) y carga propietarios y mascotas en memoria.
+        La primera vez que se crea la base se migran a ella los datos de los archivos JSON.
+        """
+        if self.conexion is not None:
+            return
+        import sqlite3
+
+        nueva = not os.path.exists(self.ruta)
+        self.conexion = sqlite3.connect(self.ruta, check_same_thread=False) #El servidor HTTP la usa desde varios hilos, con su propio bloqueo
+        self.conexion.executescript(self.ESQUEMA)
+        if nueva:
+            migrar_json_a_sqlite(self.conexion)
+        self.verificar_agregados()
+        self.migrar_ids_atenciones()
+        self.crear_indice_textos()
+        self.obtener("propietarios")
+        self.obtener("mascotas")
+        self.version_datos = self.conexion.execute("PRAGMA data_version").fetchone()[0]
+
+    def migrar_ids_atenciones(self):
+        """
+        Convierte los IDs de atención del formato anterior (AAAA.MM.DD HH.MM.SS) al actual
+        agregándoles '.000000-0000', en una sola transacción. La base queda marcada con
+        PRAGMA user_version = 1 para no volver a revisarla en cada inicio.
+        """
+        if self.conexion.execute("PRAGMA user_version").fetchone()[0] >= 1:
+            return
+        with self.conexion:
+            cantidad = self.conexion.execute(
+                "UPDATE atenciones SET id = id || '.000000-0000' WHERE length(id) = 19").rowcount
+            self.conexion.execute("PRAGMA user_version = 1")
+        if cantidad:
+            print(f"Se actualizaron {cantidad} IDs de atenciones al formato con fracción de segundo.")
+
+    def crear_indice_textos(self):
+        """
+        Crea la tabla de búsqueda de textos de las atenciones (ver ESQUEMA_TEXTOS). Si la base ya
+        tenía atenciones, la tabla se llena con ellas una sola vez y la base queda marcada con
+        PRAGMA user_version = 2. Si SQLite no incluye FTS5, la búsqueda queda desactivada.
+        """
+        import sqlite3
+
+        try:
+            self.conexion.executescript(self.ESQUEMA_TEXTOS)
+        except sqlite3.OperationalError: #SQLite compilado sin FTS5
+            return
+        self.busqueda_textos = True
+        if self.conexion.execute("PRAGMA user_version").fetchone()[0] >= 2:
+            return
+        with self.conexion:
+            self.conexion.execute("INSERT INTO atenciones_textos (atenciones_textos) VALUES ('rebuild')")
+            self.conexion.execute("PRAGMA user_version = 2")
+
+    def hay_cambios(self):
+        """
+        Indica si otro proceso modificó la base desde la última lectura (ver sincronizar).
+
+        Retorno:
+            True si hace falta sincronizar, False si los datos en memoria están al día.
+        """
+        return self.conexion is not None and self.conexion.execute("PRAGMA data_version").fetchone()[0] != self.version_datos
+
+    def sincronizar(self):
+        """
+        Vuelve a leer propietarios y mascotas si otro proceso modificó la base desde la última
+        lectura (PRAGMA data_version cambia con cada transacción de otra conexión), conservando
+        los registros modificados en memoria que todavía no se guardaron. Las atenciones ya se
+        consultan directamente en la base.
+        """
+        if self.conexion is None:
+            return
+        version = self.conexion.execute("PRAGMA data_version").fetchone()[0]
+        if version == self.version_datos:
+            return
+        self.version_datos = version
+        for nombre in ("propietarios", "mascotas"):
+            if nombre in self.colecciones:
+                actuales = self.colecciones.pop(nombre)
+                combinar_cambios(actuales, self.obtener(nombre), self.claves_modificadas[nombre])
+                self.colecciones[nombre] = actuales
+            self.descartar_busquedas(nombre)
+
+    def obtener(self, nombre):
+        """
+        Devuelve propietarios o mascotas con el mismo formato que los archivos JSON. Las mascotas
+        no incluyen 'historial': se obtiene con historial(), consultando el índice por mascota.
+
+        Parametros:
+            nombre: 'propietarios' o 'mascotas'.
+
+        Retorno:
+            El diccionario en memoria de la colección.
+        """
+        if self.conexion is None:
+            self.cargar()
+        if nombre in self.colecciones:
+            return self.colecciones[nombre]
+
+        if nombre == "propietarios":
+            telefonos = {}
+            for dni, tipo, numero in self.conexion.execute("SELECT propietario, tipo, numero FROM telefonos"):
+                telefonos.setdefault(dni, {})[tipo] = numero
+            datos = {}
+            for dni, activo, nombre_prop, direccion, email in self.conexion.execute(
+                    "SELECT dni, activo, nombre, direccion, email FROM propietarios"):
+                datos[dni] = Propietario(bool(activo), nombre_prop, direccion, email,
+                                         Telefonos.desde_json(telefonos.get(dni, {})))
+        elif nombre == "mascotas":
+            datos = {}
+            for fila in self.conexion.execute(
+                    "SELECT id, activo, nombre, sexo, especie, raza, edad, peso, propietario FROM mascotas"):
+                datos[fila[0]] = Mascota(bool(fila[1]), *fila[2:9], ...) #Sin historial: se consulta con historial()
+        else:
+            raise KeyError(f"El almacén SQLite no mantiene '{nombre}' en memoria; use iterar_atenciones().")
+        self.colecciones[nombre] = datos
+        return datos
+
+    def marcar(self, nombre, clave=None):
+        """
+        Registra un registro modificado. Sin clave se guardan todos los registros de la colección.
+
+        Parametros:
+            nombre: 'propietarios' o 'mascotas'.
+            clave: DNI o ID del registro modificado.
+        """
+        if clave is None:
+            self.claves_modificadas[nombre].update(self.obtener(nombre))
+        else:
+            self.claves_modificadas[nombre].add(clave)
+        self.actualizar_busquedas(nombre, clave)
+
+    def guardar(self):
+        """
+        Guarda en una sola transacción solamente los registros marcados como modificados.
+
+        Retorno:
+            True si se guardó correctamente, False si hubo un error.
+        """
+        import sqlite3
+
+        try:
+            with self.conexion:
+                for dni in self.claves_modificadas["propietarios"]:
+                    guardar_propietario_sqlite(self.conexion, dni, self.colecciones["propietarios"][dni])
+                for id_masc in self.claves_modificadas["mascotas"]:
+                    guardar_mascota_sqlite(self.conexion, id_masc, self.colecciones["mascotas"][id_masc])
+        except sqlite3.Error as error:
+            print("Error al guardar en la base de datos:", error)
+            return False
+        for claves in self.claves_modificadas.values():
+            claves.clear()
+        return True
+
+    def agregar_atencion(self, id_atencion, datos):
+        """
+        Inserta una atención nueva en su propia transacción.
+
+        Parametros:
+            id_atencion: ID de la atención (fecha y hora).
+            datos: Diccionario con los datos de la atención.
+        """
+        with self.conexion:
+            guardar_atencion_sqlite(self.conexion, id_atencion, datos)
+
+    def agregar_atenciones(self, atenciones):
+        """
+        Inserta muchas atenciones en una sola transacción.
+
+        Parametros:
+            atenciones: Lista de pares (id_atencion, datos).
+        """
+        with self.conexion:
+            for id_atencion, datos in atenciones:
+                guardar_atencion_sqlite(self.conexion, id_atencion, datos)
+
+    def existe_atencion(self, id_atencion):
+        """
+        Busca la atención por su clave en la tabla de atenciones.
+        """
+        return self.conexion.execute("SELECT 1 FROM atenciones WHERE id = ?", (id_atencion,)).fetchone() is not None
+
+    def reservar_ids_mascota(self, cantidad):
+        """
+        Reserva un bloque de IDs de mascota avanzando la secuencia 'mascotas' de la tabla
+        'secuencias' en una sola transacción (SQLite no deja que otro proceso escriba en el medio).
+
+        Parametros:
+            cantidad: Cantidad de IDs a reservar.
+
+        Retorno:
+            Una tupla (primero, limite) con el rango reservado [primero, limite).
+        """
+        with self.conexion:
+            self.conexion.execute("INSERT OR IGNORE INTO secuencias (nombre, siguiente) VALUES ('mascotas', 10000000)")
+            primero = self.conexion.execute("SELECT siguiente FROM secuencias WHERE nombre = 'mascotas'").fetchone()[0]
+            limite = min(primero + cantidad, 100000000)
+            if primero >= limite:
+                raise ValueError("No quedan IDs de mascota disponibles.")
+            self.conexion.execute("UPDATE secuencias SET siguiente = ? WHERE nombre = 'mascotas'", (limite,))
+        return primero, limite
+
+    def compactar(self):
+        """
+        En SQLite cada cambio ya queda guardado en la base, no hay diario que compactar.
+        """
+        return
+
+    def consultar_atenciones(self, condicion, parametros):
+        """
+        Ejecuta una consulta sobre la tabla de atenciones ordenada por fecha.
+
+        Parametros:
+            condicion: Cláusula WHERE (sin la palabra WHERE).
+            parametros: Valores para los '?' de la condición.
+
+        Retorno:
+            Un generador de pares (id_atencion, datos).
+        """
+        consulta = f"SELECT id, {', '.join(self.COLUMNAS_ATENCION)} FROM atenciones WHERE {condicion} ORDER BY fecha"
+        for fila in self.conexion.execute(consulta, parametros):
+            yield fila[0], Atencion(*fila[1:])
+
+    def buscar_atenciones(self, consulta, limite=20):
+        """
+        Busca atenciones por las palabras de su motivo, diagnóstico o tratamiento con la tabla
+        FTS5, ordenadas por relevancia (bm25).
+
+        Parametros:
+            consulta: Texto a buscar.
+            limite: Cantidad máxima de resultados.
+
+        Retorno:
+            Una lista de pares (id_atencion, datos) ordenada por relevancia (a igual relevancia,
+            primero las más recientes).
+        """
+        if not self.busqueda_textos:
+            raise ValueError("La versión de SQLite instalada no permite buscar por texto (falta FTS5).")
+        palabras = terminos(consulta)
+        if not palabras:
+            return []
+        columnas = ", ".join("a." + columna for columna in self.COLUMNAS_ATENCION)
+        filas = self.conexion.execute(
+            f"SELECT a.id, {columnas} FROM atenciones_textos JOIN atenciones a ON a.rowid = atenciones_textos.rowid "
+            "WHERE atenciones_textos MATCH ? ORDER BY bm25(atenciones_textos), a.id DESC LIMIT ?",
+            (" OR ".join(f'"{palabra}"' for palabra in palabras), limite))
+        return [(fila[0], Atencion(*fila[1:])) for fila in filas]
+
+    def iterar_atenciones(self):
+        """
+        Recorre todas las atenciones de la base ordenadas por fecha.
+        """
+        return self.consultar_atenciones("1 = 1", ())
+
+    def iterar_periodo(self, prefijo):
+        """
+        Recorre las atenciones de un año o mes usando el índice por fecha.
+        """
+        if not prefijo:
+            return self.iterar_atenciones()
+        return self.consultar_atenciones("fecha >= ? AND fecha < ?", rango_prefijo(prefijo))
+
+    def historial(self, id_masc):
+        """
+        Devuelve las atenciones de una mascota usando el índice por mascota.
+        """
+        return list(self.consultar_atenciones("mascota = ?", (id_masc,)))
+
+    def atenciones_entre(self, desde="", hasta="", mascota=None, propietario=None):
+        """
+        Recorre las atenciones entre dos fechas, de una mascota o de un propietario, usando
+        los índices de la tabla de atenciones.
+        """
+        condiciones = []
+        parametros = ()
+        if mascota is not None:
+            condiciones.append("mascota = ?")
+            parametros += (mascota,)
+        if propietario is not None:
+            condiciones.append("propietario = ?")
+            parametros += (propietario,)
+        if desde:
+            condiciones.append("fecha >= ?")
+            parametros += (desde,)
+        if hasta:
+            condiciones.append("fecha < ?")
+            parametros += (rango_prefijo(hasta)[1],)
+        return self.consultar_atenciones(" AND ".join(condiciones) or "1 = 1", parametros)
+
+    def verificar_agregados(self):
+        """
+        Reconstruye la tabla de agregados si su total no coincide con la cantidad de atenciones.
+        """
+        atenciones = self.conexion.execute("SELECT COUNT(*) FROM atenciones").fetchone()[0]
+        agregadas = self.conexion.execute("SELECT COALESCE(SUM(cantidad), 0) FROM agregados").fetchone()[0]
+        if atenciones != agregadas:
+            self.reconstruir_agregados()
+
+    def reconstruir_agregados(self):
+        """
+        Vuelve a calcular la tabla de agregados agrupando todas las atenciones.
+        """
+        with self.conexion:
+            self.conexion.execute("DELETE FROM agregados")
+            self.conexion.execute("""
+                INSERT INTO agregados (mes, mascota, propietario, cantidad, costo, costo_veterinario, costo_medicamentos)
+                SELECT substr(fecha, 1, 7), mascota, MAX(propietario), COUNT(*),
+                       SUM(costo), SUM(costo_veterinario), SUM(costo_medicamentos)
+                FROM atenciones
+                GROUP BY substr(fecha, 1, 7), mascota
+            """)
+
+    def resumen_anual(self, anio, propietario=None):
+        """
+        Devuelve los totales por mascota y mes de un año leyendo la tabla de agregados.
+        """
+        consulta = """
+            SELECT mascota, CAST(substr(mes, 6, 2) AS INTEGER), propietario, cantidad,
+                   costo, costo_veterinario, costo_medicamentos
+            FROM agregados
+            WHERE mes >= ? AND mes < ?
+        """
+        parametros = rango_prefijo(anio)
+        if propietario is not None:
+            consulta += " AND propietario = ?"
+            parametros += (propietario,)
+        resumen = {}
+        for fila in self.conexion.execute(consulta, parametros):
+            resumen.setdefault(fila[0], {})[fila[1]] = {
+                "propietario": fila[2],
+                "cantidad": fila[3],
+                "costo": fila[4],
+                "costo_veterinario": fila[5],
+                "costo_medicamentos": fila[6]
+            }
+        return resumen
+
+    def meses_con_atenciones(self):
+        """
+        Retorno:
+            Una lista ordenada de los meses ('AAAA.MM') que tienen atenciones registradas.
+        """
+        return [fila[0] for fila in self.conexion.execute("SELECT DISTINCT mes FROM agregados ORDER BY mes")]
+
+    def fragmentos(self, prefijo=""):
+        """
+        Divide las atenciones de un período en un rango de fechas por mes, que otro proceso lee
+        con su propia conexión a la base.
+
+        Parametros:
+            prefijo: '' para todas, 'AAAA' para un año o 'AAAA.MM' para un mes.
+
+        Retorno:
+            Una lista de pares (fragmento, cantidad_de_atenciones); ver iterar_fragmento().
+        """
+        fragmentos = []
+        for mes, cantidad in self.conexion.execute(
+                "SELECT mes, SUM(cantidad) FROM agregados WHERE mes >= ? AND mes < ? GROUP BY mes ORDER BY mes",
+                rango_prefijo(prefijo[:7]) if prefijo else ("", "\uffff")):
+            desde, hasta = rango_prefijo(prefijo if len(prefijo) > 7 else mes)
+            fragmentos.append((("sqlite", self.ruta, desde, hasta), cantidad))
+        return fragmentos
+
+def rango_prefijo(prefijo):
+    """
+    Convierte un prefijo de fecha en el rango [desde, hasta) que cubre todos los IDs que empiezan
+    con él, para poder consultarlo con el índice por fecha.
+
+    Parametros:
+        prefijo: Prefijo de fecha, por ejemplo '2023' o '2023.05'.
+
+    Retorno:
+        Una tupla (desde, hasta).
+    """
+    return prefijo, prefijo[:-1] + chr(ord(prefijo[-1]) + 1)
+
+def guardar_propietario_sqlite(conexion, dni, datos):
+    """
+    Inserta o reemplaza un propietario y sus teléfonos en la base.
+
+    Parametros:
+        conexion: Conexión SQLite abierta.
+        dni: DNI del propietario.
+        datos: Diccionario del propietario con el formato de 'propietarios.json'.
+    """
+    conexion.execute(
+        "INSERT OR REPLACE INTO propietarios (dni, activo, nombre, direccion, email) VALUES (?, ?, ?, ?, ?)",
+        (dni, datos["activo"], datos["nombre"], datos["direccion"], datos["email"]))
+    conexion.execute("DELETE FROM telefonos WHERE propietario = ?", (dni,))
+    conexion.executemany(
+        "INSERT INTO telefonos (propietario, tipo, numero) VALUES (?, ?, ?)",
+        [(dni, tipo, numero) for tipo, numero in datos["telefonos"].items()])
+
+def guardar_mascota_sqlite(conexion, id_masc, datos):
+    """
+    Inserta o reemplaza una mascota en la base. El historial no se guarda porque se obtiene
+    de la tabla de atenciones.
+
+    Parametros:
+        conexion: Conexión SQLite abierta.
+        id_masc: ID de la mascota.
+        datos: Diccionario de la mascota con el formato de 'mascotas.json'.
+    """
+    conexion.execute(
+        "INSERT OR REPLACE INTO mascotas (id, activo, nombre, sexo, especie, raza, edad, peso, propietario) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (id_masc, datos["activo"], datos["nombre"], datos["sexo"], datos["especie"], datos["raza"],
+         datos["edad"], datos["peso"], datos["propietario"]))
+
+def guardar_atencion_sqlite(conexion, id_atencion, datos):
+    """
+    Inserta o reemplaza una atención en la base, actualizando sus totales en la tabla de agregados.
+
+    Parametros:
+        conexion: Conexión SQLite abierta.
+        id_atencion: ID de la atención (fecha y hora).
+        datos: Diccionario de la atención con el formato de 'atenciones.json'.
+    """
+    columnas = ", ".join(AlmacenSQLite.COLUMNAS_ATENCION)
+    fila = conexion.execute(f"SELECT {columnas} FROM atenciones WHERE id = ?", (id_atencion,)).fetchone()
+    anterior = None if fila is None else dict(zip(AlmacenSQLite.COLUMNAS_ATENCION, fila))
+    if anterior == datos:
+        return
+    if anterior is not None:
+        sumar_agregado_sqlite(conexion, id_atencion, anterior, -1)
+    sumar_agregado_sqlite(conexion, id_atencion, datos)
+    #ON CONFLICT en lugar de INSERT OR REPLACE: el reemplazo borra la fila sin avisar a los disparadores
+    #de la búsqueda de textos, la actualización sí les avisa
+    conexion.execute(
+        f"INSERT INTO atenciones (id, fecha, {', '.join(AlmacenSQLite.COLUMNAS_ATENCION)}) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (id) DO UPDATE SET "
+        + ", ".join(f"{columna} = excluded.{columna}" for columna in AlmacenSQLite.COLUMNAS_ATENCION),
+        (id_atencion, id_atencion[:19]) + tuple(datos[columna] for columna in AlmacenSQLite.COLUMNAS_ATENCION))
+
+def sumar_agregado_sqlite(conexion, id_atencion, datos, signo=1):
+    """
+    Suma (o resta, con signo=-1) una atención a la tabla de agregados mensuales por mascota.
+
+    Parametros:
+        conexion: Conexión SQLite abierta.
+        id_atencion: ID de la atención (empieza con 'AAAA.MM').
+        datos: Diccionario con los datos de la atención.
+        signo: 1 para sumar la atención, -1 para quitarla.
+    """
+    conexion.execute("""
+        INSERT INTO agregados (mes, mascota, propietario, cantidad, costo, costo_veterinario, costo_medicamentos)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (mes, mascota) DO UPDATE SET
+            cantidad = cantidad + excluded.cantidad,
+            costo = costo + excluded.costo,
+            costo_veterinario = costo_veterinario + excluded.costo_veterinario,
+            costo_medicamentos = costo_medicamentos + excluded.costo_medicamentos
+    """, (id_atencion[:7], datos["mascota"], datos["propietario"], signo, signo * datos["costo"],
+          signo * datos["costo_veterinario"], signo * datos["costo_medicamentos"]))
+    conexion.execute("DELETE FROM agregados WHERE mes = ? AND mascota = ? AND cantidad = 0",
+                     (id_atencion[:7], datos["mascota"]))
+
+def migrar_json_a_sqlite(conexion):
+    """
+    Copia a la base SQLite los datos de 'propietarios.json', 'mascotas.json' y las atenciones (de
+    las particiones mensuales o del 'atenciones.json' anterior, más las que todavía estén en el
+    diario). Se ejecuta una sola vez, al crear la base. Los archivos JSON solo se leen: no se
+    aplican las migraciones del almacén JSON ni se guarda nada, así cambiar de almacén no modifica
+    los datos del otro.
+
+    Parametros:
+        conexion: Conexión SQLite abierta con las tablas ya creadas.
+    """
+    origen = Almacen() #Solo para usar las mismas rutas que el almacén JSON; no se carga
+    with origen.bloqueo: #Para no leer archivos a medio guardar por otro proceso
+        vigentes = {}
+        if os.path.exists("lote_pendiente.json"): #Lote cortado: sus temporales son la versión más nueva
+            vigentes = {nombre_archivo: temporal for nombre_archivo, temporal in cargar_json("lote_pendiente.json").items()
+                        if os.path.exists(temporal)}
+
+        def leer(nombre_archivo):
+            nombre_archivo = vigentes.get(nombre_archivo, nombre_archivo)
+            return iterar_json(nombre_archivo) if os.path.exists(nombre_archivo) else iter(())
+
+        with conexion:
+            for dni, datos in leer(origen.archivo("propietarios")):
+                guardar_propietario_sqlite(conexion, dni, datos)
+            for id_masc, datos in leer(origen.archivo("mascotas")):
+                guardar_mascota_sqlite(conexion, id_masc, datos)
+            manifiesto = dict(leer(origen.archivo(origen.MANIFIESTO)))
+            if manifiesto:
+                for mes in sorted(manifiesto):
+                    for id_atencion, datos in leer(origen.archivo("atenciones/" + mes)):
+                        guardar_atencion_sqlite(conexion, id_atencion, datos)
+            else:
+                for id_atencion, datos in leer(origen.archivo_atenciones):
+                    guardar_atencion_sqlite(conexion, id_atencion, datos)
+            if os.path.exists(origen.diario):
+                f = open(origen.diario, mode="rb")
+                for linea in f:
+                    if not linea.endswith(b"\n"): #Linea cortada a mitad de escritura
+                        break
+                    try:
+                        entrada = json.loads(linea)
+                    except json.JSONDecodeError:
+                        break
+                    if entrada["tipo"] == "atencion":
+                        guardar_atencion_sqlite(conexion, entrada["id"], entrada["datos"])
+                f.close()
+    print("Datos migrados de los archivos JSON a la base SQLite.")
+
+def crear_almacen():
+    """
+    Crea el almacén indicado en la variable de entorno VETERINARIA_ALMACEN: 'json' (por defecto)
+    usa los archivos JSON y 'sqlite' usa la base 'veterinaria.db'. Con VETERINARIA_INSTANTANEAS=0
+    el almacén JSON no usa instantáneas binarias.
+
+    Retorno:
+        El almacén a usar por el sistema.
+    """
+    if os.environ.get("VETERINARIA_ALMACEN", "json").lower() == "sqlite":
+        return AlmacenSQLite()
+    return Almacen(instantaneas=os.environ.get("VETERINARIA_INSTANTANEAS", "1") != "0")
+
+almacen = crear_almacen() #Almacén compartido por todas las funciones del sistema
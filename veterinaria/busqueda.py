@@ -0,0 +1,375 @@
+"""
+----------------------------------------------------------------------------------------------
+Título: Sistema de Gestión Veterinaria - Búsqueda de textos
+Fecha: 31/05/2025
+Autor: Grupo 6
+
+Descripción:
+Índices invertidos para buscar por palabras en los textos de las atenciones (motivo,
+diagnóstico y tratamiento) y de los propietarios (nombre y dirección). Las palabras se
+comparan sin mayúsculas ni acentos ("Artritis", "ARTRITIS" y "artrítis" son la misma) y los
+resultados se ordenan por relevancia: pesan más las palabras menos frecuentes.
+
+También los índices para encontrar propietarios y mascotas sin saber su clave: por el comienzo
+de las palabras del nombre (para ir completando mientras se escribe) y por email o teléfono.
+----------------------------------------------------------------------------------------------
+"""
+
+#----------------------------------------------------------------------------------------------
+# MÓDULOS
+#----------------------------------------------------------------------------------------------
+import bisect
+import functools
+import math
+import operator
+import re
+import unicodedata
+from array import array
+
+from .entidades import Atencion
+
+#----------------------------------------------------------------------------------------------
+# FUNCIONES
+#----------------------------------------------------------------------------------------------
+PALABRAS_VACIAS = frozenset("""a al como con de del el en es la las le lo los o para por que se sin
+                               su sus un una uno y""".split()) #No ayudan a distinguir un texto de otro
+
+PALABRA = re.compile(r"\w+")
+
+CAMPOS_ATENCION = ("motivo", "diagnostico", "tratamiento")
+CAMPOS_PROPIETARIO = ("nombre", "direccion")
+CAMPOS_CONTACTO = {"email": (("email",),),
+                   "telefono": (("telefonos", "principal"), ("telefonos", "emergencia"))}
+
+@functools.lru_cache(maxsize=65536)
+def normalizar(texto):
+    """
+    Los nombres repiten mucho las mismas palabras, por eso se recuerdan los últimos resultados.
+
+    Parametros:
+        texto: Texto a normalizar.
+
+    Retorno:
+        El texto en minúsculas, sin acentos ni diéresis (la ñ queda como n).
+    """
+    normalizado = unicodedata.normalize("NFKD", texto.casefold())
+    return "".join(caracter for caracter in normalizado if not unicodedata.combining(caracter))
+
+@functools.lru_cache(maxsize=65536)
+def terminos(texto):
+    """
+    Separa un texto en los términos que se indexan: palabras en minúsculas, sin acentos ni
+    diéresis (la ñ queda como n), sin las palabras vacías. Los textos de las atenciones se
+    repiten mucho, por eso se recuerdan los últimos resultados.
+
+    Parametros:
+        texto: Texto a separar.
+
+    Retorno:
+        Una tupla con los términos distintos, en el orden en que aparecen.
+    """
+    return tuple(dict.fromkeys(palabra for palabra in PALABRA.findall(normalizar(texto)) if palabra not in PALABRAS_VACIAS))
+
+def palabras_nombre(nombre):
+    """
+    Parametros:
+        nombre: Nombre de un propietario o una mascota (o lo que se lleva escrito de él).
+
+    Retorno:
+        Una tupla con sus palabras distintas normalizadas (ver normalizar), incluidas las cortas
+        como "de" o "la", que en un nombre sí sirven para distinguirlo.
+    """
+    return tuple(dict.fromkeys(map(normalizar, PALABRA.findall(nombre))))
+
+def terminos_registro(datos, campos):
+    """
+    Parametros:
+        datos: Registro (atención o propietario).
+        campos: Campos de texto a indexar.
+
+    Retorno:
+        Un conjunto con los términos de esos campos.
+    """
+    return {termino for campo in campos for termino in terminos(datos.get(campo) or "")}
+
+def peso(total, frecuencia):
+    """
+    Peso de un término para ordenar los resultados (frecuencia inversa): un término que aparece
+    en pocos registros distingue más que uno que aparece en casi todos.
+
+    Parametros:
+        total: Cantidad de registros indexados.
+        frecuencia: Cantidad de registros que contienen el término.
+
+    Retorno:
+        El peso del término (0 si no aparece en ninguno).
+    """
+    return math.log(1 + total / frecuencia) if frecuencia else 0.0
+
+def textos_atencion(datos, leer_textos=operator.attrgetter(*CAMPOS_ATENCION)):
+    """
+    Parametros:
+        datos: Atencion (o diccionario con los datos de una atención).
+
+    Retorno:
+        Una tupla con su motivo, diagnóstico y tratamiento.
+    """
+    if type(datos) is Atencion:
+        return leer_textos(datos)
+    return tuple(datos.get(campo) for campo in CAMPOS_ATENCION)
+
+def indexar_atenciones(textos):
+    """
+    Arma el índice de textos de una partición: para cada término, los números de las atenciones
+    que lo contienen (su posición en el orden por ID, la misma que en el archivo de registros).
+
+    Parametros:
+        textos: Iterable con los textos de cada atención de la partición, en el orden por ID
+                (ver textos_atencion y ArchivoRegistros.textos).
+
+    Retorno:
+        Diccionario término -> array de números de atención, en orden creciente.
+    """
+    indice = {}
+    terminos_textos = {} #Las mismas combinaciones de textos se repiten mucho: se separan una sola vez
+    for numero, textos_registro in enumerate(textos):
+        palabras = terminos_textos.get(textos_registro)
+        if palabras is None:
+            palabras = {termino for texto in textos_registro if isinstance(texto, str) for termino in terminos(texto)}
+            terminos_textos[textos_registro] = palabras
+        for termino in palabras:
+            numeros = indice.get(termino)
+            if numeros is None:
+                numeros = indice[termino] = array("I")
+            numeros.append(numero)
+    return indice
+
+class IndiceTextos:
+    """
+    Índice invertido en memoria: para cada término, el conjunto de claves de los registros que
+    lo contienen. Se actualiza registro por registro (agregar y quitar), así se mantiene al día
+    con cada alta o modificación sin volver a armarlo.
+    """
+
+    def __init__(self, campos):
+        """
+        Parametros:
+            campos: Campos de texto de los registros que se indexan.
+        """
+        self.campos = campos
+        self.documentos = {} #Clave -> términos del registro
+        self.claves = {} #Término -> claves de los registros que lo contienen
+
+    def agregar(self, clave, datos):
+        """
+        Indexa un registro, reemplazando lo indexado antes con la misma clave.
+
+        Parametros:
+            clave: Clave del registro (DNI o ID de la atención).
+            datos: Datos del registro.
+        """
+        self.quitar(clave)
+        palabras = frozenset(terminos_registro(datos, self.campos))
+        self.documentos[clave] = palabras
+        for termino in palabras:
+            self.claves.setdefault(termino, set()).add(clave)
+
+    def quitar(self, clave):
+        """
+        Quita un registro del índice (si no estaba, no hace nada).
+
+        Parametros:
+            clave: Clave del registro.
+        """
+        for termino in self.documentos.pop(clave, ()):
+            claves = self.claves[termino]
+            claves.discard(clave)
+            if not claves:
+                del self.claves[termino]
+
+    def frecuencia(self, termino):
+        """
+        Retorno:
+            Cantidad de registros que contienen el término.
+        """
+        return len(self.claves.get(termino, ()))
+
+    def puntajes(self, pesos):
+        """
+        Parametros:
+            pesos: Diccionario término -> peso (ver peso()).
+
+        Retorno:
+            Diccionario clave -> puntaje (suma de los pesos de los términos que contiene) de los
+            registros que contienen alguno de los términos.
+        """
+        resultado = {}
+        for termino, valor in pesos.items():
+            for clave in self.claves.get(termino, ()):
+                resultado[clave] = resultado.get(clave, 0.0) + valor
+        return resultado
+
+    def buscar(self, consulta, limite=20):
+        """
+        Busca los registros que contienen las palabras de la consulta. No hace falta que
+        contengan todas: primero aparecen los que contienen más palabras y las menos frecuentes.
+
+        Parametros:
+            consulta: Texto a buscar.
+            limite: Cantidad máxima de resultados.
+
+        Retorno:
+            Una lista de claves ordenada por relevancia (a igual relevancia, por clave).
+        """
+        pesos = {termino: peso(len(self.documentos), self.frecuencia(termino)) for termino in terminos(consulta)}
+        puntajes = self.puntajes(pesos)
+        return sorted(puntajes, key=lambda clave: (-puntajes[clave], clave))[:limite]
+
+class IndiceRegistros:
+    """
+    Índices para encontrar propietarios o mascotas sin saber su clave:
+        - por el comienzo de las palabras del nombre: una lista ordenada de pares (palabra, clave),
+          en la que las palabras que empiezan igual quedan juntas y se encuentran con búsqueda binaria;
+        - por el valor exacto de algunos campos (email, teléfonos): diccionarios valor -> claves.
+    Se actualiza registro por registro (agregar y quitar), como IndiceTextos.
+    """
+
+    def __init__(self, campos_valores=None):
+        """
+        Parametros:
+            campos_valores: Diccionario tipo -> campos que se indexan por valor exacto; cada campo es
+                            el camino dentro del registro, por ejemplo ("telefonos", "principal")
+                            (ver CAMPOS_CONTACTO). None para indexar solo el nombre.
+        """
+        self.campos_valores = campos_valores or {}
+        self.palabras = [] #Pares (palabra del nombre, clave) ordenados
+        self.nombres = {} #Clave -> palabras de su nombre
+        self.valores = {tipo: {} for tipo in self.campos_valores} #Tipo -> valor -> claves
+        self.valores_registro = {} #Clave -> pares (tipo, valor) del registro
+
+    def valores_de(self, datos):
+        """
+        Parametros:
+            datos: Datos de un registro.
+
+        Retorno:
+            Un conjunto de pares (tipo, valor) con los valores a indexar, en minúsculas y sin
+            espacios alrededor.
+        """
+        pares = set()
+        for tipo, campos in self.campos_valores.items():
+            for camino in campos:
+                try:
+                    valor = functools.reduce(operator.getitem, camino, datos)
+                except (KeyError, TypeError):
+                    continue
+                if isinstance(valor, str) and valor.strip():
+                    pares.add((tipo, valor.strip().casefold()))
+        return pares
+
+    def cargar(self, registros):
+        """
+        Arma los índices de todos los registros juntos (más rápido que agregarlos de a uno:
+        la lista de palabras se ordena una sola vez).
+
+        Parametros:
+            registros: Iterable de pares (clave, datos).
+        """
+        self.palabras = []
+        self.nombres = {}
+        self.valores = {tipo: {} for tipo in self.campos_valores}
+        self.valores_registro = {}
+        for clave, datos in registros:
+            palabras = palabras_nombre(datos.get("nombre") or "")
+            self.nombres[clave] = palabras
+            self.palabras.extend((palabra, clave) for palabra in palabras)
+            if self.campos_valores:
+                self.indexar_valores(clave, datos)
+        self.palabras.sort()
+
+    def agregar(self, clave, datos):
+        """
+        Indexa un registro, reemplazando lo indexado antes con la misma clave.
+
+        Parametros:
+            clave: Clave del registro (DNI o ID de la mascota).
+            datos: Datos del registro.
+        """
+        self.quitar(clave)
+        palabras = palabras_nombre(datos.get("nombre") or "")
+        self.nombres[clave] = palabras
+        for palabra in palabras:
+            bisect.insort(self.palabras, (palabra, clave))
+        self.indexar_valores(clave, datos)
+
+    def indexar_valores(self, clave, datos):
+        """
+        Agrega un registro a los índices por valor exacto.
+
+        Parametros:
+            clave: Clave del registro.
+            datos: Datos del registro.
+        """
+        pares = self.valores_de(datos)
+        self.valores_registro[clave] = pares
+        for tipo, valor in pares:
+            self.valores[tipo].setdefault(valor, set()).add(clave)
+
+    def quitar(self, clave):
+        """
+        Quita un registro de los índices (si no estaba, no hace nada).
+
+        Parametros:
+            clave: Clave del registro.
+        """
+        for palabra in self.nombres.pop(clave, ()):
+            del self.palabras[bisect.bisect_left(self.palabras, (palabra, clave))]
+        for tipo, valor in self.valores_registro.pop(clave, ()):
+            claves = self.valores[tipo][valor]
+            claves.discard(clave)
+            if not claves:
+                del self.valores[tipo][valor]
+
+    def buscar_nombre(self, texto, limite=10):
+        """
+        Busca los registros cuyo nombre tiene, para cada palabra del texto, una palabra que empieza
+        con ella ("mar per" encuentra a "María Luisa Pérez"). Se recorre solo el tramo de la lista
+        de palabras que empiezan con la palabra más larga del texto.
+
+        Parametros:
+            texto: Nombre o comienzo del nombre.
+            limite: Cantidad máxima de resultados.
+
+        Retorno:
+            Una lista de claves, en el orden alfabético de la palabra que coincide.
+        """
+        buscadas = palabras_nombre(texto)
+        if not buscadas:
+            return []
+        principal = max(buscadas, key=len)
+        resto = [buscada for buscada in buscadas if buscada != principal]
+        resultado = []
+        vistas = set()
+        posicion = bisect.bisect_left(self.palabras, (principal,))
+        while posicion < len(self.palabras) and len(resultado) < limite:
+            palabra, clave = self.palabras[posicion]
+            if not palabra.startswith(principal):
+                break
+            posicion += 1
+            if clave in vistas:
+                continue
+            vistas.add(clave)
+            if all(any(palabra.startswith(buscada) for palabra in self.nombres[clave]) for buscada in resto):
+                resultado.append(clave)
+        return resultado
+
+    def buscar_valor(self, tipo, valor):
+        """
+        Parametros:
+            tipo: Tipo de valor (por ejemplo 'email' o 'telefono', ver CAMPOS_CONTACTO).
+            valor: Valor buscado (sin distinguir mayúsculas).
+
+        Retorno:
+            Una lista ordenada con las claves de los registros que tienen ese valor.
+        """
+        return sorted(self.valores[tipo].get(valor.strip().casefold(), ()))
@@ -0,0 +1,244 @@
+"""
+----------------------------------------------------------------------------------------------
+Título: Sistema de Gestión Veterinaria - Entidades
+Fecha: 31/05/2025
+Autor: Grupo 6
+
+Descripción:
+Registros de propietarios, mascotas y atenciones. Son clases con __slots__ en lugar de
+diccionarios: no guardan un diccionario por registro ni repiten los nombres de los campos, y
+los textos que se repiten entre registros (especie, sexo, motivo...) se guardan una sola vez.
+Se usan igual que los diccionarios de antes (registro["nombre"], get, in, items) y se
+convierten al mismo formato de los archivos JSON.
+----------------------------------------------------------------------------------------------
+"""
+
+#----------------------------------------------------------------------------------------------
+# MÓDULOS
+#----------------------------------------------------------------------------------------------
+import operator
+import sys
+
+#----------------------------------------------------------------------------------------------
+# FUNCIONES
+#----------------------------------------------------------------------------------------------
+def internado(valor):
+    """
+    Parametros:
+        valor: Valor de un campo.
+
+    Retorno:
+        El valor, internado si es un texto (así los textos iguales son un único objeto en memoria).
+    """
+    return sys.intern(valor) if type(valor) is str else valor
+
+def a_json(objeto):
+    """
+    Convierte un registro al diccionario que se guarda en JSON. Se pasa como 'default' a
+    json.dump() y json.dumps(), que la llaman con cada objeto que no saben convertir.
+
+    Parametros:
+        objeto: Registro a convertir.
+
+    Retorno:
+        Un diccionario con los campos del registro, en el orden de los archivos JSON.
+    """
+    if isinstance(objeto, Registro):
+        return dict(objeto.items())
+    raise TypeError(f"Object of type {type(objeto).__name__} is not JSON serializable")
+
+class Registro:
+    """
+    Base de los registros. Cada subclase define sus campos en CAMPOS (en el orden de los archivos
+    JSON) y en __slots__, y en INTERNADOS los campos de textos que se repiten entre registros.
+    Se accede a los campos como en un diccionario; un campo con valor ... (Ellipsis) es uno que
+    el registro no tiene (por ejemplo, el historial de las mascotas en SQLite) y se comporta como
+    una clave ausente.
+    """
+
+    __slots__ = ()
+    CAMPOS = ()
+    INTERNADOS = ()
+
+    def __init_subclass__(cls, **argumentos):
+        super().__init_subclass__(**argumentos)
+        #Valores de los campos de un diccionario, en el orden de CAMPOS (KeyError si falta alguno)
+        cls.leer_campos = staticmethod(operator.itemgetter(*cls.CAMPOS) if len(cls.CAMPOS) > 1 else lambda datos: (datos[cls.CAMPOS[0]],))
+        cls.posiciones_internadas = [posicion for posicion, campo in enumerate(cls.CAMPOS) if campo in cls.INTERNADOS]
+
+    @classmethod
+    def desde_json(cls, datos):
+        """
+        Arma un registro a partir del diccionario leído de un archivo JSON, internando los
+        textos de los campos de INTERNADOS.
+
+        Parametros:
+            datos: Diccionario con los datos (o un registro de esta clase, que se devuelve igual).
+
+        Retorno:
+            El registro, o el mismo diccionario si tiene campos que la clase no conoce (así no
+            se pierden al volver a guardarlo).
+        """
+        if isinstance(datos, cls):
+            return datos
+        if len(datos) == len(cls.CAMPOS):
+            try:
+                valores = list(cls.leer_campos(datos)) #El caso común: están todos los campos y ningún otro
+            except KeyError:
+                return datos
+        elif datos.keys() - cls.CAMPOS:
+            return datos
+        else:
+            valores = [datos.get(campo, ...) for campo in cls.CAMPOS]
+        for posicion in cls.posiciones_internadas:
+            valores[posicion] = internado(valores[posicion])
+        return cls(*valores)
+
+    @classmethod
+    def coleccion_desde_json(cls, datos):
+        """
+        Convierte todos los registros de una colección leída de JSON, como desde_json() pero
+        por columnas cuando todos tienen exactamente los campos de la clase: cada campo se lee e
+        interna con map() sobre todos los registros juntos, sin código Python por registro.
+
+        Parametros:
+            datos: Diccionario clave -> diccionario del registro.
+
+        Retorno:
+            Diccionario clave -> registro.
+        """
+        valores = list(datos.values())
+        if set(map(type, valores)) <= {dict} and set(map(len, valores)) <= {len(cls.CAMPOS)}:
+            try:
+                columnas = [list(map(operator.itemgetter(campo), valores)) for campo in cls.CAMPOS]
+            except KeyError: #Algún registro tiene otros campos: se convierten de a uno
+                columnas = None
+            if columnas is not None:
+                for posicion in cls.posiciones_internadas:
+                    columna = columnas[posicion]
+                    columnas[posicion] = list(map(sys.intern if set(map(type, columna)) <= {str} else internado, columna))
+                return dict(zip(datos, map(cls, *columnas)))
+        return {clave: cls.desde_json(valor) for clave, valor in datos.items()}
+
+    def __reduce__(self):
+        return type(self), tuple(getattr(self, campo) for campo in self.CAMPOS)
+
+    def __getitem__(self, campo):
+        if campo in self.CAMPOS:
+            valor = getattr(self, campo)
+            if valor is not ...:
+                return valor
+        raise KeyError(campo)
+
+    def __setitem__(self, campo, valor):
+        if campo not in self.CAMPOS:
+            raise KeyError(campo)
+        setattr(self, campo, valor)
+
+    def __contains__(self, campo):
+        return campo in self.CAMPOS and getattr(self, campo) is not ...
+
+    def get(self, campo, defecto=None):
+        return self[campo] if campo in self else defecto
+
+    def keys(self):
+        return [campo for campo in self.CAMPOS if getattr(self, campo) is not ...]
+
+    def values(self):
+        return [self[campo] for campo in self.keys()]
+
+    def items(self):
+        return [(campo, self[campo]) for campo in self.keys()]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __eq__(self, otro):
+        if not isinstance(otro, (Registro, dict)):
+            return NotImplemented
+        return dict(self.items()) == dict(otro.items())
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+class Telefonos(Registro):
+    """
+    Teléfonos de un propietario.
+    """
+
+    __slots__ = CAMPOS = ("principal", "emergencia")
+
+    def __init__(self, principal, emergencia):
+        self.principal = principal
+        self.emergencia = emergencia
+
+class Propietario(Registro):
+    """
+    Datos de un propietario (la clave en la colección es su DNI).
+    """
+
+    __slots__ = CAMPOS = ("activo", "nombre", "direccion", "email", "telefonos")
+
+    def __init__(self, activo, nombre, direccion, email, telefonos):
+        self.activo = activo
+        self.nombre = nombre
+        self.direccion = direccion
+        self.email = email
+        self.telefonos = telefonos
+
+    @classmethod
+    def desde_json(cls, datos):
+        registro = super().desde_json(datos)
+        if isinstance(registro, cls) and isinstance(registro.telefonos, dict):
+            registro.telefonos = Telefonos.desde_json(registro.telefonos)
+        return registro
+
+    @classmethod
+    def coleccion_desde_json(cls, datos):
+        registros = super().coleccion_desde_json(datos)
+        for registro in registros.values():
+            if isinstance(registro, cls) and isinstance(registro.telefonos, dict):
+                registro.telefonos = Telefonos.desde_json(registro.telefonos)
+        return registros
+
+class Mascota(Registro):
+    """
+    Datos de una mascota (la clave en la colección es su ID). El historial es la lista ordenada
+    de los IDs de sus atenciones.
+    """
+
+    __slots__ = CAMPOS = ("activo", "nombre", "sexo", "especie", "raza", "edad", "peso", "propietario", "historial")
+    INTERNADOS = ("sexo", "especie", "raza")
+
+    def __init__(self, activo, nombre, sexo, especie, raza, edad, peso, propietario, historial):
+        self.activo = activo
+        self.nombre = nombre
+        self.sexo = sexo
+        self.especie = especie
+        self.raza = raza
+        self.edad = edad
+        self.peso = peso
+        self.propietario = propietario
+        self.historial = historial
+
+class Atencion(Registro):
+    """
+    Datos de una atención (la clave en la partición es su ID, que empieza con la fecha y hora).
+    """
+
+    __slots__ = CAMPOS = ("mascota", "propietario", "motivo", "diagnostico", "tratamiento",
+                          "costo_veterinario", "costo_medicamentos", "costo")
+    INTERNADOS = ("mascota", "propietario", "motivo", "diagnostico", "tratamiento")
+
+    def __init__(self, mascota, propietario, motivo, diagnostico, tratamiento, costo_veterinario, costo_medicamentos, costo):
+        self.mascota = mascota
+        self.propietario = propietario
+        self.motivo = motivo
+        self.diagnostico = diagnostico
+        self.tratamiento = tratamiento
+        self.costo_veterinario = costo_veterinario
+        self.costo_medicamentos = costo_medicamentos
+        self.costo = costo
@@ -0,0 +1,193 @@
+"""
+----------------------------------------------------------------------------------------------
+Título: Sistema de Gestión Veterinaria - Importación
+Fecha: 31/05/2025
+Autor: Grupo 6
+
+Descripción:
+Importación de propietarios, mascotas y atenciones desde archivos CSV o JSON Lines.
+----------------------------------------------------------------------------------------------
+"""
+
+#----------------------------------------------------------------------------------------------
+# MÓDULOS
+#----------------------------------------------------------------------------------------------
+import json
+import csv
+
+from .almacenamiento import almacen
+from .servicios import con_bloqueo, crear_mascota, crear_propietario, preparar_atencion
+from .validacion import completar_id_atencion, validar_id_atencion_anterior
+
+#----------------------------------------------------------------------------------------------
+# FUNCIONES
+#----------------------------------------------------------------------------------------------
+def leer_registros(nombre_archivo):
+    """
+    Lee de a uno los registros de un archivo CSV (con encabezado) o JSON Lines (un objeto por línea),
+    sin cargar el archivo completo en memoria.
+
+    Parametros:
+        nombre_archivo: Ruta del archivo; si termina en '.csv' se lee como CSV, si no como JSON Lines.
+
+    Retorno:
+        Un generador de pares (numero_linea, registro). Si una línea de JSON Lines no es un objeto
+        válido, registro es None.
+    """
+    if nombre_archivo.lower().endswith(".csv"):
+        with open(nombre_archivo, newline="", encoding="utf-8-sig") as f:
+            lector = csv.DictReader(f)
+            for registro in lector:
+                yield lector.line_num, registro
+        return
+
+    with open(nombre_archivo, encoding="utf-8-sig") as f:
+        for numero, linea in enumerate(f, start=1):
+            if not linea.strip():
+                continue
+            try:
+                registro = json.loads(linea)
+            except json.JSONDecodeError:
+                registro = None
+            yield numero, registro if isinstance(registro, dict) else None
+
+def campo_texto(registro, campo, anidado=None):
+    """
+    Obtiene un campo de un registro importado como texto sin espacios en los extremos. Acepta
+    tanto columnas planas de CSV ('telefono_principal') como objetos anidados de JSON
+    ('telefonos': {'principal': ...}).
+
+    Parametros:
+        registro: Diccionario leído del archivo.
+        campo: Nombre del campo (o de la columna plana).
+        anidado: Tupla (objeto, campo) donde buscar el valor si no está como columna plana, o None.
+
+    Retorno:
+        El valor como texto, o '' si falta.
+    """
+    valor = registro.get(campo)
+    if valor is None and anidado is not None and isinstance(registro.get(anidado[0]), dict):
+        valor = registro[anidado[0]].get(anidado[1])
+    return "" if valor is None else str(valor).strip()
+
+def importar_registro(tipo, registro, lote, segundos):
+    """
+    Valida e incorpora un registro importado usando las mismas funciones de servicio que el menú.
+    Los propietarios y mascotas quedan en memoria marcados para guardar; las atenciones se
+    agregan a la lista del lote.
+
+    Parametros:
+        tipo: 'propietarios', 'mascotas' o 'atenciones'.
+        registro: Diccionario leído del archivo.
+        lote: Diccionario id_atencion -> datos de las atenciones del lote todavía no guardadas.
+        segundos: Diccionario ID del formato anterior -> cantidad de atenciones del archivo con ese
+                  mismo segundo, para completar cada una con una fracción de segundo distinta.
+    """
+    if tipo == "propietarios":
+        crear_propietario(campo_texto(registro, "dni"), campo_texto(registro, "nombre"),
+                          campo_texto(registro, "direccion"), campo_texto(registro, "email"),
+                          campo_texto(registro, "telefono_principal", ("telefonos", "principal")),
+                          campo_texto(registro, "telefono_emergencia", ("telefonos", "emergencia")), guardar=False)
+    elif tipo == "mascotas":
+        crear_mascota(campo_texto(registro, "propietario"), campo_texto(registro, "nombre"),
+                      campo_texto(registro, "sexo"), campo_texto(registro, "especie"),
+                      campo_texto(registro, "raza"), campo_texto(registro, "edad"),
+                      campo_texto(registro, "peso"), id_mascota=campo_texto(registro, "id") or None,
+                      guardar=False)
+    else:
+        id_atencion = campo_texto(registro, "id")
+        if validar_id_atencion_anterior(id_atencion):
+            secuencia = segundos.get(id_atencion, 0)
+            segundos[id_atencion] = secuencia + 1
+            id_atencion = completar_id_atencion(id_atencion, secuencia)
+        id_atencion, datos = preparar_atencion(campo_texto(registro, "mascota"), campo_texto(registro, "motivo"),
+                                               campo_texto(registro, "diagnostico"), campo_texto(registro, "tratamiento"),
+                                               campo_texto(registro, "costo_veterinario"),
+                                               campo_texto(registro, "costo_medicamentos"),
+                                               id_atencion=id_atencion)
+        propietario = campo_texto(registro, "propietario")
+        if propietario and propietario != datos["propietario"]:
+            raise ValueError("El propietario no coincide con el de la mascota.")
+        if id_atencion in lote or almacen.existe_atencion(id_atencion):
+            raise ValueError("Ya hay una atención registrada con esa fecha y hora.")
+        lote[id_atencion] = datos
+
+@con_bloqueo
+def importar_archivo(nombre_archivo, tipo, tamanio_lote=10000):
+    """
+    Importa propietarios, mascotas o atenciones desde un archivo CSV o JSON Lines. Cada registro
+    se valida con las reglas del sistema y se verifica que su propietario o mascota exista y esté
+    activo (por eso conviene importar primero propietarios, después mascotas y al final atenciones).
+    Los registros válidos se guardan por lotes: una escritura por colección cada 'tamanio_lote' registros.
+    Mientras dura la importación, las otras terminales esperan para guardar sus cambios.
+
+    Columnas esperadas:
+        propietarios: dni, nombre, direccion, email, telefono_principal, telefono_emergencia
+                      (en JSON Lines también 'telefonos': {'principal', 'emergencia'}).
+        mascotas: id (opcional), propietario, nombre, sexo, especie, raza, edad, peso.
+        atenciones: id (AAAA.MM.DD HH.MM.SS.ffffff-nnnn o AAAA.MM.DD HH.MM.SS), mascota,
+                    propietario (opcional), motivo, diagnostico, tratamiento, costo_veterinario,
+                    costo_medicamentos. Las atenciones del archivo con el mismo segundo y sin
+                    fracción se numeran en el orden del archivo, así no se pisan entre sí.
+
+    Parametros:
+        nombre_archivo: Ruta del archivo a importar.
+        tipo: 'propietarios', 'mascotas' o 'atenciones'.
+        tamanio_lote: Cantidad de registros válidos por cada guardado.
+
+    Retorno:
+        Una tupla (importados, rechazados), donde rechazados es una lista de tuplas
+        (numero_linea, motivo, registro).
+    """
+    if tipo not in ("propietarios", "mascotas", "atenciones"):
+        raise ValueError("Tipo de registro inválido.")
+
+    importados = 0
+    rechazados = []
+    lote = {}
+    segundos = {}
+    pendientes = 0
+    for numero, registro in leer_registros(nombre_archivo):
+        if registro is None:
+            rechazados.append((numero, "La línea no es un objeto JSON válido.", None))
+            continue
+        try:
+            importar_registro(tipo, registro, lote, segundos)
+        except ValueError as e:
+            rechazados.append((numero, str(e), registro))
+            continue
+        importados += 1
+        pendientes += 1
+        if pendientes >= tamanio_lote:
+            guardar_importacion(tipo, lote)
+            pendientes = 0
+    guardar_importacion(tipo, lote)
+    return importados, rechazados
+
+def guardar_importacion(tipo, lote):
+    """
+    Guarda los registros importados desde el último guardado.
+
+    Parametros:
+        tipo: 'propietarios', 'mascotas' o 'atenciones'.
+        lote: Diccionario de atenciones pendientes; se vacía después de guardarlo.
+    """
+    if tipo == "atenciones":
+        if lote:
+            almacen.agregar_atenciones(sorted(lote.items()))
+            lote.clear()
+    elif not almacen.guardar():
+        raise OSError("No se pudieron guardar los registros importados.")
+
+def guardar_rechazados(nombre_archivo, rechazados):
+    """
+    Escribe el informe de registros rechazados en formato JSON Lines, con la línea del archivo
+    original, el motivo y el registro tal como se leyó.
+
+    Parametros:
+        nombre_archivo: Ruta del informe.
+        rechazados: Lista de tuplas (numero_linea, motivo, registro).
+    """
+    with open(nombre_archivo, "w", encoding="utf-8") as f:
+        for numero, motivo, registro in rechazados:
+            f.write(json.dumps({"linea": numero, "motivo": motivo, "registro": registro}, ensure_ascii=False) + "\n")
@@ -0,0 +1,134 @@
+"""
+----------------------------------------------------------------------------------------------
+Título: Sistema de Gestión Veterinaria - Informes
+Fecha: 31/05/2025
+Autor: Grupo 6
+
+Descripción:
+Resúmenes anuales, atenciones agrupadas y armado de las líneas de texto de los informes.
+----------------------------------------------------------------------------------------------
+"""
+
+#----------------------------------------------------------------------------------------------
+# MÓDULOS
+#----------------------------------------------------------------------------------------------
+import re
+
+from .almacenamiento import CAMPOS_AGRUPACION, CLAVES_AGRUPACION, agrupar_fragmento, almacen, procesar_fragmentos
+
+#----------------------------------------------------------------------------------------------
+# FUNCIONES
+#----------------------------------------------------------------------------------------------
+def resumen_anual(anio, campo="cantidad", propietario=None):
+    """
+    Arma la matriz de totales por mascota y mes de un año, con una fila por cada mascota registrada.
+
+    Parametros:
+        anio: Año en formato AAAA.
+        campo: 'cantidad' para contar atenciones, o 'costo', 'costo_veterinario' o 'costo_medicamentos'
+               para sumar montos.
+        propietario: DNI para incluir solo las mascotas de ese propietario, o None para todas.
+
+    Retorno:
+        Un diccionario id_mascota -> {mes (1 a 12): total}.
+    """
+    if not anio.isdigit() or len(anio) != 4:
+        raise ValueError("Año inválido.")
+    mascotas = almacen.obtener("mascotas")
+    vacio = 0 if campo == "cantidad" else 0.0
+
+    #Crea estructura base con una fila por mascota (por ID, para no mezclar mascotas con el mismo nombre)
+    matriz = {id_masc: {m: vacio for m in range(1, 13)} for id_masc, datos in mascotas.items()
+              if propietario is None or datos["propietario"] == propietario}
+
+    #Completa datos con los totales mensuales ya calculados por el almacén
+    for id_masc, meses in almacen.resumen_anual(anio, propietario).items():
+        if id_masc in matriz:
+            for mes, totales in meses.items():
+                matriz[id_masc][mes] = totales[campo]
+    return matriz
+
+def agrupar_atenciones(claves, campo="cantidad", periodo="", procesos=None):
+    """
+    Informe genérico de atenciones agrupadas: suma un campo (o cuenta atenciones) por cada
+    combinación de valores de las claves, por ejemplo por ('propietario', 'mes') o por ('motivo',).
+    Las atenciones se recorren por meses; con muchas atenciones, los meses se reparten entre
+    varios procesos y después se suman los resultados parciales.
+
+    Parametros:
+        claves: Lista de claves de agrupación: 'anio', 'mes', 'dia', 'mascota', 'propietario',
+                'motivo', 'diagnostico' o 'tratamiento'.
+        campo: 'cantidad', 'costo', 'costo_veterinario' o 'costo_medicamentos'.
+        periodo: '' para todas las atenciones, 'AAAA' para un año o 'AAAA.MM' para un mes.
+        procesos: Cantidad de procesos; None usa uno por núcleo y 1 fuerza un solo proceso.
+
+    Retorno:
+        Un diccionario ordenado tupla_de_valores -> total.
+    """
+    claves = tuple(claves)
+    if not claves or any(clave not in CLAVES_AGRUPACION for clave in claves):
+        raise ValueError(f"Claves inválidas (opciones: {', '.join(CLAVES_AGRUPACION)}).")
+    if campo not in CAMPOS_AGRUPACION:
+        raise ValueError(f"Campo inválido (opciones: {', '.join(CAMPOS_AGRUPACION)}).")
+    if periodo and not re.match(r"^\d{4}(\.\d{2})?$", periodo):
+        raise ValueError("Período inválido.")
+
+    totales = {}
+    for parcial in procesar_fragmentos(agrupar_fragmento, almacen.fragmentos(periodo), (claves, campo), procesos):
+        for grupo, total in parcial.items():
+            totales[grupo] = totales.get(grupo, 0) + total
+    return {grupo: totales[grupo] for grupo in sorted(totales)}
+
+def lineas_atenciones_mes(mes, atenciones, mascotas, propietarios):
+    """
+    Arma, línea por línea, la tabla de atenciones de un mes que muestra el menú. Si no hay
+    atenciones no genera ninguna línea.
+
+    Parametros:
+        mes: Mes del informe ('AAAA.MM').
+        atenciones: Iterable de pares (id_atencion, datos) ordenados por fecha.
+        mascotas: Diccionario de mascotas (para los nombres).
+        propietarios: Diccionario de propietarios (para los nombres).
+
+    Retorno:
+        Un generador de líneas de texto.
+    """
+    encabezado = False
+    for id_at, datos in atenciones:
+        if not encabezado:
+            yield f"\nATENCIONES DEL MES {mes}"
+            yield "-" * 90
+            yield f"{'Fecha/Hora':<20} {'Cliente':<25} {'Mascota':<15} {'Vet.':>7} {'Med.':>7} {'Total':>10}"
+            yield "-" * 90
+            encabezado = True
+
+        nombre_mascota = mascotas[datos["mascota"]]["nombre"]
+        nombre_cliente = propietarios[datos["propietario"]]["nombre"]
+        yield (f"{id_at[:19]:<20} {nombre_cliente:<25} {nombre_mascota:<15} "
+               f"{datos['costo_veterinario']:>7.2f} {datos['costo_medicamentos']:>7.2f} {datos['costo']:>10.2f}")
+
+def lineas_resumen_anual(titulo, anio, matriz, mascotas, montos=False):
+    """
+    Arma, línea por línea, la matriz de totales por mascota y mes que muestra el menú.
+
+    Parametros:
+        titulo: Título del informe (por ejemplo 'CANTIDADES TOTALES POR MES').
+        anio: Año del informe ('AAAA').
+        matriz: Diccionario id_mascota -> {mes (1 a 12): total}, como el de resumen_anual().
+        mascotas: Diccionario de mascotas (para los nombres).
+        montos: True si los totales son montos (se muestran sin decimales).
+
+    Retorno:
+        Un generador de líneas de texto.
+    """
+    yield f"\n{titulo}"
+    yield "-" * 145
+    nombres_meses = ["ENE", "FEB", "MAR", "ABR", "MAY", "JUN", "JUL", "AGO", "SEP", "OCT", "NOV", "DIC"]
+    yield f"{'Mascota':<17}{'ID':<10}" + "".join([f"{nombre + '.' + anio[-2:]:>10}" for nombre in nombres_meses])
+    yield "-" * 145
+
+    for id_masc, meses in matriz.items():
+        fila = f"{mascotas[id_masc]['nombre'][:16]:<17}{id_masc:<10}"
+        for m in range(1, 13):
+            fila += f"{int(meses[m]) if montos else meses[m]:>10}"
+        yield fila
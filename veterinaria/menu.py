@@ -0,0 +1,950 @@
+"""
+----------------------------------------------------------------------------------------------
+Título: Sistema de Gestión Veterinaria - Menú
+Fecha: 31/05/2025
+Autor: Grupo 6
+
+Descripción:
+Menú interactivo de consola: pide los datos al usuario, llama a las funciones de servicio
+y muestra los resultados.
+----------------------------------------------------------------------------------------------
+"""
+
+#----------------------------------------------------------------------------------------------
+# MÓDULOS
+#----------------------------------------------------------------------------------------------
+import time
+import json
+import re
+
+from .almacenamiento import CLAVES_AGRUPACION, almacen
+from .importacion import guardar_rechazados, importar_archivo
+from .informes import agrupar_atenciones, lineas_atenciones_mes, lineas_resumen_anual, resumen_anual
+from .servicios import (actualizar_mascota, actualizar_propietario, buscar_atenciones, buscar_propietarios,
+                        consultar_atenciones, crear_atencion, crear_mascota, crear_propietario, desactivar_mascota,
+                        desactivar_propietario, historial_atenciones, mascotas_activas, propietarios_activos,
+                        sugerir_mascotas, sugerir_propietarios)
+from .validacion import contiene_numeros, validar_email, validar_telefono
+
+#----------------------------------------------------------------------------------------------
+# FUNCIONES DEL MENÚ
+#----------------------------------------------------------------------------------------------
+
+def mostrar_sugerencias_propietarios(texto):
+    """
+    Muestra los propietarios que coinciden con lo ingresado en lugar de un DNI (comienzo del
+    nombre, email o teléfono), para elegir entre ellos.
+
+    Parametros:
+        texto: Lo ingresado.
+
+    Retorno:
+        True si se mostró algún propietario.
+    """
+    encontrados = sugerir_propietarios(texto) if texto.strip() else []
+    if encontrados:
+        print("Propietarios que coinciden:")
+        for dni, datos in encontrados:
+            print(f"  {dni} - {datos['nombre']} ({datos['email']}){'' if datos['activo'] else ' - inactivo'}")
+    return bool(encontrados)
+
+def mostrar_sugerencias_mascotas(texto):
+    """
+    Muestra las mascotas cuyo nombre empieza con lo ingresado en lugar de un ID, para elegir entre ellas.
+
+    Parametros:
+        texto: Lo ingresado.
+
+    Retorno:
+        True si se mostró alguna mascota.
+    """
+    encontradas = sugerir_mascotas(texto) if texto.strip() else []
+    if encontradas:
+        print("Mascotas que coinciden:")
+        for id_masc, datos in encontradas:
+            print(f"  {id_masc} - {datos['nombre']} ({datos['especie']}, propietario {datos['propietario']})"
+                  f"{'' if datos['activo'] else ' - inactiva'}")
+    return bool(encontradas)
+
+def ingresar_propietario():
+    """
+    Pide datos de un nuevo propietario y lo agrega al archivo 'propietarios.json'. Verifica que todos los datos sean correctos antes de continuar. 
+    """
+    try:
+        propietarios = almacen.obtener("propietarios") #Obtiene los datos de 'propietarios.json' desde el almacén en memoria
+    except Exception as e:
+        print("Error al cargar propietarios:", e)
+        return
+    
+    dni = input("Ingrese DNI del propietario (8 dígitos): ")
+    while len(dni) != 8 or not dni.isdigit() or dni in propietarios:
+        print("DNI inválido o ya registrado.")
+        dni = input("Ingrese DNI del propietario (8 dígitos): ")
+    
+    nombre = input("Nombre completo: ").strip()
+    while not nombre or contiene_numeros(nombre):
+        print("El nombre no puede estar vacío ni contener números.")
+        nombre = input("Nombre completo: ").strip()
+
+    direccion = input("Dirección: ").strip()
+    
+    email = input("Email: ").strip()
+    while not validar_email(email):
+        print("Email inválido.")
+        email = input("Email: ").strip()
+    
+    tel1 = input("Teléfono principal (10 dígitos): ").strip()
+    while not validar_telefono(tel1):
+        print("Teléfono inválido.")
+        tel1 = input("Teléfono principal (10 dígitos): ").strip()
+    
+    tel_emergencia = input("Teléfono de emergencia (10 dígitos): ").strip()
+    while not validar_telefono(tel_emergencia):
+        print("Teléfono inválido.")
+        tel_emergencia = input("Teléfono de emergencia (10 dígitos): ").strip()
+    
+    try:
+        crear_propietario(dni, nombre, direccion, email, tel1, tel_emergencia) #Agrega el propietario y lo guarda en el archivo json
+    except ValueError as e:
+        print(e)
+        return
+    print(f"Propietario {nombre} registrado con éxito.")
+    return 
+
+def modificar_propietario():
+    """
+    Permite cambiar datos de un propietario activo.
+    """
+    try:
+        propietarios = almacen.obtener("propietarios") #Obtiene los datos de 'propietarios.json' desde el almacén en memoria
+    except Exception as e:
+        print("Error al cargar propietarios:", e)
+        return
+    
+    dni = input("Ingrese DNI del propietario a modificar (o nombre, email o teléfono para buscarlo; 0 para cancelar): ").strip()
+    if dni == "0":  #Utiliza 0 para salir sin modificar 
+        return 
+
+    while dni not in propietarios or not propietarios[dni]["activo"]:  #Verifica que el propietario a mofificar este activo en el sistema 
+        print("Propietario no encontrado o inactivo.")
+        if not mostrar_sugerencias_propietarios(dni): #Si lo ingresado no era un DNI, muestra los que coinciden para elegir
+            return
+        dni = input("Ingrese DNI del propietario a modificar (0 para cancelar): ").strip()
+        if dni == "0":
+            return
+
+    print("\nDatos actuales:")
+    print(f"Nombre: {propietarios[dni]['nombre']}")
+    print(f"Dirección: {propietarios[dni]['direccion']}")
+    print(f"Email: {propietarios[dni]['email']}")
+    print(f"Teléfono: {propietarios[dni]['telefonos']['principal']}")
+    print(f"Teléfono emergencia: {propietarios[dni]['telefonos']['emergencia']}")
+    
+    print("\nIngrese nuevos datos (dejar vacío para mantener el actual):") 
+    
+    #Vuelve a pedir todos los datos
+    nombre = input(f"Nombre [{propietarios[dni]['nombre']}]: ").strip()
+    while nombre and contiene_numeros(nombre):
+        print("El nombre no puede contener números.")
+        nombre = input(f"Nombre [{propietarios[dni]['nombre']}]: ").strip()
+    
+    direccion = input(f"Dirección [{propietarios[dni]['direccion']}]: ").strip()
+    
+    email = input(f"Email [{propietarios[dni]['email']}]: ").strip()
+    if not validar_email(email): #Un email inválido mantiene el actual
+        email = ""
+    
+    tel1 = input(f"Teléfono principal [{propietarios[dni]['telefonos']['principal']}]: ").strip()
+    if not validar_telefono(tel1):
+        tel1 = ""
+
+    tel_emergencia = input(f"Teléfono emergencia [{propietarios[dni]['telefonos']['emergencia']}]: ").strip()
+    if not validar_telefono(tel_emergencia):
+        tel_emergencia = ""
+    
+    try:
+        actualizar_propietario(dni, nombre, direccion, email, tel1, tel_emergencia) #Guarda el propietario modificado al archivo json
+    except ValueError as e:
+        print(e)
+        return
+    print("Propietario actualizado con éxito.")
+    return 
+
+def eliminar_propietario():
+    """
+    Marca a un propietario como inactivo (no lo borra del sistema).    
+    """
+    dni = input("Ingrese DNI del propietario a eliminar (0 para cancelar): ")
+    if dni == "0": #Utiliza 0 para salir sin modificar 
+        return 
+
+    try:
+        desactivar_propietario(dni) #Marca propietario como inactivo y lo guarda al archivo json
+    except ValueError as e:
+        print(e)
+        return
+    except Exception as e:
+        print("Error al cargar propietarios:", e)
+        return
+    print("Propietario marcado como inactivo.")
+    return 
+
+def listar_propietarios_activos():
+    """
+    Muestra todos los propietarios que estén activos.    
+    """
+    try:
+        activos = propietarios_activos() #Obtiene los propietarios activos desde el almacén en memoria
+    except Exception as e:
+        print("Error al cargar propietarios:", e)
+        return
+    
+    if not activos:
+        print("No hay propietarios activos.")
+    else:
+        print("\n--- PROPIETARIOS ACTIVOS ---")
+        for dni, datos in activos.items():
+            print(f"\nDNI: {dni}")
+            print(f"Nombre: {datos['nombre']}")
+            print(f"Dirección: {datos['direccion']}")
+            print(f"Email: {datos['email']}")
+            print(f"Teléfono: {datos['telefonos']['principal']}")
+            print(f"Teléfono emergencia: {datos['telefonos']['emergencia']}")
+            print("----------------------")
+    return
+
+def busqueda_propietarios():
+    """
+    Busca propietarios por palabras de su nombre o dirección y muestra los más relevantes.
+    """
+    texto = input("Palabras a buscar en nombre o dirección (0 para cancelar): ")
+    if texto == "0":
+        return
+
+    try:
+        encontrados = buscar_propietarios(texto)
+    except ValueError as e:
+        print(e)
+        return
+
+    if not encontrados:
+        print("No se encontraron propietarios.")
+    else:
+        print(f"\n--- PROPIETARIOS ENCONTRADOS: {len(encontrados)} ---")
+        for dni, datos in encontrados:
+            print(f"\nDNI: {dni}{'' if datos['activo'] else ' (inactivo)'}")
+            print(f"Nombre: {datos['nombre']}")
+            print(f"Dirección: {datos['direccion']}")
+            print(f"Email: {datos['email']}")
+            print("----------------------")
+    return
+
+def ingresar_mascota():
+    """
+    Pide datos de una mascota y la asocia a un propietario activo.    
+    """
+    try:
+        propietarios = almacen.obtener("propietarios") #Obtiene los datos de 'propietarios.json' desde el almacén en memoria
+    except Exception as e:
+        print("Error al cargar propietarios:", e)
+        return
+
+    dni_prop = input("DNI del propietario (o nombre, email o teléfono para buscarlo; 0 para cancelar): ").strip()
+    if dni_prop == "0": #Utiliza 0 para salir sin modificar 
+        return 
+
+    while dni_prop not in propietarios or not propietarios[dni_prop]["activo"]: #Verifica que el propietario este activo en el sistema hasta que se ingrese uno activo
+        print("Propietario no registrado o inactivo.")
+        mostrar_sugerencias_propietarios(dni_prop)
+        dni_prop = input("DNI del propietario (0 para cancelar): ").strip()
+        if dni_prop == "0":
+            return 
+        
+    #Una vez verificado el propietario, se piden todos los datos de la mascota con sus respectivas verificaciones
+    nombre = input("Nombre de la mascota: ").strip()
+    while not nombre or contiene_numeros(nombre):
+        print("El nombre no puede estar vacío ni contener números.")
+        nombre = input("Nombre de la mascota: ").strip()
+
+    sexo = input("Sexo: ").strip()
+    while not sexo or contiene_numeros(sexo):
+        print("El sexo no puede estar vacío ni contener números.")
+        sexo = input("Sexo: ").strip()
+
+    especie = input("Especie: ").strip()
+    while not especie or contiene_numeros(especie):
+        print("La especie no puede estar vacía ni contener números.")
+        especie = input("Especie: ").strip()
+
+    raza = input("Raza: ").strip()
+    while contiene_numeros(raza):
+        print("La raza no puede contener números.")
+        raza = input("Raza: ").strip()
+
+    edad = input("Edad: ").strip()
+    while not edad.isdigit():
+        print("La edad debe ser un número.")
+        edad = input("Edad: ").strip()
+    
+    peso = input("Peso (kg): ").strip()
+    while not peso.replace('.', '', 1).isdigit():
+        print("El peso debe ser un número.")
+        peso = input("Peso (kg): ").strip()
+    
+    try:
+        id_mascota = crear_mascota(dni_prop, nombre, sexo, especie, raza, edad, peso) #Agrega la mascota y la guarda al archivo json
+    except ValueError as e:
+        print(e)
+        return
+    print(f"Mascota {nombre} registrada con ID: {id_mascota}")
+    return 
+
+def modificar_mascota():
+    """
+    Permite cambiar datos de una mascota activa (nombre, sexo, especie, raza, edad y peso).    
+    """
+    try:
+        mascotas = almacen.obtener("mascotas") #Obtiene los datos de 'mascotas.json' desde el almacén en memoria
+    except Exception as e:
+        print("Error al cargar mascotas:", e)
+        return
+        
+    id_masc = input("Ingrese ID de la mascota a modificar (0 para cancelar): ")
+    if id_masc == "0":  #Utiliza 0 para salir sin modificar 
+        return 
+    
+    if id_masc in mascotas and mascotas[id_masc]["activo"]: #Verifica que la mascota ingresada este activo en el sistema 
+        print("\nDatos actuales:")
+        print(f"Nombre: {mascotas[id_masc]['nombre']}")
+        print(f"Sexo: {mascotas[id_masc]['sexo']}")
+        print(f"Especie: {mascotas[id_masc]['especie']}")
+        print(f"Raza: {mascotas[id_masc]['raza']}")
+        print(f"Edad: {mascotas[id_masc]['edad']} años")
+        print(f"Peso: {mascotas[id_masc]['peso']} kg")
+        print(f"Propietario: {mascotas[id_masc]['propietario']}")
+        
+        #Una vez verificada, se vuelve a pedir todos los datos de la mascota 
+        print("\nIngrese nuevos datos (dejar vacío para mantener el actual):")
+        
+        nombre = input(f"Nombre [{mascotas[id_masc]['nombre']}]: ").strip()
+        while nombre and contiene_numeros(nombre):
+            print("El nombre no puede contener números.")
+            nombre = input(f"Nombre [{mascotas[id_masc]['nombre']}]: ").strip()
+        
+        sexo = input(f"Sexo [{mascotas[id_masc]['sexo']}]: ").strip()
+        while sexo and contiene_numeros(sexo):
+            print("El sexo no puede contener números.")
+            sexo = input(f"Sexo [{mascotas[id_masc]['sexo']}]: ").strip()
+
+        especie = input(f"Especie [{mascotas[id_masc]['especie']}]: ").strip()
+        while especie and contiene_numeros(especie):
+            print("La especie no puede contener números.")
+            especie = input(f"Especie [{mascotas[id_masc]['especie']}]: ").strip()
+
+        raza = input(f"Raza [{mascotas[id_masc]['raza']}]: ").strip()
+        while raza and contiene_numeros(raza):
+            print("La raza no puede contener números.")
+            raza = input(f"Raza [{mascotas[id_masc]['raza']}]: ").strip()
+
+        edad = input(f"Edad [{mascotas[id_masc]['edad']}]: ").strip()
+        if not edad.isdigit(): #Una edad inválida mantiene la actual
+            edad = ""
+        
+        peso = input(f"Peso [{mascotas[id_masc]['peso']}]: ").strip()
+        if not peso.replace('.', '', 1).isdigit():
+            peso = ""
+        
+        try:
+            actualizar_mascota(id_masc, nombre, sexo, especie, raza, edad, peso) #Guarda la mascota modificada al archivo json
+        except ValueError as e:
+            print(e)
+            return
+        print("Mascota actualizada con éxito.")
+    else:
+        print("Mascota no encontrada o inactiva.")
+    return 
+
+def eliminar_mascota():
+    """
+    Marca una mascota como inactiva (no la borra del diccionario)    
+    """
+    id_masc = input("Ingrese ID de la mascota a modificar (0 para cancelar): ")
+    if id_masc == "0": #Utiliza 0 para salir sin modificar 
+        return 
+    
+    try:
+        desactivar_mascota(id_masc) #Marca mascota como inactiva y la guarda al archivo json
+    except ValueError as e:
+        print(e)
+        return
+    except Exception as e:
+        print("Error al cargar mascotas:", e)
+        return
+    print("Mascota marcada como inactiva.")
+    return 
+
+def listar_mascotas_activas():
+    """
+    Muestra todas las mascotas que estén activas.    
+    """
+    try:
+        activas = mascotas_activas() #Obtiene las mascotas activas desde el almacén en memoria
+    except Exception as e:
+        print("Error al cargar mascotas:", e)
+        return
+    
+    if not activas:
+        print("No hay mascotas activas.")
+    else:
+        print("\n--- MASCOTAS ACTIVAS ---")
+        for id_masc, datos in activas.items():
+            print(f"\nID: {id_masc}")
+            print(f"Nombre: {datos['nombre']}")
+            print(f"Sexo: {datos['sexo']}")
+            print(f"Especie: {datos['especie']}")
+            print(f"Raza: {datos['raza']}")
+            print(f"Edad: {datos['edad']} años")
+            print(f"Peso: {datos['peso']} kg")
+            print(f"Propietario: {datos['propietario']}")
+            print("----------------------")
+    return
+
+def registrar_atencion():
+    """
+    Registra una nueva atención para una mascota activa con detalle de costos separados.
+    """
+    try:
+        mascotas = almacen.obtener("mascotas") #Obtiene los datos de 'mascotas.json' desde el almacén en memoria
+    except Exception as e:
+        print("Error al cargar mascotas:", e)
+        return
+    
+    id_masc = input("ID de la mascota atendida (o su nombre para buscarla; 0 para cancelar): ")
+    if id_masc == "0":  #Utiliza 0 para salir sin modificar 
+        return 
+
+    while id_masc not in mascotas or not mascotas[id_masc]["activo"]: #Verifica que la mascota este activa en el sistema hasta que se ingrese una valida
+        print("Mascota no registrada o inactiva.")
+        mostrar_sugerencias_mascotas(id_masc)
+        id_masc = input("ID de la mascota atendida (0 para cancelar): ")
+        if id_masc == "0":
+            return 
+    
+    motivo = input("Motivo de la consulta: ").strip()
+    while not motivo:
+        print("El motivo no puede estar vacío.")
+        motivo = input("Motivo de la consulta: ").strip()
+    
+    diagnostico = input("Diagnóstico: ").strip()
+    tratamiento = input("Tratamiento indicado: ").strip()
+    
+    costo_vet = input("Costo del veterinario: ").strip()
+    while not costo_vet.replace('.', '', 1).isdigit():
+        print("Debe ingresar un número.")
+        costo_vet = input("Costo del veterinario: ").strip()
+    
+    costo_med = input("Costo de medicamentos: ").strip()
+    while not costo_med.replace('.', '', 1).isdigit():
+        print("Debe ingresar un número.")
+        costo_med = input("Costo de medicamentos: ").strip()
+    
+    try:
+        id_atencion = crear_atencion(id_masc, motivo, diagnostico, tratamiento, costo_vet, costo_med)
+    except ValueError as e:
+        print(e)
+        return
+    print(f"Atención registrada con ID: {id_atencion}")
+    return 
+
+def listar_atenciones():
+    """
+    Muestra todas las atenciones guardadas con datos completos.
+    """
+    try:
+        mascotas = almacen.obtener("mascotas") #Obtiene los datos de 'mascotas.json' desde el almacén en memoria
+    except Exception as e:
+        print("Error al cargar mascotas:", e)
+        return
+    
+    hay_atenciones = False
+    for id_atencion, datos in consultar_atenciones(): #Recorre las atenciones sin armar una copia de todas
+        if not hay_atenciones:
+            print("\n--- TODAS LAS ATENCIONES ---")
+            hay_atenciones = True
+        print(f"\nID: {id_atencion}")
+        print(f"Mascota: {datos['mascota']} ({mascotas[datos['mascota']]['nombre']})")
+        print(f"Propietario: {datos['propietario']}")
+        print(f"Motivo: {datos['motivo']}")
+        print(f"Diagnóstico: {datos['diagnostico']}")
+        print(f"Tratamiento: {datos['tratamiento']}")
+        print(f"Costo veterinario: ${datos['costo_veterinario']:.2f}")
+        print(f"Costo medicamentos: ${datos['costo_medicamentos']:.2f}")
+        print(f"Total: ${datos['costo']:.2f}")
+        print("----------------------")
+
+    if not hay_atenciones:
+        print("No hay atenciones registradas.")
+    return 
+
+def busqueda_atenciones():
+    """
+    Busca atenciones por palabras del motivo, diagnóstico o tratamiento y muestra las más relevantes.
+    """
+    try:
+        mascotas = almacen.obtener("mascotas") #Obtiene los datos de 'mascotas.json' desde el almacén en memoria
+    except Exception as e:
+        print("Error al cargar mascotas:", e)
+        return
+
+    texto = input("Palabras a buscar en motivo, diagnóstico o tratamiento (0 para cancelar): ")
+    if texto == "0":
+        return
+
+    try:
+        encontradas = buscar_atenciones(texto)
+    except ValueError as e:
+        print(e)
+        return
+
+    if not encontradas:
+        print("No se encontraron atenciones.")
+    else:
+        print(f"\n--- ATENCIONES ENCONTRADAS: {len(encontradas)} ---")
+        for id_atencion, datos in encontradas:
+            print(f"\nID: {id_atencion}")
+            print(f"Mascota: {datos['mascota']} ({mascotas[datos['mascota']]['nombre']})")
+            print(f"Propietario: {datos['propietario']}")
+            print(f"Motivo: {datos['motivo']}")
+            print(f"Diagnóstico: {datos['diagnostico']}")
+            print(f"Tratamiento: {datos['tratamiento']}")
+            print(f"Total: ${datos['costo']:.2f}")
+            print("----------------------")
+    return
+
+
+def atenciones_mes():
+    """
+    Muestra las atenciones realizadas en el mes actual en formato tabular.
+    """
+    try:
+        mascotas = almacen.obtener("mascotas") #Obtiene los datos de 'mascotas.json' desde el almacén en memoria
+    except Exception as e:
+        print("Error al cargar mascotas:", e)
+        return
+    
+    try:
+        propietarios = almacen.obtener("propietarios") #Obtiene los datos de 'propietarios.json' desde el almacén en memoria
+    except Exception as e:
+        print("Error al cargar propietarios:", e)
+        return
+    
+    mes_actual = time.strftime("%Y.%m")
+    hay_atenciones = False
+
+    #Crea una tabla mostrando todos los datos de las atenciones del mes a medida que se leen
+    atenciones = consultar_atenciones(mes_actual, mes_actual) #Usa el índice por fecha para recorrer solo las del mes
+    for linea in lineas_atenciones_mes(mes_actual, atenciones, mascotas, propietarios):
+        print(linea)
+        hay_atenciones = True
+
+    if not hay_atenciones:
+        print(f"No hay atenciones registradas en el mes actual ({mes_actual}).") 
+    return 
+
+def resumen_anual_atenciones_cantidades():
+    """
+    Muestra una matriz con la cantidad de atenciones por mascota y mes del año solicitado.
+    """
+    try:
+        mascotas = almacen.obtener("mascotas") #Obtiene los datos de 'mascotas.json' desde el almacén en memoria
+    except Exception as e:
+        print("Error al cargar mascotas:", e)
+        return
+
+    anio = input("Ingrese el año a consultar (formato AAAA): ").strip()
+    while not anio.isdigit() or len(anio) != 4:
+        print("Año inválido.")
+        anio = input("Ingrese el año a consultar (formato AAAA): ").strip()
+
+    matriz = resumen_anual(anio, "cantidad") #Una fila por mascota con la cantidad de atenciones de cada mes
+
+    #Muestra encabezado y una fila por mascota
+    for linea in lineas_resumen_anual("CANTIDADES TOTALES POR MES", anio, matriz, mascotas):
+        print(linea)
+    return 
+
+def resumen_anual_atenciones_pesos():
+    """
+    Muestra una matriz con los montos totales de atención por mascota y mes del año solicitado.
+    """
+    try:
+        mascotas = almacen.obtener("mascotas") #Obtiene los datos de 'mascotas.json' desde el almacén en memoria
+    except Exception as e:
+        print("Error al cargar mascotas:", e)
+        return
+
+    anio = input("Ingrese el año a consultar (formato AAAA): ").strip()
+    while not anio.isdigit() or len(anio) != 4:
+        print("Año inválido.")
+        anio = input("Ingrese el año a consultar (formato AAAA): ").strip()
+
+    matriz = resumen_anual(anio, "costo") #Una fila por mascota con el monto total de cada mes
+
+    #Muestra encabezado y una fila por mascota
+    for linea in lineas_resumen_anual("PESOS TOTALES POR MES", anio, matriz, mascotas, montos=True):
+        print(linea)
+    return 
+
+def atenciones_propietario():
+    """
+    Muestra las atenciones de todas las mascotas de un propietario entre dos fechas.
+    """
+    try:
+        propietarios = almacen.obtener("propietarios") #Obtiene los datos de 'propietarios.json' desde el almacén en memoria
+    except Exception as e:
+        print("Error al cargar propietarios:", e)
+        return
+
+    try:
+        mascotas = almacen.obtener("mascotas") #Obtiene los datos de 'mascotas.json' desde el almacén en memoria
+    except Exception as e:
+        print("Error al cargar mascotas:", e)
+        return
+
+    dni = input("DNI del propietario (0 para cancelar): ").strip()
+    if dni == "0":
+        return
+    if dni not in propietarios:
+        print("Propietario no encontrado.")
+        return
+
+    formato = r"^\d{4}(\.\d{2}(\.\d{2})?)?$"
+    desde = input("Desde (AAAA, AAAA.MM o AAAA.MM.DD, vacío para el comienzo): ").strip()
+    while desde and not re.match(formato, desde):
+        print("Fecha inválida.")
+        desde = input("Desde (AAAA, AAAA.MM o AAAA.MM.DD, vacío para el comienzo): ").strip()
+
+    hasta = input("Hasta (AAAA, AAAA.MM o AAAA.MM.DD, vacío para hoy): ").strip()
+    while hasta and not re.match(formato, hasta):
+        print("Fecha inválida.")
+        hasta = input("Hasta (AAAA, AAAA.MM o AAAA.MM.DD, vacío para hoy): ").strip()
+
+    hay_atenciones = False
+    total = 0.0
+    for id_at, datos in consultar_atenciones(desde, hasta, propietario=dni): #Usa el índice por propietario
+        if not hay_atenciones:
+            print(f"\nATENCIONES DE {propietarios[dni]['nombre'].upper()}")
+            print("-" * 90)
+            print(f"{'Fecha/Hora':<20} {'Mascota':<15} {'Motivo':<30} {'Total':>10}")
+            print("-" * 90)
+            hay_atenciones = True
+        nombre_mascota = mascotas[datos["mascota"]]["nombre"] if datos["mascota"] in mascotas else datos["mascota"]
+        print(f"{id_at[:19]:<20} {nombre_mascota:<15} {datos['motivo'][:30]:<30} {datos['costo']:>10.2f}")
+        total += datos["costo"]
+
+    if not hay_atenciones:
+        print("No hay atenciones registradas para ese propietario en el período.")
+    else:
+        print("-" * 90)
+        print(f"{'Total':<67} {total:>10.2f}")
+    return
+
+def atenciones_agrupadas():
+    """
+    Muestra el total de atenciones (cantidad o montos) agrupadas por las claves que elija el usuario.
+    """
+    periodo = input("Período (AAAA o AAAA.MM, vacío para todas): ").strip()
+    print("Claves: " + ", ".join(CLAVES_AGRUPACION))
+    claves = [clave.strip() for clave in input("Agrupar por (separadas por coma): ").split(",") if clave.strip()]
+    campo = input("Campo a sumar (cantidad, costo, costo_veterinario, costo_medicamentos; vacío para cantidad): ").strip() or "cantidad"
+
+    try:
+        totales = agrupar_atenciones(claves, campo, periodo)
+    except ValueError as e:
+        print(e)
+        return
+
+    if not totales:
+        print("No hay atenciones registradas en el período.")
+        return
+    ancho = max(len(" / ".join(map(str, grupo))) for grupo in totales)
+    ancho = max(ancho, len(" / ".join(claves)))
+    print(f"\nATENCIONES AGRUPADAS POR {' / '.join(claves).upper()}")
+    print("-" * (ancho + 16))
+    print(f"{' / '.join(claves):<{ancho}} {campo[:15]:>15}")
+    print("-" * (ancho + 16))
+    for grupo, total in totales.items():
+        valor = f"{total}" if campo == "cantidad" else f"{total:.2f}"
+        print(f"{' / '.join(map(str, grupo)):<{ancho}} {valor:>15}")
+    return
+
+def historial_mascota():
+    """
+    Muestra el historial completo con todas las atenciones de la mascota ingresada.
+    """
+    try:
+        mascotas = almacen.obtener("mascotas") #Obtiene los datos de 'mascotas.json' desde el almacén en memoria
+    except Exception as e:
+        print("Error al cargar mascotas:", e)
+        return
+
+    id_masc = input("ID de la mascota (0 para cancelar): ")
+    if id_masc == "0":
+        return
+
+    try:
+        historial = historial_atenciones(id_masc) #Obtiene solo las atenciones de esta mascota
+    except ValueError as e:
+        print(e)
+        return
+        
+    print(f"\nHISTORIAL MÉDICO DE {mascotas[id_masc]['nombre'].upper()}")
+    print(f"Especie: {mascotas[id_masc]['especie']}")
+    print(f"Edad: {mascotas[id_masc]['edad']} años")
+    print(f"Propietario: {mascotas[id_masc]['propietario']}\n")
+
+    if not historial:
+        print("No hay atenciones registradas.")
+    else:
+        for id_atencion, datos in historial:
+            print(f"\nFecha: {id_atencion}")
+            print(f"Motivo: {datos['motivo']}")
+            print(f"Diagnóstico: {datos['diagnostico']}")
+            print(f"Tratamiento: {datos['tratamiento']}")
+            print(f"Costo veterinario: ${datos['costo_veterinario']:.2f}")
+            print(f"Costo medicamentos: ${datos['costo_medicamentos']:.2f}")
+            print(f"Total: ${datos['costo']:.2f}")
+            print("----------------------")
+    return 
+
+def importar_datos(tipo):
+    """
+    Importa propietarios, mascotas o atenciones desde un archivo CSV o JSON Lines y muestra cuántos
+    registros se importaron. Los rechazados se guardan en '<archivo>.rechazados.jsonl' con su motivo.
+
+    Parametros:
+        tipo: 'propietarios', 'mascotas' o 'atenciones'.
+    """
+    nombre_archivo = input("Archivo a importar (.csv o .jsonl, vacío para cancelar): ").strip()
+    if not nombre_archivo:
+        return
+
+    try:
+        importados, rechazados = importar_archivo(nombre_archivo, tipo)
+    except OSError as e:
+        print("Error al importar:", e)
+        return
+
+    print(f"Se importaron {importados} {tipo}.")
+    if rechazados:
+        informe = nombre_archivo + ".rechazados.jsonl"
+        guardar_rechazados(informe, rechazados)
+        print(f"Se rechazaron {len(rechazados)} registros (detalle en '{informe}'):")
+        for numero, motivo, registro in rechazados[:10]: #Muestra solo los primeros rechazos
+            print(f"  Línea {numero}: {motivo}")
+    return
+
+def mostrar_menu_principal():
+    """
+    Imprime el menú principal del sistema con las opciones disponibles.
+    """
+    print("\n" + "="*50)
+    print("SISTEMA DE GESTIÓN VETERINARIA")
+    print("="*50)
+    print("[1] Gestión de Propietarios")
+    print("[2] Gestión de Mascotas")
+    print("[3] Gestión de Atenciones")
+    print("[4] Informes")
+    print("[5] Importación de Datos")
+    print("[0] Salir del sistema")
+    print("="*50)
+    return 
+
+def mostrar_submenu(titulo, opciones):
+    """
+    Imprime un submenú con un título y las opciones que pasan como diccionario.    
+    Los parámetros:
+        -titulo: texto que se muestra arriba
+        -opciones: diccionario con clave = número de opción, valor = descripción    
+    Siempre agrega 0 Volver al menú anterior.
+    """
+    print("\n" + "="*50)
+    print(titulo)
+    print("="*50)
+    for key, value in opciones.items():
+        print(f"[{key}] {value}")
+    print("[0] Volver al menú anterior")
+    print("="*50)
+    return 
+
+#----------------------------------------------------------------------------------------------
+# CUERPO PRINCIPAL
+#----------------------------------------------------------------------------------------------
+def main():
+    """
+    Función principal:
+        1) Carga en el almacén los datos de propietarios, mascotas y atenciones.
+        2) Muestra el menú principal y permite navegar a submenu:
+        - 1:Gestión de Propietarios
+        - 2:Gestión de Mascotas
+        - 3:Gestión de Atenciones
+        - 4:Informes
+        - 5:Importación de Datos
+        - 0:Salir del programa
+        3) Cada submenú se repite hasta que el usuario elige '0' para volver.
+    """
+    try:
+        almacen.cargar() #Lee una sola vez los archivos json; el resto de las operaciones trabaja en memoria
+    except (json.JSONDecodeError, OSError) as e:
+        print("No se pudieron cargar los datos del sistema:", e)
+        return
+
+    #-------------------------------------------------
+    # Bloque de menú
+    #----------------------------------------------------------------------------------------------
+    while True:
+        mostrar_menu_principal()
+        opcion = input("\nSeleccione una opción: ")
+        almacen.sincronizar() #Incorpora lo que guardaron otras terminales mientras se esperaba la opción
+        
+        if opcion == "0":
+            almacen.compactar() #Vuelca el diario de atenciones a los archivos json antes de salir
+            print("\nSaliendo del sistema...")
+            break
+            
+        elif opcion == "1":  # Gestión de Propietarios
+            while True:
+                mostrar_submenu("GESTIÓN DE PROPIETARIOS", {
+                    "1": "Ingresar Propietario",
+                    "2": "Modificar Propietario",
+                    "3": "Eliminar Propietario",
+                    "4": "Listado de Propietarios Activos",
+                    "5": "Buscar Propietarios por Nombre o Dirección"
+                })
+                
+                sub_opcion = input("\nSeleccione una opción: ")
+                
+                if sub_opcion == "0":
+                    break
+                elif sub_opcion == "1":
+                    propietarios = ingresar_propietario()
+                elif sub_opcion == "2":
+                    propietarios = modificar_propietario()
+                elif sub_opcion == "3":
+                    propietarios = eliminar_propietario()
+                elif sub_opcion == "4":
+                    listar_propietarios_activos()
+                elif sub_opcion == "5":
+                    busqueda_propietarios()
+                else:
+                    print("Opción inválida.")
+                
+                input("\nPresione ENTER para continuar...")
+                
+        elif opcion == "2":  # Gestión de Mascotas
+            while True:
+                mostrar_submenu("GESTIÓN DE MASCOTAS", {
+                    "1": "Ingresar Mascota",
+                    "2": "Modificar Mascota",
+                    "3": "Eliminar Mascota",
+                    "4": "Listado de Mascotas Activas"
+                })
+                
+                sub_opcion = input("\nSeleccione una opción: ")
+                
+                if sub_opcion == "0":
+                    break
+                elif sub_opcion == "1":
+                    mascotas = ingresar_mascota()
+                elif sub_opcion == "2":
+                    mascotas = modificar_mascota()
+                elif sub_opcion == "3":
+                    mascotas = eliminar_mascota()
+                elif sub_opcion == "4":
+                    listar_mascotas_activas()
+                else:
+                    print("Opción inválida.")
+                
+                input("\nPresione ENTER para continuar...")
+                
+        elif opcion == "3":  # Gestión de Atenciones
+            while True:
+                mostrar_submenu("GESTIÓN DE ATENCIONES", {
+                    "1": "Registro de Atención Veterinaria",
+                    "2": "Listado de Todas las Atenciones",
+                    "3": "Buscar Atenciones por Texto"
+                })
+                
+                sub_opcion = input("\nSeleccione una opción: ")
+                
+                if sub_opcion == "0":
+                    break
+                elif sub_opcion == "1":
+                    atenciones = registrar_atencion()
+                elif sub_opcion == "2":
+                    listar_atenciones()
+                elif sub_opcion == "3":
+                    busqueda_atenciones()
+                else:
+                    print("Opción inválida.")
+                
+                input("\nPresione ENTER para continuar...")
+                
+        elif opcion == "4":  # Informes
+            while True:
+                mostrar_submenu("INFORMES", {
+                    "1": "Atenciones del Mes",
+                    "2": "Resumen Anual de Atenciones por Mascota (Cantidades)",
+                    "3": "Resumen Anual de Atenciones por Mascota (Pesos)",
+                    "4": "Historial médico completo de una Mascota",
+                    "5": "Atenciones de un Propietario entre fechas",
+                    "6": "Atenciones Agrupadas (por mes, mascota, propietario, motivo...)"
+                })
+
+                sub_opcion = input("\nSeleccione una opción: ")
+
+                if sub_opcion == "0":
+                    break
+                elif sub_opcion == "1":
+                    atenciones_mes()
+                elif sub_opcion == "2":
+                    resumen_anual_atenciones_cantidades()
+                elif sub_opcion == "3":
+                    resumen_anual_atenciones_pesos()
+                elif sub_opcion == "4":
+                    historial_mascota()
+                elif sub_opcion == "5":
+                    atenciones_propietario()
+                elif sub_opcion == "6":
+                    atenciones_agrupadas()
+                else:
+                    print("Opción inválida.")
+
+                input("\nPresione ENTER para continuar...")
+
+        elif opcion == "5":  # Importación de Datos
+            while True:
+                mostrar_submenu("IMPORTACIÓN DE DATOS", {
+                    "1": "Importar Propietarios",
+                    "2": "Importar Mascotas",
+                    "3": "Importar Atenciones"
+                })
+
+                sub_opcion = input("\nSeleccione una opción: ")
+
+                if sub_opcion == "0":
+                    break
+                elif sub_opcion == "1":
+                    importar_datos("propietarios")
+                elif sub_opcion == "2":
+                    importar_datos("mascotas")
+                elif sub_opcion == "3":
+                    importar_datos("atenciones")
+                else:
+                    print("Opción inválida.")
+
+                input("\nPresione ENTER para continuar...")
+
+        else:
+            print("Opción inválida.")
+            input("\nPresione ENTER para continuar...")
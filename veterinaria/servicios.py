@@ -0,0 +1,432 @@
+"""
+----------------------------------------------------------------------------------------------
+Título: Sistema de Gestión Veterinaria - Servicios
+Fecha: 31/05/2025
+Autor: Grupo 6
+
+Descripción:
+Funciones de servicio para dar de alta, modificar, dar de baja y consultar propietarios,
+mascotas y atenciones sobre el almacén compartido.
+----------------------------------------------------------------------------------------------
+"""
+
+#----------------------------------------------------------------------------------------------
+# MÓDULOS
+#----------------------------------------------------------------------------------------------
+import re
+import functools
+
+from .almacenamiento import almacen
+from .busqueda import terminos
+from .entidades import Atencion, Mascota, Propietario, Telefonos
+from .validacion import (completar_id_atencion, contiene_numeros, generador_ids, validar_email,
+                         validar_id_atencion, validar_id_atencion_anterior, validar_numero, validar_telefono)
+
+#----------------------------------------------------------------------------------------------
+# SERVICIOS
+#----------------------------------------------------------------------------------------------
+#Funciones sin input() ni print(): reciben los datos ya ingresados, los validan, los guardan en el
+#almacén y devuelven el resultado. Si un dato no es válido lanzan ValueError con el mensaje para
+#el usuario. Las usan las funciones del menú y se pueden llamar desde otros programas (después de
+#cargar el almacén con almacen.cargar()).
+
+def con_bloqueo(funcion):
+    """
+    Hace que una función de servicio que modifica datos se ejecute con el bloqueo del almacén
+    tomado y después de sincronizar(), así las validaciones (por ejemplo, que un DNI no esté
+    registrado) ven también lo que guardaron otras terminales y nadie escribe en el medio.
+
+    Parametros:
+        funcion: Función de servicio a proteger.
+
+    Retorno:
+        La función protegida.
+    """
+    @functools.wraps(funcion)
+    def protegida(*args, **kwargs):
+        with almacen.bloqueo:
+            almacen.sincronizar()
+            return funcion(*args, **kwargs)
+    return protegida
+
+def buscar_propietario_activo(dni):
+    """
+    Busca un propietario activo.
+
+    Parametros:
+        dni: DNI del propietario.
+
+    Retorno:
+        El Propietario con sus datos.
+    """
+    propietarios = almacen.obtener("propietarios")
+    if dni not in propietarios or not propietarios[dni]["activo"]:
+        raise ValueError("Propietario no registrado o inactivo.")
+    return propietarios[dni]
+
+def buscar_mascota_activa(id_masc):
+    """
+    Busca una mascota activa.
+
+    Parametros:
+        id_masc: ID de la mascota.
+
+    Retorno:
+        La Mascota con sus datos.
+    """
+    mascotas = almacen.obtener("mascotas")
+    if id_masc not in mascotas or not mascotas[id_masc]["activo"]:
+        raise ValueError("Mascota no registrada o inactiva.")
+    return mascotas[id_masc]
+
+@con_bloqueo
+def crear_propietario(dni, nombre, direccion, email, tel_principal, tel_emergencia, guardar=True):
+    """
+    Registra un nuevo propietario activo.
+
+    Parametros:
+        dni: DNI de 8 dígitos, que no debe estar registrado.
+        nombre: Nombre completo, sin números.
+        direccion: Dirección (puede estar vacía).
+        email: Email con formato válido.
+        tel_principal: Teléfono principal de 10 dígitos.
+        tel_emergencia: Teléfono de emergencia de 10 dígitos.
+        guardar: Si es False no se escribe en disco (para guardar muchos registros juntos con almacen.guardar()).
+
+    Retorno:
+        El DNI del propietario registrado.
+    """
+    propietarios = almacen.obtener("propietarios")
+    if len(dni) != 8 or not dni.isdigit() or dni in propietarios:
+        raise ValueError("DNI inválido o ya registrado.")
+    if not nombre or contiene_numeros(nombre):
+        raise ValueError("El nombre no puede estar vacío ni contener números.")
+    if not validar_email(email):
+        raise ValueError("Email inválido.")
+    if not validar_telefono(tel_principal) or not validar_telefono(tel_emergencia):
+        raise ValueError("Teléfono inválido.")
+
+    propietarios[dni] = Propietario(True, nombre, direccion, email, Telefonos(tel_principal, tel_emergencia))
+    almacen.marcar("propietarios", dni)
+    if guardar:
+        almacen.guardar()
+    return dni
+
+@con_bloqueo
+def actualizar_propietario(dni, nombre="", direccion="", email="", tel_principal="", tel_emergencia=""):
+    """
+    Cambia los datos de un propietario activo. Los datos vacíos mantienen el valor actual.
+
+    Parametros:
+        dni: DNI del propietario.
+        nombre, direccion, email, tel_principal, tel_emergencia: Nuevos valores, o '' para no cambiarlos.
+
+    Retorno:
+        El diccionario con los datos actualizados del propietario.
+    """
+    datos = buscar_propietario_activo(dni)
+    if nombre and contiene_numeros(nombre):
+        raise ValueError("El nombre no puede contener números.")
+    if email and not validar_email(email):
+        raise ValueError("Email inválido.")
+    if (tel_principal and not validar_telefono(tel_principal)) or (tel_emergencia and not validar_telefono(tel_emergencia)):
+        raise ValueError("Teléfono inválido.")
+
+    if nombre:
+        datos["nombre"] = nombre
+    if direccion:
+        datos["direccion"] = direccion
+    if email:
+        datos["email"] = email
+    if tel_principal:
+        datos["telefonos"]["principal"] = tel_principal
+    if tel_emergencia:
+        datos["telefonos"]["emergencia"] = tel_emergencia
+    almacen.marcar("propietarios", dni)
+    almacen.guardar()
+    return datos
+
+@con_bloqueo
+def desactivar_propietario(dni):
+    """
+    Marca a un propietario como inactivo (no lo borra del sistema).
+
+    Parametros:
+        dni: DNI del propietario.
+    """
+    propietarios = almacen.obtener("propietarios")
+    if dni not in propietarios or not propietarios[dni]["activo"]:
+        raise ValueError("Propietario no encontrado o ya inactivo.")
+    propietarios[dni]["activo"] = False
+    almacen.marcar("propietarios", dni)
+    almacen.guardar()
+
+def propietarios_activos():
+    """
+    Retorno:
+        Un diccionario DNI -> datos con los propietarios activos.
+    """
+    return {dni: datos for dni, datos in almacen.obtener("propietarios").items() if datos["activo"]}
+
+@con_bloqueo
+def crear_mascota(dni_prop, nombre, sexo, especie, raza, edad, peso, id_mascota=None, guardar=True):
+    """
+    Registra una nueva mascota activa de un propietario activo.
+
+    Parametros:
+        dni_prop: DNI del propietario.
+        nombre, sexo, especie: Textos no vacíos y sin números.
+        raza: Texto sin números (puede estar vacío).
+        edad: Edad en años (entero o texto con dígitos).
+        peso: Peso en kg (número o texto).
+        id_mascota: ID de 8 dígitos a usar (por ejemplo al importar de otra clínica), o None para generar uno.
+        guardar: Si es False no se escribe en disco (para guardar muchos registros juntos con almacen.guardar()).
+
+    Retorno:
+        El ID generado para la mascota.
+    """
+    buscar_propietario_activo(dni_prop)
+    if not nombre or contiene_numeros(nombre):
+        raise ValueError("El nombre no puede estar vacío ni contener números.")
+    if not sexo or contiene_numeros(sexo):
+        raise ValueError("El sexo no puede estar vacío ni contener números.")
+    if not especie or contiene_numeros(especie):
+        raise ValueError("La especie no puede estar vacía ni contener números.")
+    if contiene_numeros(raza):
+        raise ValueError("La raza no puede contener números.")
+    if not str(edad).isdigit():
+        raise ValueError("La edad debe ser un número.")
+    peso = validar_numero(peso, "El peso debe ser un número.")
+
+    mascotas = almacen.obtener("mascotas")
+    if id_mascota is not None:
+        if len(id_mascota) != 8 or not id_mascota.isdigit() or id_mascota in mascotas:
+            raise ValueError("ID de mascota inválido o ya registrado.")
+    else:
+        id_mascota = almacen.nuevo_id_mascota() #Toma el próximo ID libre de la secuencia de mascotas
+
+    mascotas[id_mascota] = Mascota(True, nombre, sexo, especie, raza, int(edad), peso, dni_prop, [])
+    almacen.marcar("mascotas", id_mascota)
+    if guardar:
+        almacen.guardar()
+    return id_mascota
+
+@con_bloqueo
+def actualizar_mascota(id_masc, nombre="", sexo="", especie="", raza="", edad="", peso=""):
+    """
+    Cambia los datos de una mascota activa. Los datos vacíos mantienen el valor actual.
+
+    Parametros:
+        id_masc: ID de la mascota.
+        nombre, sexo, especie, raza, edad, peso: Nuevos valores, o '' para no cambiarlos.
+
+    Retorno:
+        El diccionario con los datos actualizados de la mascota.
+    """
+    datos = buscar_mascota_activa(id_masc)
+    for valor, mensaje in ((nombre, "El nombre no puede contener números."),
+                           (sexo, "El sexo no puede contener números."),
+                           (especie, "La especie no puede contener números."),
+                           (raza, "La raza no puede contener números.")):
+        if valor and contiene_numeros(valor):
+            raise ValueError(mensaje)
+    if edad != "" and not str(edad).isdigit():
+        raise ValueError("La edad debe ser un número.")
+    if peso != "":
+        peso = validar_numero(peso, "El peso debe ser un número.")
+
+    for campo, valor in (("nombre", nombre), ("sexo", sexo), ("especie", especie), ("raza", raza)):
+        if valor:
+            datos[campo] = valor
+    if edad != "":
+        datos["edad"] = int(edad)
+    if peso != "":
+        datos["peso"] = peso
+    almacen.marcar("mascotas", id_masc)
+    almacen.guardar()
+    return datos
+
+@con_bloqueo
+def desactivar_mascota(id_masc):
+    """
+    Marca una mascota como inactiva (no la borra del sistema).
+
+    Parametros:
+        id_masc: ID de la mascota.
+    """
+    mascotas = almacen.obtener("mascotas")
+    if id_masc not in mascotas or not mascotas[id_masc]["activo"]:
+        raise ValueError("Mascota no encontrada o ya inactiva.")
+    mascotas[id_masc]["activo"] = False
+    almacen.marcar("mascotas", id_masc)
+    almacen.guardar()
+
+def mascotas_activas():
+    """
+    Retorno:
+        Un diccionario ID -> datos con las mascotas activas.
+    """
+    return {id_masc: datos for id_masc, datos in almacen.obtener("mascotas").items() if datos["activo"]}
+
+def preparar_atencion(id_masc, motivo, diagnostico, tratamiento, costo_veterinario, costo_medicamentos, id_atencion=None):
+    """
+    Valida los datos de una atención de una mascota activa y arma el registro a nombre de su
+    propietario actual, sin guardarlo.
+
+    Parametros:
+        id_masc: ID de la mascota atendida.
+        motivo: Motivo de la consulta (no vacío).
+        diagnostico: Diagnóstico.
+        tratamiento: Tratamiento indicado.
+        costo_veterinario: Costo del veterinario (número o texto).
+        costo_medicamentos: Costo de medicamentos (número o texto).
+        id_atencion: ID de la atención (AAAA.MM.DD HH.MM.SS.ffffff-nnnn, o AAAA.MM.DD HH.MM.SS
+                     del formato anterior, que se completa), o None para generar uno con la hora actual.
+
+    Retorno:
+        Una tupla (id_atencion, datos), con los datos como Atencion.
+    """
+    mascota = buscar_mascota_activa(id_masc)
+    if not motivo:
+        raise ValueError("El motivo no puede estar vacío.")
+    costo_veterinario = validar_numero(costo_veterinario, "Debe ingresar un número.")
+    costo_medicamentos = validar_numero(costo_medicamentos, "Debe ingresar un número.")
+
+    if id_atencion is None:
+        id_atencion = generador_ids.nuevo()  #Crea un id con la fecha y hora actual de la computadora (formato: AAAA.MM.DD HH.MM.SS.ffffff-nnnn)
+    elif validar_id_atencion_anterior(id_atencion):
+        id_atencion = completar_id_atencion(id_atencion)
+    elif not validar_id_atencion(id_atencion):
+        raise ValueError("Fecha de atención inválida (formato AAAA.MM.DD HH.MM.SS).")
+
+    return id_atencion, Atencion(id_masc, mascota["propietario"], motivo, diagnostico, tratamiento,
+                                 costo_veterinario, costo_medicamentos, costo_veterinario + costo_medicamentos)
+
+@con_bloqueo
+def crear_atencion(id_masc, motivo, diagnostico, tratamiento, costo_veterinario, costo_medicamentos):
+    """
+    Registra una atención de una mascota activa, a nombre de su propietario actual.
+
+    Parametros:
+        id_masc: ID de la mascota atendida.
+        motivo: Motivo de la consulta (no vacío).
+        diagnostico: Diagnóstico.
+        tratamiento: Tratamiento indicado.
+        costo_veterinario: Costo del veterinario (número o texto).
+        costo_medicamentos: Costo de medicamentos (número o texto).
+
+    Retorno:
+        El ID de la atención registrada (fecha y hora, formato AAAA.MM.DD HH.MM.SS.ffffff-nnnn).
+    """
+    id_atencion, datos = preparar_atencion(id_masc, motivo, diagnostico, tratamiento, costo_veterinario, costo_medicamentos)
+    while almacen.existe_atencion(id_atencion): #Solo si otra terminal generó el mismo ID
+        id_atencion = generador_ids.nuevo()
+
+    #Agrega la atencion y la entrada del historial de la mascota a traves del diario del almacen
+    almacen.agregar_atencion(id_atencion, datos)
+    return id_atencion
+
+def consultar_atenciones(desde="", hasta="", mascota=None, propietario=None):
+    """
+    Devuelve las atenciones entre dos fechas, opcionalmente de una mascota o de un propietario.
+
+    Parametros:
+        desde: Prefijo de la primera fecha incluida ('AAAA', 'AAAA.MM' o 'AAAA.MM.DD'); '' sin límite.
+        hasta: Prefijo de la última fecha incluida; '' sin límite.
+        mascota: ID de mascota, o None para todas.
+        propietario: DNI de propietario, o None para todos.
+
+    Retorno:
+        Un generador de pares (id_atencion, datos) ordenados por fecha.
+    """
+    formato = r"^\d{4}(\.\d{2}(\.\d{2})?)?$"
+    for fecha in (desde, hasta):
+        if fecha and not re.match(formato, fecha):
+            raise ValueError("Fecha inválida.")
+    if not desde and not hasta and mascota is None and propietario is None:
+        return almacen.iterar_atenciones()
+    return almacen.atenciones_entre(desde, hasta, mascota=mascota, propietario=propietario)
+
+def historial_atenciones(id_masc):
+    """
+    Devuelve todas las atenciones de una mascota (activa o no).
+
+    Parametros:
+        id_masc: ID de la mascota.
+
+    Retorno:
+        Una lista de pares (id_atencion, datos) ordenada por fecha.
+    """
+    if id_masc not in almacen.obtener("mascotas"):
+        raise ValueError("Mascota no encontrada.")
+    return almacen.historial(id_masc)
+
+def buscar_atenciones(texto, limite=20):
+    """
+    Busca atenciones por palabras de su motivo, diagnóstico o tratamiento, sin distinguir
+    mayúsculas ni acentos. No hace falta que contengan todas las palabras: primero aparecen las
+    que contienen más y las menos frecuentes.
+
+    Parametros:
+        texto: Palabras a buscar.
+        limite: Cantidad máxima de resultados.
+
+    Retorno:
+        Una lista de pares (id_atencion, datos) ordenada por relevancia.
+    """
+    if not terminos(texto):
+        raise ValueError("Ingrese al menos una palabra para buscar.")
+    if limite < 1:
+        raise ValueError("El límite debe ser mayor que cero.")
+    return almacen.buscar_atenciones(texto, limite)
+
+def buscar_propietarios(texto, limite=20):
+    """
+    Busca propietarios (activos o no) por palabras de su nombre o dirección, sin distinguir
+    mayúsculas ni acentos.
+
+    Parametros:
+        texto: Palabras a buscar.
+        limite: Cantidad máxima de resultados.
+
+    Retorno:
+        Una lista de pares (dni, datos) ordenada por relevancia.
+    """
+    if not terminos(texto):
+        raise ValueError("Ingrese al menos una palabra para buscar.")
+    if limite < 1:
+        raise ValueError("El límite debe ser mayor que cero.")
+    return almacen.buscar_propietarios(texto, limite)
+
+def sugerir_propietarios(texto, limite=10):
+    """
+    Busca propietarios para elegirlos sin saber el DNI: por email (si el texto tiene '@'), por
+    teléfono principal o de emergencia (si es un número) o por el comienzo de las palabras del
+    nombre ("mar per" encuentra a "María Luisa Pérez"), a medida que se escribe.
+
+    Parametros:
+        texto: Email, teléfono o comienzo del nombre.
+        limite: Cantidad máxima de resultados.
+
+    Retorno:
+        Una lista de pares (dni, datos).
+    """
+    texto = texto.strip()
+    if "@" in texto:
+        return almacen.buscar_por_contacto("email", texto)[:limite]
+    if texto.isdigit():
+        return almacen.buscar_por_contacto("telefono", texto)[:limite]
+    return almacen.buscar_por_nombre("propietarios", texto, limite)
+
+def sugerir_mascotas(texto, limite=10):
+    """
+    Busca mascotas por el comienzo de las palabras de su nombre, a medida que se escribe.
+
+    Parametros:
+        texto: Comienzo del nombre.
+        limite: Cantidad máxima de resultados.
+
+    Retorno:
+        Una lista de pares (id_mascota, datos).
+    """
+    return almacen.buscar_por_nombre("mascotas", texto, limite)
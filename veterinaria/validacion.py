@@ -0,0 +1,161 @@
+"""
+----------------------------------------------------------------------------------------------
+Título: Sistema de Gestión Veterinaria - Validaciones
+Fecha: 31/05/2025
+Autor: Grupo 6
+
+Descripción:
+Formato de los IDs de atenciones y validaciones de los datos que se ingresan (teléfonos,
+emails, nombres y números). No dependen del almacén.
+----------------------------------------------------------------------------------------------
+"""
+
+#----------------------------------------------------------------------------------------------
+# MÓDULOS
+#----------------------------------------------------------------------------------------------
+import time
+import random
+import re
+
+#----------------------------------------------------------------------------------------------
+# FUNCIONES
+#----------------------------------------------------------------------------------------------
+ID_ATENCION = re.compile(r"\d{4}\.\d{2}\.\d{2} \d{2}\.\d{2}\.\d{2}\.\d{6}-[0-9a-f]{4}\Z")
+ID_ATENCION_ANTERIOR = re.compile(r"\d{4}\.\d{2}\.\d{2} \d{2}\.\d{2}\.\d{2}\Z") #Sin fracción de segundo
+
+class GeneradorIdsAtencion:
+    """
+    Genera IDs de atención únicos con el formato 'AAAA.MM.DD HH.MM.SS.ffffff-nnnn': fecha y hora
+    con microsegundos, seguidas de un código de 4 dígitos hexadecimales elegido al azar por cada
+    proceso (cada terminal o servidor). Los IDs de un mismo proceso son estrictamente crecientes:
+    si se piden dos en el mismo microsegundo, o si el reloj retrocede, se usa el microsegundo
+    siguiente al último entregado. Como empiezan con la fecha, el orden alfabético sigue siendo
+    el cronológico y los filtros por prefijo ('AAAA.MM') y los índices por rango no cambian.
+    """
+
+    def __init__(self):
+        self.nodo = "%04x" % random.getrandbits(16)
+        self.ultimo = 0 #Último instante entregado, en microsegundos
+
+    def nuevo(self):
+        """
+        Retorno:
+            Un ID de atención mayor que todos los generados antes por este proceso.
+        """
+        instante = max(time.time_ns() // 1000, self.ultimo + 1)
+        self.ultimo = instante
+        segundos, microsegundos = divmod(instante, 1000000)
+        return time.strftime("%Y.%m.%d %H.%M.%S", time.localtime(segundos)) + ".%06d-%s" % (microsegundos, self.nodo)
+
+generador_ids = GeneradorIdsAtencion()
+
+def validar_fecha_id(id_atencion):
+    """
+    Parametros:
+        id_atencion: ID de atención que ya tiene el formato de ID_ATENCION o ID_ATENCION_ANTERIOR.
+
+    Retorno:
+        True si la fecha y hora del ID existen (por ejemplo, no '2024.99.99 99.99.99').
+    """
+    try:
+        time.strptime(id_atencion[:19], "%Y.%m.%d %H.%M.%S")
+    except ValueError:
+        return False
+    return True
+
+def validar_id_atencion(id_atencion):
+    """
+    Valida un ID de atención del formato actual (AAAA.MM.DD HH.MM.SS.ffffff-nnnn).
+
+    Parametros:
+        id_atencion: La cadena de texto del ID a validar.
+
+    Retorno:
+        True si el ID tiene el formato completo y una fecha y hora reales, False en caso contrario.
+    """
+    return ID_ATENCION.fullmatch(id_atencion) is not None and validar_fecha_id(id_atencion)
+
+def validar_id_atencion_anterior(id_atencion):
+    """
+    Valida un ID de atención del formato anterior (AAAA.MM.DD HH.MM.SS, sin fracción de segundo).
+
+    Parametros:
+        id_atencion: La cadena de texto del ID a validar.
+
+    Retorno:
+        True si el ID tiene el formato completo y una fecha y hora reales, False en caso contrario.
+    """
+    return ID_ATENCION_ANTERIOR.fullmatch(id_atencion) is not None and validar_fecha_id(id_atencion)
+
+def completar_id_atencion(id_atencion, secuencia=0):
+    """
+    Convierte un ID de atención del formato anterior (AAAA.MM.DD HH.MM.SS) al actual, usando la
+    secuencia como fracción de segundo y '0000' como código de proceso. El ID convertido queda
+    ordenado en el mismo lugar que el original.
+
+    Parametros:
+        id_atencion: ID con formato AAAA.MM.DD HH.MM.SS.
+        secuencia: Número para distinguir atenciones del mismo segundo (0 a 999999).
+
+    Retorno:
+        El ID con formato AAAA.MM.DD HH.MM.SS.ffffff-nnnn.
+    """
+    return id_atencion + ".%06d-0000" % secuencia
+
+def validar_telefono(tel):
+    """
+    Valida que un string de teléfono contenga exactamente 10 dígitos numéricos.
+
+    Parametros:
+        tel: La cadena de texto del teléfono a validar.
+
+    Retorno:
+        True si el teléfono es válido, False en caso contrario.
+    """
+    return tel.isdigit() and len(tel) == 10
+
+def validar_email(email):
+    """
+    Valida si un string tiene el formato de un correo electrónico válido.
+
+    Parametros:
+        email: La cadena de texto del email a validar.
+
+    Retorno:
+        True si el email tiene un formato válido, False en caso contrario.
+    """
+    pat = r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$"
+    return re.match(pat, email) is not None
+
+def contiene_numeros(texto):
+    """
+    Verifica si una cadena de texto contiene al menos un dígito numérico.
+
+    Parametros:
+        texto: La cadena de texto a verificar.
+
+    Retorno:
+        True si el texto contiene algún número, False si no los tiene.
+    """
+    return any(char.isdigit() for char in texto)
+
+def validar_numero(valor, mensaje):
+    """
+    Convierte un valor a número decimal no negativo.
+
+    Parametros:
+        valor: Número o texto a convertir (por ejemplo '1500' o '1500.50').
+        mensaje: Mensaje del error si el valor no es un número válido.
+
+    Retorno:
+        El valor como float.
+    """
+    if isinstance(valor, str) and not valor.replace('.', '', 1).isdigit():
+        raise ValueError(mensaje)
+    try:
+        numero = float(valor)
+    except (TypeError, ValueError):
+        raise ValueError(mensaje)
+    if numero < 0:
+        raise ValueError(mensaje)
+    return numero